@@ -1,31 +1,94 @@
 import logging
+import os
 from flask import Flask, render_template, request
 from app.database import Database
 from app.routes.animals_routes import animals_routes
+from app.routes.api_routes import api_routes
+from app.commands import animals_cli, is_migrate_command
 from app.models import Animals
-
-# Configuration du journal
-logging.basicConfig(
-    filename='app.log',
-    level=logging.INFO,  # Inclut INFO, WARNING, ERROR
-    format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-)
+from app import http_cache
+from app import assets
+from app import compression
+from app.page_cache import PageCache
+from app.autocomplete import Autocomplete
+from app.offload import Offload
+from app.logging_config import configure_logging
+from app import metrics
+from app.startup import StartupReport, init_jinja_cache
 
 def create_app():
     """
     Initialise l'application Flask et configure les routes, logs et base de données.
+    La durée de chaque étape est mesurée (app.extensions["startup"]).
     """
-    app = Flask(__name__, template_folder='templates')
-    app.config.from_object('config.Config')
+    report = StartupReport()
+
+    with report.step("config"):
+        app = Flask(__name__, template_folder='templates')
+        app.config.from_object('config.Config')
+
+    # Configuration du journal (file d'attente + thread d'écriture, LOG_*)
+    with report.step("logging"):
+        configure_logging(app)
+
+    # Pool de connexions configuré à partir de Config (DATABASE, DB_POOL_*, PRAGMA)
+    with report.step("database"):
+        Database.init_app(app)
+
+    # Caches de lecture des animaux (ANIMAL_CACHE_*)
+    with report.step("animal_cache"):
+        Animals.init_app(app)
+
+    # Manifeste des fichiers statiques à empreinte (flask animals assets)
+    with report.step("assets"):
+        assets.init_app(app)
+
+    # Cache de bytecode des templates partagé par les workers (JINJA_*)
+    with report.step("jinja_cache"):
+        init_jinja_cache(app)
+
+    # Empreinte des templates (et des fichiers statiques) utilisée dans les ETag
+    with report.step("etag_salt"):
+        http_cache.init_app(app)
+
+    # Compression gzip négociée des réponses HTML et JSON (GZIP_*)
+    compression.init_app(app)
+
+    # Cache des pages de liste rendues (PAGE_CACHE_*)
+    with report.step("page_cache"):
+        PageCache.init_app(app)
 
-    # Initialisation des tables de la base de données (si nécessaire)
-    with app.app_context():
-        Database.initialize_tables()
+    # `flask animals migrate` applique (ou simule) lui-même les migrations : le démarrage
+    # ne touche pas au schéma, sinon la simulation ne verrait plus rien en attente
+    if is_migrate_command():
+        app.config["AUTOCOMPLETE_ENABLED"] = False
+    else:
+        # Migrations du schéma en attente (DB_AUTO_MIGRATE), index plein texte et statistiques,
+        # une seule fois par déploiement avec DB_SCHEMA_CHECK=deployment
+        with report.step("schema"), app.app_context():
+            marker = os.path.join(app.instance_path, "schema_check.json") \
+                if app.config.get("DB_SCHEMA_CHECK", "deployment") == "deployment" else None
+            Database.initialize_tables(migrate=app.config.get("DB_AUTO_MIGRATE", True), marker=marker)
+
+    # Index de préfixes en mémoire pour l'autocomplétion (AUTOCOMPLETE_ENABLED)
+    with report.step("autocomplete"):
+        Autocomplete.init_app(app)
+
+    # Pool de threads des appels parallèles à la base (DB_OFFLOAD_WORKERS) et échéance ASGI par requête
+    Offload.init_app(app)
 
     # Enregistrement des blueprints
-    app.register_blueprint(animals_routes, url_prefix='/animals')
+    with report.step("blueprints"):
+        app.register_blueprint(animals_routes, url_prefix='/animals')
+        app.register_blueprint(api_routes, url_prefix='/api/animals')
+
+    # Mesures des requêtes, du SQL et des templates, exposées sur /metrics
+    metrics.init_app(app)
 
-    # Fermeture de la connexion à la base de données à la fin de chaque requête
+    # Commandes CLI (flask animals ...)
+    app.cli.add_command(animals_cli)
+
+    # Retour de la connexion au pool à la fin de chaque requête
     @app.teardown_appcontext
     def close_db(exception):
         Database.close_connection()
@@ -36,6 +99,7 @@ def create_app():
 
     # Route principale
     @app.route('/')
+    @http_cache.conditional
     def home():
         """
         Gère la route principale '/'.
@@ -46,17 +110,48 @@ def create_app():
             page = request.args.get('page', 1, type=int)  # Par défaut : page 1
             per_page = request.args.get('per_page', 4, type=int)  # Par défaut : 4 éléments par page
 
+            # Pagination par curseur si `after` / `before` est fourni (ou si configurée par défaut)
+            after_id = request.args.get('after', type=int)
+            before_id = request.args.get('before', type=int)
+            if after_id is not None or before_id is not None or (
+                'page' not in request.args and app.config.get('PAGINATION_MODE') == 'cursor'
+            ):
+                result = Animals.get_animals_by_cursor(per_page, after_id=after_id, before_id=before_id, view="home")
+                return render_template('index.html', animals=result["animals"], per_page=per_page, cursor_mode=True,
+                                       next_cursor=result["next_cursor"], prev_cursor=result["prev_cursor"])
+
             # Récupérer les animaux paginés
-            animals = Animals.get_paginated_animals(page=page, per_page=per_page)
+            animals = Animals.get_paginated_animals(page=page, per_page=per_page, view="home")
 
             # Rendre le template avec les données des animaux
             return render_template('index.html', animals=animals, page=page, per_page=per_page)
         except Exception as e:
-            logging.error(f"Erreur dans la route principale : {e}")
+            logging.error("Erreur dans la route principale : %s", e)
             return render_template('error.html'), 500  # Page d'erreur
 
+    # Connexions ouvertes pendant l'initialisation : aucune n'est héritée par
+    # des workers créés par fork après un préchargement (gunicorn --preload)
+    Database.get_pool().close_all()
+
+    report.finish(app)
     return app
 
 
-# Lancement de l'application
-app = create_app()
\ No newline at end of file
+_instances = {}
+
+
+def __getattr__(name):
+    """
+    `app` et `asgi_app` sont construits à la première demande (ex. `gunicorn app:app`,
+    `uvicorn app:asgi_app`), une seule fois par processus : importer le paquet ne
+    construit plus l'application.
+    """
+    if name not in ("app", "asgi_app"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in _instances:
+        if "app" not in _instances:
+            _instances["app"] = create_app()
+        if name == "asgi_app":
+            from app.asgi import create_asgi_app
+            _instances["asgi_app"] = create_asgi_app(_instances["app"])
+    return _instances[name]
\ No newline at end of file
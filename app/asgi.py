@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+"""
+
+    Point d'entrée ASGI sans dépendance externe.
+
+    Chaque requête HTTP est convertie en environnement WSGI puis exécutée par
+    l'application Flask sur un pool de threads borné (ASGI_MAX_CONCURRENCY) :
+    la boucle d'événements ne fait que recevoir les requêtes et envoyer les
+    réponses, un appel SQLite lent n'occupe qu'un thread du pool. Au-delà du
+    pool, au plus ASGI_BACKLOG requêtes attendent ; les suivantes reçoivent un
+    503. Une requête dont la réponse n'a pas commencé à l'échéance
+    (REQUEST_TIMEOUT) reçoit un 504. Le corps des réponses est transmis au fil
+    de l'eau, avec contre-pression (exports en flux).
+
+    Utilisation : `uvicorn app:asgi_app` (ou tout autre serveur ASGI 3).
+    Référence : https://asgi.readthedocs.io/en/latest/specs/www.html
+
+"""
+
+# Nombre maximal de fragments de réponse en attente d'envoi par requête
+SEND_QUEUE_SIZE = 8
+
+
+class _Cancelled(Exception):
+    """La requête a été abandonnée côté ASGI ; le thread arrête de produire la réponse."""
+
+
+class AsgiAdapter:
+    """
+    Application ASGI 3 exécutant une application WSGI sur un pool de threads.
+    """
+    def __init__(self, wsgi_app, max_concurrency=32, backlog=128, timeout=10.0, spool_size=1024 * 1024):
+        self.wsgi_app = wsgi_app
+        self.max_concurrency = max_concurrency
+        self.backlog = backlog
+        self.timeout = timeout
+        self.spool_size = spool_size
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="asgi")
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "in_flight": 0, "waiting": 0, "rejected": 0, "timeouts": 0, "disconnects": 0}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise RuntimeError(f"Type de connexion ASGI non pris en charge : {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    async def _http(self, scope, receive, send):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._count("requests")
+        deadline = time.monotonic() + self.timeout if self.timeout > 0 else None
+
+        # File d'attente bornée : au-delà, rejet immédiat plutôt qu'une latence illimitée
+        if self._semaphore.locked() and self._stats["waiting"] >= self.backlog:
+            self._count("rejected")
+            await self._simple_response(send, 503, "Serveur surchargé, réessayez plus tard.")
+            return
+
+        self._count("waiting")
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), None if deadline is None else deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            await self._simple_response(send, 504, "Délai de traitement dépassé.")
+            return
+        finally:
+            self._count("waiting", -1)
+
+        body = await self._read_body(receive)
+        if body is None:
+            # Client parti pendant l'envoi du corps : rien à exécuter
+            self._semaphore.release()
+            self._count("disconnects")
+            return
+        environ = self._environ(scope, body, deadline)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        self._count("in_flight")
+        future = loop.run_in_executor(self._executor, self._run_wsgi, environ, loop, queue, cancelled)
+
+        def release(_):
+            # Le thread reste compté jusqu'à la fin réelle de l'appel WSGI
+            self._count("in_flight", -1)
+            self._semaphore.release()
+            body.close()
+        future.add_done_callback(release)
+
+        disconnect = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            first = await self._next(queue, disconnect, None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if first is None:
+                cancelled.set()
+                self._count("disconnects")
+                return
+            await self._send_response(first, queue, send, disconnect, cancelled)
+        except asyncio.TimeoutError:
+            cancelled.set()
+            self._count("timeouts")
+            logging.warning("Échéance dépassée avant la réponse : %s %s", scope["method"], scope["path"])
+            await self._simple_response(send, 504, "Délai de traitement dépassé.")
+        except BaseException:
+            cancelled.set()
+            raise
+        finally:
+            disconnect.cancel()
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        """Se termine quand le client se déconnecte (le corps de la requête est déjà lu)."""
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def _next(queue, disconnect, timeout=None):
+        """Prochain élément de la file de réponse, ou None si le client s'est déconnecté."""
+        get = asyncio.ensure_future(queue.get())
+        try:
+            done, _ = await asyncio.wait({get, disconnect}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not get.done():
+                get.cancel()
+        if get in done:
+            return get.result()
+        if disconnect in done:
+            return None
+        raise asyncio.TimeoutError()
+
+    async def _send_response(self, first, queue, send, disconnect, cancelled):
+        kind, *payload = first
+        if kind == "error":
+            await self._simple_response(send, 500, "Erreur interne du serveur.")
+            return
+        status, headers = payload
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        while True:
+            item = await self._next(queue, disconnect)
+            if item is None:
+                # Client déconnecté : le thread cesse de produire la réponse
+                cancelled.set()
+                self._count("disconnects")
+                return
+            kind, *payload = item
+            if kind == "body":
+                await send({"type": "http.response.body", "body": payload[0], "more_body": True})
+            else:
+                # Fin normale ou erreur après l'envoi des en-têtes : on termine le corps
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+
+    async def _read_body(self, receive):
+        """
+        Lit le corps de la requête dans un fichier temporaire (en mémoire jusqu'à
+        spool_size octets). Retourne None si le client se déconnecte avant la fin.
+        """
+        body = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                return None
+            body.write(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body.seek(0)
+        return body
+
+    @staticmethod
+    async def _simple_response(send, status, text):
+        body = text.encode("utf-8")
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8"),
+                                (b"content-length", str(len(body)).encode("latin-1"))]})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    @staticmethod
+    def _environ(scope, body, deadline):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1] or 80),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "CONTENT_LENGTH": str(body.seek(0, 2)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "animals.deadline": deadline,
+        }
+        body.seek(0)
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE":
+                environ["CONTENT_TYPE"] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            key = f"HTTP_{name}"
+            if key in environ:
+                value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+            environ[key] = value
+        return environ
+
+    def _run_wsgi(self, environ, loop, queue, cancelled):
+        """Exécute l'application WSGI dans un thread du pool et pousse la réponse dans `queue`."""
+        def put(item):
+            # Attente bornée : si la requête est abandonnée (504, déconnexion), le thread est libéré
+            if cancelled.is_set():
+                raise _Cancelled()
+            pending = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while not cancelled.is_set():
+                try:
+                    return pending.result(timeout=0.5)
+                except FutureTimeoutError:
+                    continue
+            pending.cancel()
+            raise _Cancelled()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+            return lambda data: send_chunk(data)
+
+        def send_chunk(data):
+            if not response.get("sent"):
+                put(("start", response["status"], response["headers"]))
+                response["sent"] = True
+            if data:
+                put(("body", bytes(data)))
+
+        result = None
+        try:
+            result = self.wsgi_app(environ, start_response)
+            for data in result:
+                if cancelled.is_set():
+                    break
+                send_chunk(data)
+            if not response.get("sent"):
+                send_chunk(b"")
+            put(("end",))
+        except _Cancelled:
+            pass
+        except Exception:
+            logging.exception("Erreur lors de l'exécution de la requête %s %s", environ["REQUEST_METHOD"], environ["PATH_INFO"])
+            try:
+                put(("error",))
+            except _Cancelled:
+                pass
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+
+    def stats(self):
+        """Requêtes reçues, en cours, en attente, rejetées (503), hors délai (504) et clients déconnectés."""
+        with self._lock:
+            return dict(self._stats, max_concurrency=self.max_concurrency, backlog=self.backlog)
+
+
+def create_asgi_app(app):
+    """
+    Enveloppe l'application Flask pour un serveur ASGI, selon sa configuration
+    (ASGI_MAX_CONCURRENCY, ASGI_BACKLOG, REQUEST_TIMEOUT, ASGI_BODY_SPOOL_SIZE).
+    """
+    adapter = AsgiAdapter(
+        app,
+        max_concurrency=app.config.get("ASGI_MAX_CONCURRENCY", 32),
+        backlog=app.config.get("ASGI_BACKLOG", 128),
+        timeout=app.config.get("REQUEST_TIMEOUT", 10.0),
+        spool_size=app.config.get("ASGI_BODY_SPOOL_SIZE", 1024 * 1024),
+    )
+    app.extensions["asgi"] = adapter
+    return adapter
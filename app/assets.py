@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from flask import request, send_from_directory
+
+"""
+
+    Chaîne des fichiers statiques : empreinte de contenu, manifeste et
+    variantes gzip précompressées.
+
+    `flask animals assets` copie chaque fichier de static/ sous static/dist/
+    avec l'empreinte de son contenu dans le nom (css/style.3f2a9c1b7d4e.css),
+    écrit à côté une variante .gz pour les formats textuels et enregistre la
+    correspondance dans static/dist/manifest.json. Au démarrage, le manifeste
+    est chargé : url_for('static', filename='css/style.css') produit alors
+    l'URL à empreinte, servie avec un cache « immutable » d'un an (le nom
+    change à chaque modification du contenu), en gzip si le client l'accepte.
+    Sans manifeste (développement), les fichiers d'origine sont servis tels quels.
+
+    Référence : https://developer.mozilla.org/docs/Web/HTTP/Headers/Cache-Control#immutable
+
+"""
+
+DIST_FOLDER = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Extensions précompressées (les images sont déjà compressées)
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def fingerprint(path, length=12):
+    """Empreinte SHA-256 (tronquée) du contenu d'un fichier."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def build(static_folder):
+    """
+    Génère les fichiers à empreinte, leurs variantes gzip et le manifeste.
+    Les versions précédentes sont conservées : les pages encore en cache
+    chez les clients continuent de trouver leurs fichiers.
+    Retourne {"files": [{"source", "target", "size", "gzip_size"}], "manifest"}.
+    """
+    dist = os.path.join(static_folder, DIST_FOLDER)
+    manifest, files = {}, []
+    for root, directories, names in os.walk(static_folder):
+        directories[:] = sorted(d for d in directories if os.path.join(root, d) != dist)
+        for name in sorted(names):
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, "/")
+            stem, extension = os.path.splitext(relative)
+            target = f"{DIST_FOLDER}/{stem}.{fingerprint(source)}{extension}"
+            destination = os.path.join(static_folder, *target.split("/"))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+            with open(source, "rb") as data:
+                content = data.read()
+            with open(destination, "wb") as output:
+                output.write(content)
+
+            gzip_size = None
+            if extension in COMPRESSIBLE:
+                # mtime=0 : même contenu, même fichier .gz d'un build à l'autre
+                compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                if len(compressed) < len(content):
+                    with open(destination + ".gz", "wb") as output:
+                        output.write(compressed)
+                    gzip_size = len(compressed)
+
+            manifest[relative] = target
+            files.append({"source": relative, "target": target, "size": len(content), "gzip_size": gzip_size})
+
+    manifest_path = os.path.join(dist, MANIFEST_NAME)
+    os.makedirs(dist, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+    return {"files": files, "manifest": manifest_path}
+
+
+def load_manifest(static_folder):
+    """Retourne le manifeste {chemin d'origine: chemin à empreinte}, ou {} s'il n'a pas été généré."""
+    try:
+        with open(os.path.join(static_folder, DIST_FOLDER, MANIFEST_NAME), encoding="utf-8") as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_app(app):
+    """
+    Charge le manifeste (ASSETS_FINGERPRINT) pour que url_for('static') produise
+    les URL à empreinte, et sert ces fichiers avec un cache immuable.
+    """
+    manifest = load_manifest(app.static_folder) if app.config.get("ASSETS_FINGERPRINT", True) else {}
+    app.extensions["assets_manifest"] = manifest
+    # Les pages (ETag, cache de pages) changent quand les URL des fichiers changent
+    app.config["ASSETS_VERSION"] = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:12]
+    if not manifest:
+        return
+
+    @app.url_defaults
+    def fingerprinted_url(endpoint, values):
+        if endpoint == "static" and values.get("filename") in manifest:
+            values["filename"] = manifest[values["filename"]]
+
+    @app.before_request
+    def precompressed():
+        filename = (request.view_args or {}).get("filename", "")
+        if request.endpoint != "static" or not filename.startswith(DIST_FOLDER + "/"):
+            return None
+        if request.accept_encodings["gzip"] and os.path.isfile(os.path.join(app.static_folder, filename + ".gz")):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(app.static_folder, filename + ".gz", mimetype=mimetype)
+            response.headers["Content-Encoding"] = "gzip"
+            return response
+        return None
+
+    @app.after_request
+    def immutable(response):
+        filename = (request.view_args or {}).get("filename", "")
+        if request.endpoint == "static" and filename.startswith(DIST_FOLDER + "/") and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+            response.vary.add("Accept-Encoding")
+        return response
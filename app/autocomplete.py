@@ -0,0 +1,240 @@
+import bisect
+import logging
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from app.models import Animals
+
+"""
+
+    Index de préfixes en mémoire pour l'autocomplétion (nom, espèce, race, ville).
+
+    Chaque valeur distincte d'un champ est un « terme » numéroté. Les clés de
+    recherche (valeur normalisée, puis chaque mot suivant) sont gardées triées
+    dans une liste : un préfixe se résout par recherche dichotomique (bisect),
+    sans accès à SQLite. Pour chaque animal, seuls les numéros de ses termes
+    sont conservés (un tableau compact par champ, indexé par ID), ce qui permet
+    de retirer ses anciennes valeurs lors d'une modification ou d'une suppression.
+    Au démarrage, les clés sont triées en une fois (load) ; seules les écritures
+    suivantes les insèrent une à une.
+
+"""
+
+
+def normalize(text):
+    """Minuscules sans accents : « Bélier » -> « belier »."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    """
+    Index trié des valeurs de FIELDS, mis à jour animal par animal.
+    """
+    FIELDS = ("nom", "espece", "race", "ville")
+
+    # Nombre maximal de clés examinées par requête avant le tri par popularité
+    SCAN_LIMIT = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._terms = [None]     # numéro -> (champ, valeur) ; 0 = aucun terme
+        self._term_ids = {}      # (champ, valeur) -> numéro
+        self._counts = [0]       # numéro -> nombre d'animaux portant ce terme
+        self._keys = []          # [(clé normalisée, numéro)] trié
+        self._columns = {field: array("I") for field in self.FIELDS}  # ID animal -> numéro
+        self._animals = 0
+        self._max_id = 0
+
+    def _term(self, field, value):
+        term_id = self._term_ids.get((field, value))
+        if term_id is None:
+            term_id = len(self._terms)
+            self._terms.append((field, value))
+            self._term_ids[(field, value)] = term_id
+            self._counts.append(0)
+        return term_id
+
+    @staticmethod
+    def _term_keys(value):
+        """Clés d'un terme : la valeur entière puis chaque mot suivant (« golden retriever », « retriever »)."""
+        key = normalize(value).strip()
+        keys = [key]
+        position = key.find(" ")
+        while position != -1:
+            keys.append(key[position + 1:])
+            position = key.find(" ", position + 1)
+        return [key for key in keys if key]
+
+    def _increment(self, term_id):
+        self._counts[term_id] += 1
+        if self._counts[term_id] == 1:
+            for key in self._term_keys(self._terms[term_id][1]):
+                bisect.insort(self._keys, (key, term_id))
+
+    def _decrement(self, term_id):
+        self._counts[term_id] -= 1
+        if self._counts[term_id] == 0:
+            for key in self._term_keys(self._terms[term_id][1]):
+                position = bisect.bisect_left(self._keys, (key, term_id))
+                if position < len(self._keys) and self._keys[position] == (key, term_id):
+                    del self._keys[position]
+
+    def _remove_locked(self, animal_id):
+        removed = False
+        for field, column in self._columns.items():
+            if animal_id < len(column) and column[animal_id]:
+                self._decrement(column[animal_id])
+                column[animal_id] = 0
+                removed = True
+        if removed:
+            self._animals -= 1
+
+    def add(self, animal_id, values):
+        """Ajoute (ou remplace) les valeurs d'un animal ; `values` suit l'ordre de FIELDS."""
+        with self._lock:
+            self._remove_locked(animal_id)
+            for field, value in zip(self.FIELDS, values):
+                if not value:
+                    continue
+                column = self._columns[field]
+                if animal_id >= len(column):
+                    column.extend([0] * (animal_id + 1 - len(column)))
+                term_id = self._term(field, value)
+                column[animal_id] = term_id
+                self._increment(term_id)
+            self._animals += 1
+            self._max_id = max(self._max_id, animal_id)
+
+    def load(self, rows):
+        """
+        Remplit un index vide à partir de (ID, valeurs...) : les clés sont
+        collectées puis triées une seule fois, sans insertion triée par terme.
+        """
+        with self._lock:
+            for row in rows:
+                animal_id, values = row[0], row[1:]
+                for field, value in zip(self.FIELDS, values):
+                    if not value:
+                        continue
+                    column = self._columns[field]
+                    if animal_id >= len(column):
+                        column.extend([0] * (animal_id + 1 - len(column)))
+                    term_id = self._term(field, value)
+                    column[animal_id] = term_id
+                    self._counts[term_id] += 1
+                self._animals += 1
+                self._max_id = max(self._max_id, animal_id)
+            self._keys = sorted((key, term_id) for term_id in range(1, len(self._terms)) if self._counts[term_id]
+                                for key in self._term_keys(self._terms[term_id][1]))
+
+    def remove(self, animal_id):
+        """Retire les valeurs d'un animal (sans effet s'il n'est pas indexé)."""
+        with self._lock:
+            self._remove_locked(animal_id)
+
+    @property
+    def max_id(self):
+        return self._max_id
+
+    def suggest(self, prefix, limit=10, field=None):
+        """
+        Suggestions commençant par `prefix` (sur la valeur ou l'un de ses mots),
+        triées par nombre d'animaux. Retourne [{"valeur", "champ", "total"}, ...].
+        """
+        key = normalize(prefix).strip()
+        if not key:
+            return []
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (key,))
+            seen = {}
+            scanned = 0
+            while position < len(self._keys) and scanned < self.SCAN_LIMIT:
+                candidate, term_id = self._keys[position]
+                if not candidate.startswith(key):
+                    break
+                term_field = self._terms[term_id][0]
+                if field is None or term_field == field:
+                    seen[term_id] = self._counts[term_id]
+                position += 1
+                scanned += 1
+            ranked = sorted(seen.items(), key=lambda item: (-item[1], self._terms[item[0]][1]))[:limit]
+            return [{"valeur": self._terms[term_id][1], "champ": self._terms[term_id][0], "total": count}
+                    for term_id, count in ranked]
+
+    def stats(self):
+        """Taille de l'index et estimation de sa mémoire (octets)."""
+        with self._lock:
+            memory = sys.getsizeof(self._keys) + sum(sys.getsizeof(entry) + sys.getsizeof(entry[0]) for entry in self._keys)
+            memory += sys.getsizeof(self._terms) + sum(sys.getsizeof(term) + sys.getsizeof(term[1]) for term in self._terms[1:])
+            memory += sys.getsizeof(self._term_ids) + sys.getsizeof(self._counts)
+            memory += sum(column.buffer_info()[1] * column.itemsize for column in self._columns.values())
+            return {
+                "animals": self._animals,
+                "terms": sum(1 for count in self._counts if count),
+                "keys": len(self._keys),
+                "memory_bytes": memory,
+            }
+
+
+class Autocomplete:
+    """
+    Point d'accès à l'index d'autocomplétion (configuré par init_app).
+    """
+    index = None
+    build_seconds = None
+
+    @staticmethod
+    def init_app(app):
+        """
+        Construit l'index au démarrage (AUTOCOMPLETE_ENABLED) et l'abonne aux
+        écritures sur les animaux pour le tenir à jour.
+        """
+        if not app.config.get("AUTOCOMPLETE_ENABLED", True):
+            Autocomplete.index = None
+            return
+        with app.app_context():
+            Autocomplete.rebuild()
+        Animals.add_write_listener(Autocomplete._on_write)
+
+    @staticmethod
+    def rebuild():
+        """Reconstruit l'index à partir de la table (contexte d'application requis)."""
+        started = time.perf_counter()
+        index = PrefixIndex()
+        index.load(Animals.iter_rows(columns=("id",) + PrefixIndex.FIELDS))
+        Autocomplete.index = index
+        Autocomplete.build_seconds = time.perf_counter() - started
+        logging.info("Index d'autocomplétion construit en %.3f s : %s", Autocomplete.build_seconds, index.stats())
+
+    @staticmethod
+    def _on_write(action, animal_id):
+        index = Autocomplete.index
+        if index is None:
+            return
+        if action == "delete":
+            index.remove(animal_id)
+        elif action in ("create", "update"):
+            animal = Animals.find_by_id(animal_id)
+            if animal is None:
+                index.remove(animal_id)
+            else:
+                index.add(animal_id, [animal[field] for field in PrefixIndex.FIELDS])
+        elif action == "create_many":
+            # Import par lots : les IDs (croissants) ne sont pas connus, on reprend après le dernier indexé
+            for row in Animals.iter_rows(columns=("id",) + PrefixIndex.FIELDS, after_id=index.max_id):
+                index.add(row[0], row[1:])
+
+    @staticmethod
+    def suggest(prefix, limit=10, field=None):
+        if Autocomplete.index is None:
+            return []
+        return Autocomplete.index.suggest(prefix, limit=limit, field=field)
+
+    @staticmethod
+    def stats():
+        if Autocomplete.index is None:
+            return None
+        return {**Autocomplete.index.stats(), "build_seconds": Autocomplete.build_seconds}
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+"""
+
+    Cache en mémoire (par processus) à éviction LRU et expiration (TTL).
+
+"""
+# Valeur sentinelle distinguant « absent du cache » d'une valeur None mise en cache
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Cache thread-safe borné à `max_size` entrées, chacune expirant après `ttl`
+    secondes. Les valeurs None sont mises en cache (résultats négatifs) ;
+    `get` retourne MISSING en cas d'absence.
+    """
+    def __init__(self, max_size=1024, ttl=30.0, enabled=True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled and max_size > 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+
+    def get(self, key):
+        """Retourne la valeur associée à `key`, ou MISSING si absente ou expirée."""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+
+    def set(self, key, value):
+        """Ajoute ou remplace une entrée, en évinçant la moins récemment utilisée si besoin."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+
+    def invalidate(self, key):
+        """Retire une entrée du cache (sans erreur si elle est absente)."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["invalidations"] += 1
+
+
+    def invalidate_where(self, predicate):
+        """Retire toutes les entrées dont la valeur satisfait `predicate`."""
+        with self._lock:
+            keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+
+    def stats(self):
+        """Retourne un instantané des compteurs (succès, échecs, évictions...)."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_size": self.max_size, "enabled": self.enabled}
@@ -0,0 +1,149 @@
+import json
+import sys
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app import assets
+from app.database import Database
+from app.migrations import Migrations
+from app.startup import precompile_templates
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService
+
+"""
+
+    Commandes en ligne de commande de l'application (flask animals ...).
+    Références : https://flask.palletsprojects.com/en/stable/cli/
+
+"""
+animals_cli = AppGroup('animals', help="Outils d'administration des animaux.")
+
+
+def is_migrate_command(argv=None):
+    """
+    Indique si le processus exécute `flask animals migrate` : l'application est
+    alors construite sans migrer au démarrage.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    return any(args[index:index + 2] == ["animals", "migrate"] for index in range(len(args) - 1))
+
+
+@animals_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(ImportService.FORMATS), default=None,
+              help="Format du fichier (déduit de l'extension par défaut).")
+@click.option('--batch-size', type=int, default=None, help="Nombre de lignes par transaction.")
+@click.option('--report', 'report_path', type=click.Path(dir_okay=False, writable=True), default=None,
+              help="Écrit le rapport complet (JSON) dans ce fichier.")
+def import_command(path, file_format, batch_size, report_path):
+    """
+    Importe des animaux depuis un fichier CSV ou JSONL.
+    """
+    file_format = file_format or ImportService.detect_format(path)
+    batch_size = batch_size or current_app.config.get("IMPORT_BATCH_SIZE", 500)
+
+    # Ouvert en binaire : les lignes sont décodées une à une, une ligne mal encodée est rejetée seule
+    with open(path, "rb") as stream:
+        report = ImportService.import_file(stream, file_format, batch_size=batch_size)
+
+    if report["status"] == "error":
+        if "inserted" in report:
+            report["message"] += f" ({report['inserted']} lignes insérées avant l'interruption.)"
+        raise click.ClickException(report["message"])
+
+    for error in report["errors"][:20]:
+        click.echo(f"Ligne {error['line']} : {error['message']}", err=True)
+    if len(report["errors"]) > 20:
+        click.echo(f"... {len(report['errors']) - 20} autres erreurs.", err=True)
+
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+    click.echo(
+        f"{report['total']} lignes lues, {report['inserted']} insérées, {report['rejected']} rejetées "
+        f"en {report['batches']} lots ; {report['elapsed_seconds']} s ({report['rows_per_second']} lignes/s)."
+    )
+
+
+
+@animals_cli.command('export')
+@click.option('--format', 'file_format', type=click.Choice(ExportService.FORMATS), default='csv', help="Format de sortie.")
+@click.option('--columns', default=None, help="Colonnes à exporter, séparées par des virgules (toutes par défaut).")
+@click.option('--query', default=None, help="Filtre de recherche (même critère que la liste).")
+@click.option('--gzip', 'compress', is_flag=True, help="Compresse la sortie en gzip.")
+@click.option('--output', type=click.File('wb'), default='-', help="Fichier de sortie (sortie standard par défaut).")
+def export_command(file_format, columns, query, compress, output):
+    """
+    Exporte les animaux en CSV ou JSONL, en flux.
+    """
+    try:
+        written = ExportService.export_to(output, file_format, columns=ExportService.parse_columns(columns),
+                                          query=query, compress=compress)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{written} octets exportés.", err=True)
+
+
+
+@animals_cli.command('migrate')
+@click.option('--dry-run', is_flag=True, help="Exécute les migrations puis les annule (aucune modification).")
+def migrate_command(dry_run):
+    """
+    Applique les migrations du schéma en attente (PRAGMA user_version).
+    """
+    try:
+        report = Migrations.run(Database.get_connection(), dry_run=dry_run)
+    except Exception as e:
+        raise click.ClickException(f"Échec de la migration : {e}")
+    finally:
+        Database.close_connection()
+
+    for migration in report["applied"]:
+        click.echo(f"{'[simulation] ' if dry_run else ''}Migration {migration['version']} : {migration['description']}")
+    for check in report["plans"]:
+        status = "OK" if check["ok"] else "INDEX NON UTILISÉ"
+        click.echo(f"{status} {check['index']} : {check['query']} -> {' | '.join(check['plan'])}")
+    suffix = " (simulation : rien n'a été modifié)" if dry_run else ""
+    click.echo(f"Version du schéma : {report['from_version']} -> {report['to_version']}{suffix}.")
+
+
+
+@animals_cli.command('assets')
+def assets_command():
+    """
+    Génère les fichiers statiques à empreinte, leurs variantes gzip et le manifeste.
+    """
+    report = assets.build(current_app.static_folder)
+    for file in report["files"]:
+        compressed = f", gzip {file['gzip_size']} o" if file["gzip_size"] else ""
+        click.echo(f"{file['source']} -> {file['target']} ({file['size']} o{compressed})")
+    click.echo(f"Manifeste écrit dans {report['manifest']} ; redémarrez l'application pour l'utiliser.")
+
+
+
+@animals_cli.command('templates')
+def templates_command():
+    """
+    Compile tous les templates dans le cache de bytecode Jinja (à lancer au déploiement).
+    """
+    if current_app.jinja_env.bytecode_cache is None:
+        raise click.ClickException("Cache de bytecode désactivé (JINJA_BYTECODE_CACHE=False).")
+    names = precompile_templates(current_app)
+    click.echo(f"{len(names)} templates compilés dans {current_app.jinja_env.bytecode_cache.directory}.")
+
+
+
+@animals_cli.command('startup')
+@click.option('--json', 'as_json', is_flag=True, help="Affiche le rapport au format JSON.")
+def startup_command(as_json):
+    """
+    Affiche la durée de chaque étape du démarrage de l'application.
+    """
+    report = current_app.extensions["startup"].to_dict()
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+    for step in sorted(report["steps"], key=lambda item: item["seconds"], reverse=True):
+        click.echo(f"{step['seconds'] * 1000:10.2f} ms  {step['name']}")
+    click.echo(f"{report['total_seconds'] * 1000:10.2f} ms  total (pid {report['pid']})")
@@ -0,0 +1,69 @@
+import gzip
+import zlib
+from flask import request
+
+"""
+
+    Compression gzip négociée des réponses HTML et JSON.
+
+    Une réponse est compressée si le client annonce gzip (Accept-Encoding),
+    si elle n'est pas déjà encodée et si elle dépasse GZIP_MIN_SIZE octets.
+    Les pages HTML rendues en flux (ex. /animals/admin) sont compressées au fil
+    de l'eau, fragment par fragment ; les exports gardent leur propre option
+    gzip. L'ETag devient faible : le contenu encodé diffère octet par octet,
+    mais la page reste la même pour les GET conditionnels (voir
+    http_cache.conditional).
+
+"""
+
+COMPRESSIBLE_TYPES = ("text/html", "application/json")
+
+
+def _gzip_stream(chunks, level):
+    """Compresse un flux de fragments sans l'accumuler (format gzip, wbits=31)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if not chunk:
+                continue
+            # Z_SYNC_FLUSH : chaque fragment part aussitôt (sinon zlib retient des centaines de Ko)
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def init_app(app):
+    """
+    Active la compression des réponses (GZIP_ENABLED, GZIP_MIN_SIZE, GZIP_LEVEL).
+    """
+    if not app.config.get("GZIP_ENABLED", True):
+        return
+    min_size = app.config.get("GZIP_MIN_SIZE", 1024)
+    level = app.config.get("GZIP_LEVEL", 6)
+
+    @app.after_request
+    def compress(response):
+        if response.mimetype not in COMPRESSIBLE_TYPES or response.status_code != 200 \
+                or response.direct_passthrough or "Content-Encoding" in response.headers:
+            return response
+        response.vary.add("Accept-Encoding")
+        if not request.accept_encodings["gzip"]:
+            return response
+
+        if response.is_streamed:
+            response.response = _gzip_stream(response.response, level)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(gzip.compress(data, compresslevel=level))
+        response.headers["Content-Encoding"] = "gzip"
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
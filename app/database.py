@@ -1,37 +1,552 @@
 # Gestion de la connexion à la base de données
+import hashlib
+import json
+import os
+import queue
+import re
 import sqlite3
+import threading
+import time
 from flask import g
 import logging
+from app.migrations import Migrations
 
 """
 
     Références : https://flask.palletsprojects.com/en/stable/patterns/sqlite3/
+                 https://www.sqlite.org/pragma.html
 
 """
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Curseur qui chronomètre chaque instruction (execute / executemany) et
+    chaque lecture (fetch*) et les transmet à Database.statement_observer.
+    Sans observateur, le surcoût se limite à un test d'attribut.
+    """
+    _label = "OTHER"
+
+    def execute(self, sql, parameters=(), /):
+        observer = Database.statement_observer
+        if observer is None:
+            return super().execute(sql, parameters)
+        self._label = statement_label(sql)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            observer("execute", self._label, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        observer = Database.statement_observer
+        if observer is None:
+            return super().executemany(sql, seq_of_parameters)
+        self._label = statement_label(sql)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            observer("execute", self._label, time.perf_counter() - started)
+
+    def _timed_fetch(self, fetch, *args):
+        observer = Database.statement_observer
+        if observer is None:
+            return fetch(*args)
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            observer("fetch", self._label, time.perf_counter() - started)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """
+    Connexion dont les curseurs (y compris ceux de execute / executemany
+    appelés directement sur la connexion) sont des InstrumentedCursor.
+    """
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_STATEMENT_LABELS = {}
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", re.IGNORECASE)
+
+
+def statement_label(sql):
+    """
+    Étiquette peu variable d'une instruction SQL : « OPÉRATION table »
+    (ex. « SELECT animals_fts »). Le résultat est mémorisé par texte SQL.
+    """
+    label = _STATEMENT_LABELS.get(sql)
+    if label is None:
+        words = sql.split(None, 1)
+        operation = words[0].upper() if words else "OTHER"
+        table = _TABLE_PATTERN.search(sql) if operation in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else None
+        label = f"{operation} {table.group(1)}" if table else operation
+        if len(_STATEMENT_LABELS) < 1024:
+            _STATEMENT_LABELS[sql] = label
+    return label
+
+
+class ConnectionPool:
+    """
+    Pool borné et thread-safe de connexions SQLite.
+
+    Les connexions sont créées à la demande jusqu'à `max_size`, configurées une
+    seule fois avec les PRAGMA fournis, puis réutilisées d'une requête à l'autre
+    (le cache de pages reste donc chaud). Lorsque toutes les connexions sont
+    empruntées, `acquire` attend au plus `timeout` secondes. Les connexions
+    dédiées (open_dedicated : threads d'écriture ou d'appels parallèles) sont
+    hors de cette limite mais comptées dans les statistiques.
+    """
+    def __init__(self, database, max_size=5, timeout=10.0, pragmas=None, factory=sqlite3.Connection):
+        self.database = database
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._dedicated = set()
+        self._condition = threading.Condition(threading.Lock())
+        self._stats = {"checkouts": 0, "waits": 0, "timeouts": 0, "high_water": 0}
+
+
+    def _connect(self):
+        """Ouvre une nouvelle connexion et lui applique les PRAGMA du pool."""
+        connection = sqlite3.connect(self.database, check_same_thread=False, factory=self.factory)
+        connection.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is not None:
+                connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+
+    def open_dedicated(self):
+        """Ouvre une connexion réservée à un thread, hors du pool mais comptée dans stats()."""
+        connection = self._connect()
+        with self._condition:
+            self._dedicated.add(connection)
+        return connection
+
+
+    def close_dedicated(self, connection):
+        """Ferme une connexion ouverte par open_dedicated."""
+        with self._condition:
+            self._dedicated.discard(connection)
+        connection.close()
+
+
+    def acquire(self):
+        """Emprunte une connexion au pool (en attendant si nécessaire)."""
+        with self._condition:
+            if not self._idle and self._created >= self.max_size:
+                self._stats["waits"] += 1
+                deadline = time.monotonic() + self.timeout
+                while not self._idle and self._created >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise sqlite3.OperationalError(
+                            "Aucune connexion disponible dans le pool après %.1f s" % self.timeout
+                        )
+                    self._condition.wait(remaining)
+
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                # Réserver la place avant d'ouvrir la connexion hors du verrou
+                self._created += 1
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["high_water"] = max(self._stats["high_water"], self._in_use)
+
+        if connection is None:
+            try:
+                connection = self._connect()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+        return connection
+
+
+    def release(self, connection):
+        """Rend une connexion au pool en annulant toute transaction restée ouverte."""
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            # Connexion inutilisable : on la jette plutôt que de la remettre en circulation
+            connection.close()
+            connection = None
+
+        with self._condition:
+            self._in_use -= 1
+            if connection is None:
+                self._created -= 1
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+
+
+    def close_all(self):
+        """Ferme toutes les connexions inactives du pool."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for connection in idle:
+            connection.close()
+
+
+    def stats(self):
+        """Retourne un instantané des statistiques du pool."""
+        with self._condition:
+            return {
+                **self._stats,
+                "size": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "dedicated": len(self._dedicated),
+                "connections": self._created + len(self._dedicated),
+            }
+
+
+class _WriteJob:
+    """Écriture en attente : fonction à exécuter et résultat attendu par la requête."""
+    __slots__ = ("work", "result", "error", "enqueued", "done", "state")
+
+    # États : en file -> en cours (pris par le thread d'écriture) ou abandonnée (délai dépassé)
+    PENDING, RUNNING, ABANDONED = "pending", "running", "abandoned"
+
+    def __init__(self, work):
+        self.work = work
+        self.result = None
+        self.error = None
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.state = _WriteJob.PENDING
+
+
+class GroupCommitWriter:
+    """
+    Thread d'écriture unique regroupant les écritures concurrentes (group commit).
+
+    Les requêtes déposent une fonction `work(connection)` dans une file et
+    attendent son résultat. Le thread prend la première écriture, attend au plus
+    `window` secondes (ou `max_batch` écritures) les suivantes, puis les exécute
+    dans une seule transaction, avec un SAVEPOINT par écriture : une écriture en
+    échec (ex. contrainte UNIQUE) est annulée seule et son exception est relancée
+    dans la requête qui l'a soumise. Une seule validation (et un seul fsync) par lot.
+    """
+    def __init__(self, connect, window=0.002, max_batch=64, close=None):
+        self.connect = connect
+        self.close = close or (lambda connection: connection.close())
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Protège l'état des écritures : une écriture abandonnée n'est jamais exécutée
+        self._state_lock = threading.Lock()
+        self._stats = {
+            "batches": 0, "operations": 0, "failures": 0, "abandoned": 0, "max_batch_size": 0,
+            "wait_seconds": 0.0, "max_wait_seconds": 0.0, "commit_seconds": 0.0,
+        }
+
+
+    def start(self):
+        # Sous verrou : des premières écritures concurrentes ne démarrent qu'un seul thread
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+
+    def stop(self, timeout=5.0):
+        """Termine les écritures en file puis arrête le thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+    def submit(self, work, timeout=None):
+        """
+        Soumet une écriture et attend son résultat (ou son exception).
+        Si `timeout` expire avant que le thread ne l'ait prise, l'écriture est
+        abandonnée (elle ne sera jamais exécutée) et OperationalError est levée ;
+        si elle est déjà en cours, on attend sa fin.
+        """
+        self.start()
+        job = _WriteJob(work)
+        self._queue.put(job)
+        if not job.done.wait(timeout):
+            with self._state_lock:
+                abandoned = job.state == _WriteJob.PENDING
+                if abandoned:
+                    job.state = _WriteJob.ABANDONED
+            if abandoned:
+                with self._lock:
+                    self._stats["abandoned"] += 1
+                raise sqlite3.OperationalError("Écriture non traitée après %.1f s" % timeout)
+            job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+
+    def _run(self):
+        connection = self.connect()
+        try:
+            stopping = False
+            while not stopping:
+                job = self._queue.get()
+                if job is None:
+                    break
+                batch = [job]
+                deadline = time.perf_counter() + self.window
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        stopping = True
+                        break
+                    batch.append(job)
+                self._execute(connection, batch)
+        finally:
+            self.close(connection)
+
+
+    def _claim(self, batch):
+        """Retient les écritures encore attendues et les marque en cours."""
+        with self._state_lock:
+            claimed = [job for job in batch if job.state == _WriteJob.PENDING]
+            for job in claimed:
+                job.state = _WriteJob.RUNNING
+        return claimed
+
+
+    def _execute(self, connection, batch):
+        batch = self._claim(batch)
+        if not batch:
+            return
+        started = time.perf_counter()
+        failures = 0
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                connection.execute("SAVEPOINT ecriture")
+                try:
+                    job.result = job.work(connection)
+                    connection.execute("RELEASE ecriture")
+                except Exception as e:
+                    connection.execute("ROLLBACK TO ecriture")
+                    connection.execute("RELEASE ecriture")
+                    job.error = e
+                    failures += 1
+            connection.commit()
+        except Exception as e:
+            # Échec du lot entier (verrou, disque...) : toutes les écritures échouent
+            logging.error("Échec d'un lot d'écritures groupées (%s écritures) : %s", len(batch), e)
+            try:
+                connection.rollback()
+            except sqlite3.Error:
+                pass
+            for job in batch:
+                job.result, job.error = None, job.error or e
+            failures = len(batch)
+        finished = time.perf_counter()
+
+        with self._lock:
+            stats = self._stats
+            stats["batches"] += 1
+            stats["operations"] += len(batch)
+            stats["failures"] += failures
+            stats["max_batch_size"] = max(stats["max_batch_size"], len(batch))
+            stats["commit_seconds"] += finished - started
+            for job in batch:
+                wait = started - job.enqueued
+                stats["wait_seconds"] += wait
+                stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+        for job in batch:
+            job.done.set()
+
+
+    def stats(self):
+        """Taille des lots et latences (attente en file, durée des transactions)."""
+        with self._lock:
+            stats = dict(self._stats)
+        batches, operations = stats["batches"], stats["operations"]
+        stats["mean_batch_size"] = operations / batches if batches else 0.0
+        stats["mean_wait_seconds"] = stats["wait_seconds"] / operations if operations else 0.0
+        stats["mean_commit_seconds"] = stats["commit_seconds"] / batches if batches else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+
 class Database:
 
     DATABASE = 'database.db'
 
+    PRAGMA_CONFIG = {
+        "journal_mode": "DB_JOURNAL_MODE",
+        "synchronous": "DB_SYNCHRONOUS",
+        "mmap_size": "DB_MMAP_SIZE",
+        "cache_size": "DB_CACHE_SIZE",
+        "busy_timeout": "DB_BUSY_TIMEOUT",
+    }
+
+    _pool = None
+
+    # Thread d'écriture groupée (DB_GROUP_COMMIT) ; None = chaque requête valide ses écritures
+    _writer = None
+
+    # Fonction appelée pour chaque instruction/lecture chronométrée :
+    # observer(phase, étiquette, durée en secondes) ; None = pas d'instrumentation
+    statement_observer = None
+
+    # Index plein texte (FTS5, migration 5) et compteurs matérialisés (migration 6) présents
+    FTS_ENABLED = False
+    STATS_ENABLED = False
+
+
+    @staticmethod
+    def init_app(app):
+        """
+        Configure le pool de connexions à partir de la configuration Flask.
+        """
+        Database.DATABASE = app.config.get("DATABASE", Database.DATABASE)
+        pragmas = {
+            pragma: app.config.get(key)
+            for pragma, key in Database.PRAGMA_CONFIG.items()
+        }
+        if Database._pool is not None:
+            Database._pool.close_all()
+        Database._pool = ConnectionPool(
+            Database.DATABASE,
+            max_size=app.config.get("DB_POOL_SIZE", 5),
+            timeout=app.config.get("DB_POOL_TIMEOUT", 10.0),
+            pragmas=pragmas,
+            factory=InstrumentedConnection if app.config.get("METRICS_ENABLED", True) else sqlite3.Connection,
+        )
+
+        if Database._writer is not None:
+            Database._writer.stop()
+            Database._writer = None
+        if app.config.get("DB_GROUP_COMMIT", False):
+            # Connexion dédiée au thread d'écriture, hors du pool des lectures
+            Database._writer = GroupCommitWriter(
+                Database._pool.open_dedicated,
+                window=app.config.get("DB_GROUP_COMMIT_WINDOW", 2.0) / 1000,
+                max_batch=app.config.get("DB_GROUP_COMMIT_MAX_BATCH", 64),
+                close=Database._pool.close_dedicated,
+            )
+
+
+    @staticmethod
+    def get_pool():
+        """
+        Retourne le pool courant (créé avec les valeurs par défaut au besoin).
+        """
+        if Database._pool is None:
+            Database._pool = ConnectionPool(Database.DATABASE)
+        return Database._pool
+
+
+    @staticmethod
+    def connect():
+        """
+        Ouvre une connexion dédiée à un thread (configurée comme celles du pool),
+        comptée dans pool_stats ; à fermer avec Database.disconnect.
+        """
+        return Database.get_pool().open_dedicated()
+
+
+    @staticmethod
+    def disconnect(connection):
+        """Ferme une connexion ouverte par Database.connect."""
+        Database.get_pool().close_dedicated(connection)
+
+
+    @staticmethod
+    def pool_stats():
+        """
+        Statistiques d'utilisation du pool (emprunts, attentes, pic d'utilisation).
+        """
+        return Database.get_pool().stats()
+
+
+    @staticmethod
+    def run_write(work):
+        """
+        Exécute une écriture `work(connection)` et la valide ; retourne son résultat.
+        Avec DB_GROUP_COMMIT, l'écriture passe par le thread d'écriture groupée ;
+        sinon elle s'exécute et est validée sur la connexion de la requête.
+        Toute exception de `work` annule l'écriture et est relancée.
+        """
+        if Database._writer is not None:
+            return Database._writer.submit(work, timeout=Database.get_pool().timeout)
+
+        db = Database.get_connection()
+        try:
+            result = work(db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+
+
+    @staticmethod
+    def writer_stats():
+        """
+        Statistiques de l'écriture groupée (taille des lots, latences), ou None si désactivée.
+        """
+        return Database._writer.stats() if Database._writer is not None else None
+
+
     @staticmethod
     def get_connection():
         """
-        Retourne une connexion SQLite stockée dans Flask's g pour la requête courante.
+        Retourne une connexion SQLite empruntée au pool et stockée dans Flask's g
+        pour la requête courante.
         """
         if 'db' not in g:
-            g.db = sqlite3.connect(Database.DATABASE)
-            g.db.row_factory = sqlite3.Row
+            g.db = Database.get_pool().acquire()
         return g.db
 
 
     """
-    Ferme la connexion SQLite à la fin de la requête.
+    Rend la connexion SQLite au pool à la fin de la requête.
     """
     @staticmethod
     def close_connection():
- 
+
         db = g.pop('db', None)
         if db is not None:
-            db.close()
+            Database.get_pool().release(db)
 
 
     """
@@ -45,41 +560,116 @@ class Database:
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
             return cursor.fetchone() is not None
         except sqlite3.Error as e:
-            logging.error(f"Erreur lors de la vérification de la table {table_name}: {e}")
+            logging.error("Erreur lors de la vérification de la table %s: %s", table_name, e)
             return False
         finally:
             Database.close_connection()
-    
-    
+
+
     """
-    Initialise les tables nécessaires uniquement si elles n'existent pas.
+    Met le schéma à jour (migrations versionnées, voir app/migrations.py, dont
+    l'index plein texte et les compteurs matérialisés), puis active ceux-ci.
+    Avec `marker` (chemin d'un fichier), la vérification n'est faite qu'une fois
+    par déploiement : tant que le fichier correspond à la même base et au même
+    schéma (voir schema_key), les workers suivants la sautent sans ouvrir de
+    connexion. Retourne True si la vérification a été exécutée.
     """
     @staticmethod
-    def initialize_tables():
+    def initialize_tables(migrate=True, marker=None):
+
+        key = Database.schema_key() if marker else None
+        if key is not None:
+            state = Database._read_marker(marker)
+            if state.get("key") == key:
+                Database.FTS_ENABLED = state.get("fts", False)
+                Database.STATS_ENABLED = state.get("stats", False)
+                logging.info("Schéma déjà vérifié pour ce déploiement (%s).", marker)
+                return False
 
-        if not Database.table_exists("animals"):  # Vérifie si la table existe
+        migrated = True
+        if migrate:
             try:
-                db = Database.get_connection()
-                cursor = db.cursor()
-                cursor.execute("""
-                CREATE TABLE animals (
-                    id INTEGER PRIMARY KEY,
-                    nom VARCHAR(25) NOT NULL,
-                    espece VARCHAR(25) NOT NULL,
-                    race VARCHAR(25) NOT NULL,
-                    age INTEGER NOT NULL,
-                    description VARCHAR(500),
-                    email VARCHAR(80) NOT NULL UNIQUE,
-                    adresse VARCHAR(75) NOT NULL,
-                    ville VARCHAR(75) NOT NULL,
-                    cp VARCHAR(7) NOT NULL
-                )
-                """)
-                db.commit()
-                logging.info("Table 'animals' créée avec succès.")
+                report = Migrations.run(Database.get_connection())
+                if report["applied"]:
+                    logging.info("Schéma migré de la version %s à %s.", report["from_version"], report["to_version"])
+                else:
+                    logging.info("Schéma à jour (version %s). Aucune action nécessaire.", report["to_version"])
             except sqlite3.Error as e:
-                logging.error(f"Erreur lors de la création de la table 'animals': {e}")
+                migrated = False
+                logging.error("Erreur lors de la migration du schéma : %s", e)
             finally:
                 Database.close_connection()
-        else:
-            logging.info("La table 'animals' existe déjà. Aucune action nécessaire.")
\ No newline at end of file
+
+        Database.detect_features()
+
+        # Seule une vérification complète et réussie est mémorisée
+        if key is not None and migrate and migrated:
+            Database._write_marker(marker, {"key": key, "fts": Database.FTS_ENABLED, "stats": Database.STATS_ENABLED})
+        return True
+
+
+    """
+    Clé d'une vérification du schéma : fichier de base (chemin et inode, qui
+    change si la base est recréée) et dernière migration (le DDL des index et
+    compteurs en fait partie). None pour une base en mémoire ou absente.
+    """
+    @staticmethod
+    def schema_key():
+        try:
+            stat = os.stat(Database.DATABASE)
+        except (OSError, TypeError):
+            return None
+        digest = hashlib.sha1()
+        digest.update(f"{os.path.realpath(Database.DATABASE)}:{stat.st_dev}:{stat.st_ino}".encode())
+        digest.update(f"{Migrations.latest_version()}".encode())
+        return digest.hexdigest()
+
+
+    @staticmethod
+    def _read_marker(path):
+        try:
+            with open(path, encoding="utf-8") as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return {}
+
+
+    @staticmethod
+    def _write_marker(path, state):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Écriture atomique : un worker ne lit jamais un fichier à moitié écrit
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as output:
+                json.dump(state, output)
+            os.replace(temporary, path)
+        except OSError as e:
+            logging.warning("Impossible d'enregistrer la vérification du schéma (%s) : %s", path, e)
+
+
+    """
+    Active la recherche plein texte et les compteurs selon les tables créées
+    par les migrations (sans elles : recherche LIKE et COUNT(*)).
+    """
+    @staticmethod
+    def detect_features():
+        try:
+            db = Database.get_connection()
+            Database.FTS_ENABLED = Database.table_exists_on(db, "animals_fts")
+            Database.STATS_ENABLED = Database.table_exists_on(db, "animals_stats")
+        except sqlite3.Error as e:
+            Database.FTS_ENABLED = Database.STATS_ENABLED = False
+            logging.error("Erreur lors de la lecture du schéma : %s", e)
+        finally:
+            Database.close_connection()
+        if not Database.FTS_ENABLED:
+            logging.warning("Index plein texte absent, la recherche utilisera LIKE.")
+
+
+    """
+    Vérifie si une table existe en réutilisant une connexion déjà ouverte.
+    """
+    @staticmethod
+    def table_exists_on(db, table_name):
+        cursor = db.execute("SELECT name FROM sqlite_master WHERE name=?", (table_name,))
+        return cursor.fetchone() is not None
@@ -0,0 +1,102 @@
+import functools
+import hashlib
+import os
+from flask import current_app, g, make_response, request, session
+from flask.signals import message_flashed
+from app.models import Animals
+
+"""
+
+    GET conditionnels (ETag / If-None-Match) pour les pages de consultation.
+
+    L'ETag d'une page est dérivé de la révision des données (table animals_stats,
+    incrémentée par triggers à chaque écriture), du point d'entrée, des paramètres
+    de la requête et d'une empreinte des templates (ETAG_SALT). Un client qui
+    présente un ETag encore valide reçoit un 304 sans qu'aucune requête de liste
+    ne soit exécutée.
+
+"""
+def init_app(app):
+    """
+    Calcule l'empreinte des templates, commune à tous les workers d'un même
+    déploiement, pour qu'une mise à jour des gabarits invalide les ETag.
+    """
+    # Une vue qui affiche un message (erreur, confirmation) ne produit pas une page réutilisable
+    message_flashed.connect(_on_flash, app)
+    if app.config.get("ETAG_SALT"):
+        return
+    digest = hashlib.sha1()
+    template_folder = os.path.join(app.root_path, app.template_folder)
+    for root, _, files in sorted(os.walk(template_folder)):
+        for name in sorted(files):
+            stat = os.stat(os.path.join(root, name))
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    # Les pages référencent les fichiers statiques à empreinte (voir app.assets)
+    digest.update(app.config.get("ASSETS_VERSION", "").encode())
+    app.config["ETAG_SALT"] = digest.hexdigest()[:12]
+
+
+def _on_flash(sender, message, category, **extra):
+    mark_uncacheable()
+
+
+def mark_uncacheable():
+    """
+    Marque la réponse de la requête courante comme non réutilisable (page
+    d'erreur, résultats partiels) : ni ETag ni mise en cache.
+    """
+    g.response_uncacheable = True
+
+
+def is_uncacheable():
+    return g.get("response_uncacheable", False)
+
+
+def current_revision():
+    """Révision des données, lue au plus une fois par requête."""
+    if "data_revision" not in g:
+        g.data_revision = Animals.data_revision()
+    return g.data_revision
+
+
+def compute_etag(revision):
+    """ETag fort pour la requête courante à une révision donnée."""
+    args = "&".join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+    raw = f"{current_app.config.get('ETAG_SALT', '')}|{request.endpoint}|{args}|{revision}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional(view):
+    """
+    Décorateur de vue : répond 304 si l'ETag présenté correspond à la révision
+    courante, sinon exécute la vue et ajoute l'ETag à la réponse.
+    Les pages portant des messages flash ne sont jamais considérées comme inchangées,
+    et une page qui en émet un (ou marquée par mark_uncacheable) ne reçoit pas d'ETag.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != "GET" or session.get("_flashes"):
+            return view(*args, **kwargs)
+
+        revision = current_revision()
+        if revision is None:
+            return view(*args, **kwargs)
+
+        etag = compute_etag(revision)
+        # Comparaison faible : l'ETag d'une réponse compressée (gzip) est faible
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            if is_uncacheable():
+                # Page d'erreur : un ETag la ferait revalider (304) jusqu'à la prochaine écriture
+                response.headers["Cache-Control"] = "no-store"
+                return response
+        response.set_etag(etag)
+        # Le navigateur peut garder la page mais doit la revalider à chaque visite
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    return wrapper
@@ -0,0 +1,79 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+
+"""
+
+    Journalisation asynchrone : les threads de requête ne font que déposer les
+    enregistrements dans une file (QueueHandler) ; un thread dédié
+    (QueueListener) les formate et les écrit sur disque.
+
+    Références : https://docs.python.org/3/howto/logging-cookbook.html#dealing-with-handlers-that-block
+                 https://docs.python.org/3/howto/logging.html#optimization
+
+"""
+TEXT_FORMAT = '%(asctime)s %(levelname)s: %(message)s [%(name)s]'
+
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formate chaque enregistrement en une ligne JSON (horodatage, niveau,
+    logger, message et, le cas échéant, trace de l'exception).
+    """
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure_logging(app):
+    """
+    Installe la file de journalisation sur le logger racine à partir de la
+    configuration (LOG_FILE, LOG_LEVEL, LOG_JSON, LOG_CALLER_INFO).
+    Peut être appelée plusieurs fois : l'installation précédente est remplacée.
+    """
+    global _listener, _queue_handler
+
+    if not app.config.get("LOG_CALLER_INFO", False):
+        # Évite la remontée de pile faite pour chaque message (pathname, lineno)
+        logging._srcfile = None
+        logging.logMultiprocessing = False
+
+    file_handler = logging.FileHandler(app.config.get("LOG_FILE", "app.log"), encoding="utf-8", delay=True)
+    if app.config.get("LOG_JSON", False):
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        root.removeHandler(_queue_handler)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+    root.addHandler(_queue_handler)
+    root.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+
+
+def _stop_listener():
+    """Vide la file et arrête le thread d'écriture à la sortie du processus."""
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
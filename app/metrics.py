@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+from flask import Blueprint, Response, current_app, g, request
+from flask.signals import before_render_template, template_rendered
+from app.database import Database
+from app.models import Animals
+from app.autocomplete import Autocomplete
+from app.offload import Offload
+
+"""
+
+    Instrumentation de l'application et exposition au format texte de
+    Prometheus sur /metrics : durée des requêtes par point d'entrée, des
+    instructions SQL et du rendu des templates, plus l'état du pool de
+    connexions et des caches.
+
+    Références : https://prometheus.io/docs/instrumenting/exposition_formats/
+
+"""
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Compteur monotone, ventilé par étiquettes."""
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histogramme cumulatif à seaux fixes, ventilé par étiquettes."""
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [compte par seau (+Inf en dernier), somme]
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][position] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(label_values, list(counts), total) for label_values, (counts, total) in self._series.items()]
+        for label_values, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "Requêtes HTTP traitées.", ("endpoint", "method", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Durée de traitement des requêtes (jusqu'au premier octet).", ("endpoint",))
+SQL_DURATION = Histogram("db_statement_duration_seconds", "Durée des instructions SQL (execute) et des lectures (fetch).", ("statement", "phase"))
+TEMPLATE_DURATION = Histogram("template_render_duration_seconds", "Durée du rendu des templates Jinja.", ("template",))
+
+REGISTRY = (REQUESTS, REQUEST_DURATION, SQL_DURATION, TEMPLATE_DURATION)
+
+metrics_routes = Blueprint('metrics_routes', __name__)
+
+
+def _observe_statement(phase, label, duration):
+    SQL_DURATION.observe(duration, label, phase)
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+
+
+def _after_request(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        endpoint = request.endpoint or "inconnu"
+        REQUEST_DURATION.observe(time.perf_counter() - started, endpoint)
+        REQUESTS.inc(endpoint, request.method, str(response.status_code))
+    return response
+
+
+def _before_render(sender, template, context, **extra):
+    g.setdefault("template_timers", []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    timers = g.get("template_timers")
+    if timers:
+        TEMPLATE_DURATION.observe(time.perf_counter() - timers.pop(), template.name or "inconnu")
+
+
+def _gauge_lines():
+    """Jauges calculées au moment de la collecte (pool de connexions, caches, concurrence)."""
+    lines = ["# HELP db_pool_connections État du pool de connexions SQLite.", "# TYPE db_pool_connections gauge"]
+    pool = Database.pool_stats()
+    for key in ("size", "in_use", "idle", "max_size", "high_water", "dedicated", "connections"):
+        lines.append(f'db_pool_connections{{state="{key}"}} {pool[key]}')
+    lines += ["# HELP db_pool_events_total Événements du pool de connexions.", "# TYPE db_pool_events_total counter"]
+    for key in ("checkouts", "waits", "timeouts"):
+        lines.append(f'db_pool_events_total{{event="{key}"}} {pool[key]}')
+    writer = Database.writer_stats()
+    if writer is not None:
+        lines += ["# HELP db_group_commit Écriture groupée : lots, écritures, tailles et latences.", "# TYPE db_group_commit gauge"]
+        for key in ("batches", "operations", "failures", "abandoned", "queued", "max_batch_size", "mean_batch_size",
+                    "mean_wait_seconds", "max_wait_seconds", "mean_commit_seconds"):
+            lines.append(f'db_group_commit{{stat="{key}"}} {writer[key]}')
+    index = Autocomplete.stats()
+    if index is not None:
+        lines += ["# HELP autocomplete_index Index d'autocomplétion : animaux, termes, clés et mémoire estimée.", "# TYPE autocomplete_index gauge"]
+        for key in ("animals", "terms", "keys", "memory_bytes"):
+            lines.append(f'autocomplete_index{{stat="{key}"}} {index[key]}')
+    offload = Offload.stats()
+    if offload is not None:
+        lines += ["# HELP db_offload Appels parallèles à la base : threads, appels, regroupements parallèles ou en série, échéances dépassées.", "# TYPE db_offload gauge"]
+        for key in ("workers", "busy", "calls", "parallel", "inline", "timeouts"):
+            lines.append(f'db_offload{{stat="{key}"}} {offload[key]}')
+    adapter = current_app.extensions.get("asgi")
+    if adapter is not None:
+        asgi = adapter.stats()
+        lines += ["# HELP asgi_requests Mode ASGI : requêtes reçues, en cours, en attente, rejetées (503) et hors délai (504).", "# TYPE asgi_requests gauge"]
+        for key in ("requests", "in_flight", "waiting", "rejected", "timeouts", "max_concurrency", "backlog"):
+            lines.append(f'asgi_requests{{stat="{key}"}} {asgi[key]}')
+    startup = current_app.extensions.get("startup")
+    if startup is not None:
+        lines += ["# HELP app_startup_seconds Durée des étapes du démarrage de ce processus.", "# TYPE app_startup_seconds gauge"]
+        for name, seconds in startup.steps:
+            lines.append(f'app_startup_seconds{{step="{name}"}} {seconds}')
+        lines.append(f'app_startup_seconds{{step="total"}} {startup.total_seconds}')
+    lines += ["# HELP animal_cache_events_total Événements des caches de recherche unitaire.", "# TYPE animal_cache_events_total counter"]
+    for cache, stats in Animals.cache_stats().items():
+        for key in ("hits", "misses", "evictions", "expirations"):
+            lines.append(f'animal_cache_events_total{{cache="{cache}",event="{key}"}} {stats[key]}')
+    return lines
+
+
+@metrics_routes.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Expose les métriques au format texte de Prometheus.
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += _gauge_lines()
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    """
+    Branche les mesures (requêtes, SQL, templates) et enregistre /metrics.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    Database.statement_observer = _observe_statement
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.register_blueprint(metrics_routes)
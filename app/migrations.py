@@ -0,0 +1,304 @@
+import sqlite3
+import logging
+
+"""
+
+    Migrations versionnées du schéma, suivies par PRAGMA user_version.
+
+    Chaque migration porte un numéro strictement croissant et une fonction
+    `apply(db)`. Les migrations en attente sont appliquées dans l'ordre, chacune
+    dans sa propre transaction (BEGIN IMMEDIATE) avec la mise à jour de
+    user_version : une migration en échec est annulée entièrement et les
+    suivantes ne sont pas tentées.
+
+    Références : https://www.sqlite.org/pragma.html#pragma_user_version
+                 https://www.sqlite.org/eqp.html
+
+"""
+
+
+def _columns(db, table):
+    return [row[1] for row in db.execute(f"PRAGMA table_info({table})")]
+
+
+def animals_table_ddl(name="animals"):
+    """DDL actuel de la table des animaux (sous le nom `name`)."""
+    return f"""
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom VARCHAR(25) NOT NULL,
+            espece VARCHAR(25) NOT NULL,
+            race VARCHAR(25) NOT NULL,
+            age INTEGER NOT NULL,
+            description VARCHAR(500) NOT NULL,
+            email VARCHAR(80) UNIQUE NOT NULL,
+            adresse VARCHAR(75) NOT NULL,
+            ville VARCHAR(75) NOT NULL,
+            code_postal VARCHAR(7) NOT NULL
+        )
+    """
+
+
+def create_animals_table(db):
+    db.execute(animals_table_ddl())
+
+
+def rename_cp_column(db):
+    # Les bases créées par l'ancien initialize_tables ont une colonne `cp`
+    if "cp" in _columns(db, "animals"):
+        db.execute("ALTER TABLE animals RENAME COLUMN cp TO code_postal")
+
+
+def create_filter_indexes(db):
+    for column in ("espece", "race", "ville", "age"):
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_animals_{column} ON animals ({column}, id)")
+    # Statistiques du planificateur pour les nouveaux index
+    db.execute("ANALYZE animals")
+
+
+def rebuild_legacy_table(db):
+    # L'ancien initialize_tables créait `id INTEGER PRIMARY KEY` (IDs réutilisables après
+    # suppression) et une description facultative : la table est recréée selon le DDL actuel,
+    # en conservant les IDs ; une description absente devient une chaîne vide
+    definition = db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'animals'").fetchone()[0]
+    optional = [row[1] for row in db.execute("PRAGMA table_info(animals)") if not row[3] and not row[5]]
+    if "AUTOINCREMENT" in definition.upper() and not optional:
+        return
+    columns = [row[1] for row in db.execute("PRAGMA table_info(animals)")]
+    selected = ", ".join(f"COALESCE({column}, '')" if column == "description" else column for column in columns)
+    db.execute(animals_table_ddl("animals_rebuild"))
+    db.execute(f"INSERT INTO animals_rebuild ({', '.join(columns)}) SELECT {selected} FROM animals")
+    # Les index et triggers de l'ancienne table disparaissent avec elle
+    db.execute("DROP TABLE animals")
+    db.execute("ALTER TABLE animals_rebuild RENAME TO animals")
+    create_filter_indexes(db)
+
+
+# Index plein texte (FTS5) synchronisé par triggers avec la table animals
+SEARCH_INDEX_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS animals_fts USING fts5(
+        nom, espece, race, email, description,
+        content='animals',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_fts_ai AFTER INSERT ON animals BEGIN
+        INSERT INTO animals_fts(rowid, nom, espece, race, email, description)
+        VALUES (new.id, new.nom, new.espece, new.race, new.email, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_fts_ad AFTER DELETE ON animals BEGIN
+        INSERT INTO animals_fts(animals_fts, rowid, nom, espece, race, email, description)
+        VALUES ('delete', old.id, old.nom, old.espece, old.race, old.email, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_fts_au AFTER UPDATE ON animals BEGIN
+        INSERT INTO animals_fts(animals_fts, rowid, nom, espece, race, email, description)
+        VALUES ('delete', old.id, old.nom, old.espece, old.race, old.email, old.description);
+        INSERT INTO animals_fts(rowid, nom, espece, race, email, description)
+        VALUES (new.id, new.nom, new.espece, new.race, new.email, new.description);
+    END
+    """,
+)
+
+
+def create_search_index(db):
+    try:
+        db.execute(SEARCH_INDEX_SCHEMA[0])
+    except sqlite3.OperationalError as e:
+        # SQLite compilé sans FTS5 : la recherche reste en mode LIKE
+        if "fts5" not in str(e):
+            raise
+        logging.warning("FTS5 indisponible, la recherche utilisera LIKE : %s", e)
+        return
+    for statement in SEARCH_INDEX_SCHEMA[1:]:
+        db.execute(statement)
+    # Remplissage (ou remise en cohérence d'un index créé avant cette migration)
+    db.execute("INSERT INTO animals_fts(animals_fts) VALUES ('rebuild')")
+
+
+# Compteurs matérialisés (total, par espèce, par ville) maintenus par triggers
+STATISTICS_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS animals_stats (
+        dimension TEXT NOT NULL,
+        valeur TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, valeur)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_stats_ai AFTER INSERT ON animals BEGIN
+        UPDATE animals_stats SET total = total + 1 WHERE dimension = 'total';
+        INSERT INTO animals_stats (dimension, valeur, total) VALUES ('espece', new.espece, 1)
+            ON CONFLICT (dimension, valeur) DO UPDATE SET total = total + 1;
+        INSERT INTO animals_stats (dimension, valeur, total) VALUES ('ville', new.ville, 1)
+            ON CONFLICT (dimension, valeur) DO UPDATE SET total = total + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_stats_ad AFTER DELETE ON animals BEGIN
+        UPDATE animals_stats SET total = total - 1 WHERE dimension = 'total';
+        UPDATE animals_stats SET total = total - 1 WHERE dimension = 'espece' AND valeur = old.espece;
+        UPDATE animals_stats SET total = total - 1 WHERE dimension = 'ville' AND valeur = old.ville;
+        DELETE FROM animals_stats WHERE dimension IN ('espece', 'ville') AND total <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_stats_au AFTER UPDATE OF espece, ville ON animals BEGIN
+        UPDATE animals_stats SET total = total - 1 WHERE dimension = 'espece' AND valeur = old.espece;
+        UPDATE animals_stats SET total = total - 1 WHERE dimension = 'ville' AND valeur = old.ville;
+        INSERT INTO animals_stats (dimension, valeur, total) VALUES ('espece', new.espece, 1)
+            ON CONFLICT (dimension, valeur) DO UPDATE SET total = total + 1;
+        INSERT INTO animals_stats (dimension, valeur, total) VALUES ('ville', new.ville, 1)
+            ON CONFLICT (dimension, valeur) DO UPDATE SET total = total + 1;
+        DELETE FROM animals_stats WHERE dimension IN ('espece', 'ville') AND total <= 0;
+    END
+    """,
+)
+
+# Numéro de révision des données, incrémenté par chaque écriture (sert aux ETag)
+REVISION_SCHEMA = (
+    "INSERT OR IGNORE INTO animals_stats (dimension, valeur, total) VALUES ('revision', '', 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_revision_ai AFTER INSERT ON animals BEGIN
+        UPDATE animals_stats SET total = total + 1 WHERE dimension = 'revision';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_revision_ad AFTER DELETE ON animals BEGIN
+        UPDATE animals_stats SET total = total + 1 WHERE dimension = 'revision';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS animals_revision_au AFTER UPDATE ON animals BEGIN
+        UPDATE animals_stats SET total = total + 1 WHERE dimension = 'revision';
+    END
+    """,
+)
+
+STATISTICS_BACKFILL = (
+    "DELETE FROM animals_stats WHERE dimension IN ('total', 'espece', 'ville')",
+    "INSERT INTO animals_stats (dimension, valeur, total) SELECT 'total', '', COUNT(*) FROM animals",
+    "INSERT INTO animals_stats (dimension, valeur, total) SELECT 'espece', espece, COUNT(*) FROM animals GROUP BY espece",
+    "INSERT INTO animals_stats (dimension, valeur, total) SELECT 'ville', ville, COUNT(*) FROM animals GROUP BY ville",
+)
+
+
+def create_statistics(db):
+    # Dans la transaction de la migration : aucune écriture concurrente n'est comptée deux fois
+    for statement in STATISTICS_SCHEMA + STATISTICS_BACKFILL + REVISION_SCHEMA:
+        db.execute(statement)
+
+
+class Migrations:
+    """
+    Exécuteur des migrations du schéma (voir MIGRATIONS).
+    """
+    # (version, description, fonction) — ne jamais renuméroter une migration publiée
+    MIGRATIONS = (
+        (1, "Création de la table animals", create_animals_table),
+        (2, "Renommage de la colonne cp en code_postal", rename_cp_column),
+        (3, "Index sur espece, race, ville et age", create_filter_indexes),
+        (4, "Reconstruction de la table animals créée par l'ancien schéma", rebuild_legacy_table),
+        (5, "Index plein texte animals_fts et ses triggers", create_search_index),
+        (6, "Compteurs animals_stats, révision des données et leurs triggers", create_statistics),
+    )
+
+    # Requêtes vérifiées par EXPLAIN QUERY PLAN : (requête, paramètres, index attendu)
+    PLAN_CHECKS = (
+        ("SELECT id FROM animals WHERE espece = ? ORDER BY id LIMIT 9", ("Chien",), "idx_animals_espece"),
+        ("SELECT id FROM animals WHERE race = ? ORDER BY id LIMIT 9", ("Beagle",), "idx_animals_race"),
+        ("SELECT id FROM animals WHERE ville = ? ORDER BY id LIMIT 9", ("Montréal",), "idx_animals_ville"),
+        ("SELECT id FROM animals WHERE age BETWEEN ? AND ?", (1, 3), "idx_animals_age"),
+    )
+
+    @staticmethod
+    def current_version(db):
+        return db.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def latest_version():
+        return Migrations.MIGRATIONS[-1][0]
+
+    @staticmethod
+    def pending(db):
+        """Migrations dont la version dépasse user_version."""
+        version = Migrations.current_version(db)
+        return [migration for migration in Migrations.MIGRATIONS if migration[0] > version]
+
+    @staticmethod
+    def explain(db, query, params=()):
+        """Retourne les lignes de détail de EXPLAIN QUERY PLAN pour `query`."""
+        return [row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    @staticmethod
+    def check_plans(db):
+        """
+        Vérifie que les requêtes de PLAN_CHECKS utilisent l'index attendu.
+        Retourne [{"query", "index", "plan", "ok"}, ...].
+        """
+        results = []
+        for query, params, index in Migrations.PLAN_CHECKS:
+            plan = Migrations.explain(db, query, params)
+            ok = any(index in detail for detail in plan)
+            if not ok:
+                logging.warning("Index %s non utilisé par « %s » : %s", index, query, plan)
+            results.append({"query": query, "index": index, "plan": plan, "ok": ok})
+        return results
+
+    @staticmethod
+    def run(db, dry_run=False):
+        """
+        Applique les migrations en attente sur la connexion `db`.
+        En mode `dry_run`, elles sont exécutées dans une même transaction qui est
+        ensuite annulée : le rapport montre ce qui serait appliqué (et les plans
+        d'exécution obtenus) sans rien modifier.
+        Retourne {"from_version", "to_version", "applied": [...], "plans": [...], "dry_run"}.
+        """
+        report = {"from_version": Migrations.current_version(db), "to_version": None,
+                  "applied": [], "plans": [], "dry_run": dry_run}
+
+        if dry_run:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for version, description, apply in Migrations.pending(db):
+                    apply(db)
+                    db.execute(f"PRAGMA user_version = {version}")
+                    report["applied"].append({"version": version, "description": description})
+                report["to_version"] = Migrations.current_version(db)
+                report["plans"] = Migrations.check_plans(db)
+            finally:
+                db.rollback()
+            return report
+
+        while True:
+            # Version relue sous verrou d'écriture : plusieurs processus peuvent démarrer ensemble
+            db.execute("BEGIN IMMEDIATE")
+            version = description = None
+            try:
+                pending = Migrations.pending(db)
+                if not pending:
+                    db.rollback()
+                    break
+                version, description, apply = pending[0]
+                apply(db)
+                db.execute(f"PRAGMA user_version = {version}")
+                db.commit()
+            except sqlite3.Error as e:
+                db.rollback()
+                logging.error("Échec de la migration %s (%s) : %s", version, description, e)
+                raise
+            logging.info("Migration %s appliquée : %s", version, description)
+            report["applied"].append({"version": version, "description": description})
+
+        report["to_version"] = Migrations.current_version(db)
+        if report["applied"]:
+            report["plans"] = Migrations.check_plans(db)
+        return report
@@ -1,10 +1,123 @@
+import re
+import sqlite3
+from app.cache import LRUCache, MISSING
 from app.database import Database
 import logging
 
+class AnimalRecord(tuple):
+    """
+    Enregistrement léger et immuable d'un animal, adossé à un tuple.
+
+    Les valeurs sont accessibles par nom (`record['nom']`, `record.nom`) comme
+    par position. Chaque projection de colonnes possède sa propre sous-classe
+    (voir `for_columns`), qui porte la correspondance nom -> position : les
+    instances elles-mêmes ne stockent que les valeurs.
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+    _types = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return tuple.__getitem__(self, self._index[key])
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name):
+        index = self._index.get(name)
+        if index is None:
+            raise AttributeError(name)
+        return tuple.__getitem__(self, index)
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self):
+        return self._fields
+
+    def to_dict(self):
+        return dict(zip(self._fields, self))
+
+    def __repr__(self):
+        return f"AnimalRecord({self.to_dict()!r})"
+
+    @classmethod
+    def for_columns(cls, columns):
+        """Retourne (et mémorise) la sous-classe correspondant à cette projection."""
+        columns = tuple(columns)
+        record_type = cls._types.get(columns)
+        if record_type is None:
+            record_type = type("AnimalRecord", (cls,), {
+                "__slots__": (),
+                "_fields": columns,
+                "_index": {column: position for position, column in enumerate(columns)},
+            })
+            cls._types[columns] = record_type
+        return record_type
+
+    @classmethod
+    def row_factory(cls, columns):
+        """Fabrique de lignes SQLite (cursor.row_factory) pour cette projection."""
+        record_type = cls.for_columns(columns)
+        return lambda cursor, row: record_type(row)
+
+
 class Animals:
     """
     Classe pour gérer les opérations liées aux animaux dans la base de données.
     """
+    # Colonnes couvertes par la recherche (identiques pour la page et le décompte)
+    SEARCH_COLUMNS = ("nom", "espece", "race", "email", "description")
+
+    # Poids bm25 par colonne, dans l'ordre de SEARCH_COLUMNS
+    SEARCH_WEIGHTS = (10.0, 5.0, 5.0, 1.0, 1.0)
+
+    # Colonnes saisies par l'utilisateur, dans l'ordre des INSERT
+    FIELDS = ("nom", "espece", "race", "age", "description", "email", "adresse", "ville", "code_postal")
+
+    # Toutes les colonnes de la table, identifiant compris
+    COLUMNS = ("id",) + FIELDS
+
+    # Colonnes lues par vue : chaque page ne transfère que ce qu'elle affiche
+    PROJECTIONS = {
+        "detail": COLUMNS,
+        "list": ("id", "nom", "espece", "race", "email", "description"),
+        "admin": ("id", "nom", "espece", "race", "age", "email"),
+        "home": ("id", "nom", "espece", "email", "description"),
+    }
+
+    # Colonnes tronquées côté SQL pour certaines vues (aperçu de l'accueil)
+    TRUNCATED_COLUMNS = {"home": {"description": 100}}
+
+    # Filtres structurés : colonne -> condition SQL (paramétrée, colonnes indexées)
+    FILTERS = {
+        "espece": "animals.espece = ?",
+        "race": "animals.race = ?",
+        "ville": "animals.ville = ?",
+        "age_min": "animals.age >= ?",
+        "age_max": "animals.age <= ?",
+    }
+
+    # Tranches d'âge des facettes : (libellé, âge minimal, âge maximal ou None)
+    AGE_BUCKETS = (("0-1 an", 0, 1), ("2-4 ans", 2, 4), ("5-9 ans", 5, 9), ("10 ans et plus", 10, None))
+
+    # Nombre de lignes lues à la fois lors des parcours complets (fetchmany)
+    FETCH_BATCH_SIZE = 500
+
+    # Caches en lecture des recherches unitaires (configurés par init_app)
+    _id_cache = LRUCache()
+    _email_cache = LRUCache()
+
+    # Facettes calculées, indexées par révision des données (invalidation implicite)
+    _facet_cache = LRUCache()
+
+    # Fonctions appelées après chaque écriture validée : listener(action, animal_id)
+    _write_listeners = []
+
     def __init__(self, id, nom, espece, race, age, description, email, adresse, ville, code_postal):
         self.id = id
         self.nom = nom
@@ -19,28 +132,210 @@ class Animals:
 
 
     """
-        Méthode statique pour ajouter un nouvel animal dans la base de données.
+        Configure les caches de recherche unitaire à partir de la configuration Flask
+        (ANIMAL_CACHE_ENABLED, ANIMAL_CACHE_SIZE, ANIMAL_CACHE_TTL).
+    """
+    @staticmethod
+    def init_app(app):
+        enabled = app.config.get("ANIMAL_CACHE_ENABLED", True)
+        size = app.config.get("ANIMAL_CACHE_SIZE", 1024)
+        ttl = app.config.get("ANIMAL_CACHE_TTL", 30.0)
+        Animals._id_cache = LRUCache(max_size=size, ttl=ttl, enabled=enabled)
+        Animals._email_cache = LRUCache(max_size=size, ttl=ttl, enabled=enabled)
+        Animals._facet_cache = LRUCache(max_size=size, ttl=ttl, enabled=enabled)
+
+
+    """
+        Statistiques des caches (succès, échecs, évictions, expirations).
+    """
+    @staticmethod
+    def cache_stats():
+        return {"by_id": Animals._id_cache.stats(), "by_email": Animals._email_cache.stats(),
+                "facets": Animals._facet_cache.stats()}
+
+
+    """
+        Colonnes d'une vue : nom de PROJECTIONS ou tuple de colonnes explicite
+        (sélection de champs de l'API).
+    """
+    @staticmethod
+    def _projection(view):
+        return Animals.PROJECTIONS[view] if isinstance(view, str) else tuple(view)
+
+
+    """
+        Liste SELECT d'une vue (voir PROJECTIONS), colonnes préfixées par la table.
+    """
+    @staticmethod
+    def _select_list(view):
+        truncated = Animals.TRUNCATED_COLUMNS.get(view, {}) if isinstance(view, str) else {}
+        columns = []
+        for column in Animals._projection(view):
+            if column in truncated:
+                columns.append(f"substr(animals.{column}, 1, {truncated[column]}) AS {column}")
+            else:
+                columns.append(f"animals.{column}")
+        return ", ".join(columns)
+
+
+    """
+        Configure le curseur pour produire des AnimalRecord de la vue demandée.
+    """
+    @staticmethod
+    def _records_cursor(db, view):
+        cursor = db.cursor()
+        cursor.row_factory = AnimalRecord.row_factory(Animals._projection(view))
+        return cursor
+
+
+    """
+        Enregistre une fonction appelée après chaque écriture validée
+        (action : 'create', 'create_many', 'update' ou 'delete').
+    """
+    @staticmethod
+    def add_write_listener(listener):
+        if listener not in Animals._write_listeners:
+            Animals._write_listeners.append(listener)
+
+
+    @staticmethod
+    def _notify_write(action, animal_id=None):
+        for listener in Animals._write_listeners:
+            try:
+                listener(action, animal_id)
+            except Exception as e:
+                logging.error("Erreur dans un écouteur d'écriture (%s) : %s", action, e)
+
+
+    """
+        Invalide les entrées de cache d'un animal (par ID, par emails connus et
+        par toute entrée email pointant encore vers cet ID).
+    """
+    @staticmethod
+    def _invalidate_cache(animal_id=None, *emails):
+        if animal_id is not None:
+            Animals._id_cache.invalidate(animal_id)
+            Animals._email_cache.invalidate_where(lambda animal: animal is not None and animal["id"] == animal_id)
+        for email in emails:
+            Animals._email_cache.invalidate(email)
+
+
+    """
+        Méthode statique pour ajouter un nouvel animal dans la base de données,
+        en une seule instruction : l'unicité de l'email est vérifiée par la
+        contrainte UNIQUE (ON CONFLICT), sans lecture préalable ni concurrence
+        possible entre la vérification et l'insertion.
+        Retourne l'ID créé, ou None si l'email est déjà utilisé. Les autres
+        violations de contrainte (sqlite3.IntegrityError) sont propagées.
     """
     @staticmethod
     def create(nom, espece, race, age, description, email, adresse, ville, code_postal):
+        query = """
+        INSERT INTO animals (nom, espece, race, age, description, email, adresse, ville, code_postal)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(email) DO NOTHING
+        RETURNING id
+        """
+        params = (nom, espece, race, age, description, email, adresse, ville, code_postal)
+
+        def insert(db):
+            cursor = db.cursor()
+            try:
+                logging.debug("Executing query: %s with params: %s", query, params)
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                return rows[0][0] if rows else None
+            finally:
+                cursor.close()
+
+        try:
+            animal_id = Database.run_write(insert)
+        except Exception as e:
+            logging.error("Erreur lors de l'ajout : %s", e)
+            raise
+        if animal_id is None:
+            return None
+        # L'ID peut avoir été mis en cache comme inexistant (IDs réutilisables)
+        Animals._invalidate_cache(animal_id, email)
+        Animals._notify_write("create", animal_id)
+        logging.info("Animal ajouté avec succès.")
+        return animal_id
+
+    
+
+    """
+        Méthode statique pour ajouter un lot d'animaux en une seule transaction
+        (executemany). `rows` est une liste de dictionnaires contenant les champs
+        de FIELDS. Si une contrainte d'intégrité échoue (ex. email inséré entre-temps
+        par une autre requête), le lot est rejoué ligne par ligne pour isoler les
+        lignes fautives. L'écriture passe par Database.run_write ; les caches et les
+        écouteurs ne sont prévenus qu'après sa validation.
+        Retourne la liste des échecs [(position, message), ...].
+    """
+    @staticmethod
+    def create_many(rows):
+        query = f"""
+            INSERT INTO animals ({", ".join(Animals.FIELDS)})
+            VALUES ({", ".join("?" for _ in Animals.FIELDS)})
+        """
+        params = [tuple(row[field] for field in Animals.FIELDS) for row in rows]
+
+        def insert(db):
+            cursor = db.cursor()
+            try:
+                # SAVEPOINT : le rejeu n'annule que ce lot, y compris dans une écriture groupée
+                cursor.execute("SAVEPOINT lot")
+                try:
+                    cursor.executemany(query, params)
+                    cursor.execute("RELEASE lot")
+                    return []
+                except sqlite3.IntegrityError:
+                    cursor.execute("ROLLBACK TO lot")
+                failures = []
+                for position, values in enumerate(params):
+                    try:
+                        cursor.execute(query, values)
+                    except sqlite3.IntegrityError as e:
+                        failures.append((position, str(e)))
+                cursor.execute("RELEASE lot")
+                return failures
+            finally:
+                cursor.close()
+
+        try:
+            failures = Database.run_write(insert)
+        except Exception as e:
+            logging.error("Erreur lors de l'ajout d'un lot : %s", e)
+            raise
+        if len(failures) < len(rows):
+            # Résultats négatifs devenus faux : emails importés et IDs mis en cache comme absents
+            for row in rows:
+                Animals._email_cache.invalidate(row["email"])
+            Animals._id_cache.invalidate_where(lambda animal: animal is None)
+            Animals._notify_write("create_many")
+        return failures
+
+
+    """
+        Retourne l'ensemble des emails de `emails` déjà présents dans la base.
+    """
+    @staticmethod
+    def find_existing_emails(emails):
         db = Database.get_connection()
         cursor = db.cursor()
+        emails = list(emails)
+        existing = set()
         try:
-            query = """
-            INSERT INTO animals (nom, espece, race, age, description, email, adresse, ville, code_postal)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (nom, espece, race, age, description, email, adresse, ville, code_postal)
-            logging.debug(f"Executing query: {query} with params: {params}")
-            cursor.execute(query, params)
-            db.commit()
-            logging.info("Animal ajouté avec succès.")
-        except Exception as e:
-            logging.error(f"Erreur lors de l'ajout : {e}")
+            # Découpage pour rester sous la limite de paramètres de SQLite
+            for start in range(0, len(emails), 900):
+                chunk = emails[start:start + 900]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(f"SELECT email FROM animals WHERE email IN ({placeholders})", chunk)
+                existing.update(row["email"] for row in cursor.fetchall())
+            return existing
         finally:
             cursor.close()
 
-    
 
     """
         Méthode statique pour rechercher un animal par son email.
@@ -48,16 +343,19 @@ class Animals:
     """
     @staticmethod
     def find_by_email(email):
+        cached = Animals._email_cache.get(email)
+        if cached is not MISSING:
+            return cached
+
         db = Database.get_connection()
-        cursor = db.cursor()
+        cursor = Animals._records_cursor(db, "detail")
         try:
-            cursor.execute("SELECT * FROM animals WHERE email = ?", (email,))
-            row = cursor.fetchone()
-            if row:
-                return dict(row)  # Retourne un dictionnaire au lieu d'une instance ou None
-            return None
+            cursor.execute(f"SELECT {Animals._select_list('detail')} FROM animals WHERE email = ?", (email,))
+            animal = cursor.fetchone()  # AnimalRecord immuable, partageable via le cache, ou None
+            Animals._email_cache.set(email, animal)
+            return animal
         except Exception as e:
-            logging.error (f"Erreur lors de la recherche : {e}")
+            logging.error("Erreur lors de la recherche : %s", e)
             return {"error": f"Erreur lors de la recherche : {e}"}
         finally:
             cursor.close()
@@ -67,89 +365,235 @@ class Animals:
     @staticmethod
     def find_by_id(animal_id):
         """
-        Récupère un animal par son ID.
+        Récupère un animal par son ID (cache LRU + TTL en lecture).
         """
+        cached = Animals._id_cache.get(animal_id)
+        if cached is not MISSING:
+            return cached
+
         db = Database.get_connection()
-        cursor = db.cursor()
+        cursor = Animals._records_cursor(db, "detail")
         try:
-            cursor.execute("SELECT * FROM animals WHERE id = ?", (animal_id,))
-            row = cursor.fetchone()
-            if row:
-                return dict(row)  # Convertir la ligne en dictionnaire
-            return None
+            cursor.execute(f"SELECT {Animals._select_list('detail')} FROM animals WHERE id = ?", (animal_id,))
+            animal = cursor.fetchone()  # AnimalRecord immuable, partageable via le cache, ou None
+            Animals._id_cache.set(animal_id, animal)
+            return animal
         except Exception as e:
-            logging.error(f"Erreur lors de la récupération de l'animal avec ID {animal_id} : {e}")
+            logging.error("Erreur lors de la récupération de l'animal avec ID %s : %s", animal_id, e)
             return None
         finally:
             cursor.close()
 
 
     """
-        Méthode statique pour récupérer tous les animaux dans la base de données
-        et les afficher dans la console. Retourne aussi les données.
+        Méthode statique (générateur) pour parcourir tous les animaux de la base
+        de données. Les lignes sont lues par lots avec fetchmany, de sorte que
+        la mémoire utilisée reste bornée quelle que soit la taille de la table.
     """
     @staticmethod
-    def display_all():
+    def display_all(batch_size=FETCH_BATCH_SIZE, view="admin"):
         db = Database.get_connection()
-        cursor = db.cursor()
+        cursor = Animals._records_cursor(db, view)
         try:
-            cursor.execute("SELECT * FROM animals")
-            recovery = cursor.fetchall()
-            # Retourner les données sous forme de liste de dictionnaires
-            return [dict(row) for row in recovery]
+            cursor.execute(f"SELECT {Animals._select_list(view)} FROM animals ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
         except Exception as e:
-            logging.error(f"Erreur lors de l'affichage : {e}")
-            return []
+            logging.error("Erreur lors de l'affichage : %s", e)
         finally:
             cursor.close()
     
     """
-        Méthode statique pour supprimer un animal par son ID.
+        Méthode statique (générateur) pour exporter des lignes brutes (tuples)
+        limitées aux colonnes demandées, éventuellement filtrées par le même
+        critère de recherche que search_paginated. Lecture par lots (fetchmany).
+        Sans recherche, `after_id` limite le parcours aux IDs supérieurs.
     """
     @staticmethod
-    def delete_by_id(animal_id):
+    def iter_rows(columns=None, query=None, batch_size=FETCH_BATCH_SIZE, after_id=None):
+        columns = tuple(columns or Animals.COLUMNS)
+        unknown = [column for column in columns if column not in Animals.COLUMNS]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues : {', '.join(unknown)}")
+
         db = Database.get_connection()
         cursor = db.cursor()
         try:
-            cursor.execute("DELETE FROM animals WHERE id = ?", (animal_id,))
-            db.commit()
-            if cursor.rowcount > 0:
-                logging.error(f"Animal avec ID {animal_id} supprimé avec succès.")
+            selected = ", ".join(f"animals.{column}" for column in columns)
+            match = Animals._fts_match_expression(query) if query else None
+            if query and Database.FTS_ENABLED and match:
+                cursor.execute(f"""
+                    SELECT {selected} FROM animals
+                    JOIN animals_fts ON animals.id = animals_fts.rowid
+                    WHERE animals_fts MATCH ?
+                    ORDER BY animals.id
+                """, (match,))
+            elif query:
+                clause, params = Animals._like_clause(query)
+                cursor.execute(f"SELECT {selected} FROM animals WHERE {clause} ORDER BY id", params)
+            elif after_id is not None:
+                cursor.execute(f"SELECT {selected} FROM animals WHERE id > ? ORDER BY id", (after_id,))
             else:
-                logging.error(f"Aucun animal trouvé avec l'ID {animal_id}.")
-        except Exception as e:
-            logging.error(f"Erreur lors de la suppression : {e}")
+                cursor.execute(f"SELECT {selected} FROM animals ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(row)
         finally:
             cursor.close()
 
 
     """
-        Méthode statique pour mettre à jour les informations d'un animal.
+        Méthode statique pour supprimer un animal par son ID.
     """
     @staticmethod
-    def update(animal_id, nom, espece, race, age, description, email, adresse, ville, code_postal):
-        db = Database.get_connection()
-        cursor = db.cursor()
+    def delete_by_id(animal_id):
+        def delete(db):
+            cursor = db.cursor()
+            try:
+                cursor.execute("DELETE FROM animals WHERE id = ?", (animal_id,))
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
         try:
-            cursor.execute(
-                """
-                UPDATE animals
-                SET nom = ?, espece = ?, race = ?, age = ?, description = ?, email = ?, adresse = ?, ville = ?, code_postal = ?
-                WHERE id = ?
-                """,
-                (nom, espece, race, age, description, email, adresse, ville, code_postal, animal_id)
-            )
-            db.commit()
-            if cursor.rowcount > 0:
-                logging.error(f"Animal avec ID {animal_id} mis à jour avec succès.")
+            deleted = Database.run_write(delete)
+            Animals._invalidate_cache(animal_id)
+            Animals._notify_write("delete", animal_id)
+            if deleted > 0:
+                logging.info("Animal avec ID %s supprimé avec succès.", animal_id)
             else:
-                logging.error(f"Aucun animal trouvé avec l'ID {animal_id}.")
+                logging.warning("Aucun animal trouvé avec l'ID %s.", animal_id)
         except Exception as e:
-            logging.error(f"Erreur lors de la mise à jour : {e}")
-        finally:
-            cursor.close()
+            logging.error("Erreur lors de la suppression : %s", e)
+
+
+    """
+        Méthode statique pour mettre à jour les informations d'un animal, en une
+        seule instruction (UPDATE ... RETURNING) : l'existence de l'animal est
+        donnée par la ligne retournée et l'unicité de l'email par la contrainte
+        UNIQUE. Retourne True si l'animal a été mis à jour, False s'il n'existe
+        pas. Les violations de contrainte (sqlite3.IntegrityError) sont propagées.
+    """
+    @staticmethod
+    def update(animal_id, nom, espece, race, age, description, email, adresse, ville, code_postal):
+        def apply(db):
+            cursor = db.cursor()
+            try:
+                cursor.execute(
+                    """
+                    UPDATE animals
+                    SET nom = ?, espece = ?, race = ?, age = ?, description = ?, email = ?, adresse = ?, ville = ?, code_postal = ?
+                    WHERE id = ?
+                    RETURNING id
+                    """,
+                    (nom, espece, race, age, description, email, adresse, ville, code_postal, animal_id)
+                )
+                return bool(cursor.fetchall())
+            finally:
+                cursor.close()
+
+        try:
+            updated = Database.run_write(apply)
+        except sqlite3.IntegrityError:
+            # Conflit attendu (ex. email déjà utilisé) : journalisé par l'appelant
+            raise
+        except Exception as e:
+            logging.error("Erreur lors de la mise à jour : %s", e)
+            raise
+        if not updated:
+            logging.warning("Aucun animal trouvé avec l'ID %s.", animal_id)
+            return False
+        Animals._invalidate_cache(animal_id, email)
+        Animals._notify_write("update", animal_id)
+        logging.info("Animal avec ID %s mis à jour avec succès.", animal_id)
+        return True
         
     
+    """
+        Applique un lot d'écritures en une seule transaction : `creates` (liste de
+        dictionnaires complets), `updates` (dictionnaires avec `id` et les champs
+        à modifier) puis `deletes` (liste d'IDs), par Database.run_write. Au premier
+        échec de contrainte, tout le lot est annulé.
+        Retourne {"created": [...], "updated": [...], "deleted": [...], "failure": None}
+        ou, en cas d'échec, "failure" = {"operation", "position", "error"}.
+    """
+    @staticmethod
+    def apply_batch(creates=(), updates=(), deletes=()):
+        insert = f"""
+            INSERT INTO animals ({", ".join(Animals.FIELDS)})
+            VALUES ({", ".join("?" for _ in Animals.FIELDS)})
+            RETURNING id
+        """
+
+        def apply(db):
+            cursor = db.cursor()
+            cursor.row_factory = None
+            result = {"created": [], "updated": [], "deleted": [], "failure": None}
+            operation, position = None, None
+            # SAVEPOINT : un échec n'annule que ce lot, y compris dans une écriture groupée
+            cursor.execute("SAVEPOINT lot")
+            try:
+                operation = "create"
+                for position, row in enumerate(creates):
+                    cursor.execute(insert, tuple(row[field] for field in Animals.FIELDS))
+                    result["created"].append(cursor.fetchone()[0])
+
+                operation = "update"
+                for position, row in enumerate(updates):
+                    fields = [field for field in Animals.FIELDS if field in row]
+                    assignments = ", ".join(f"{field} = ?" for field in fields)
+                    cursor.execute(
+                        f"UPDATE animals SET {assignments} WHERE id = ? RETURNING id",
+                        (*(row[field] for field in fields), row["id"])
+                    )
+                    if cursor.fetchone():
+                        result["updated"].append(row["id"])
+
+                operation, position = "delete", None
+                ids = list(deletes)
+                # Découpage pour rester sous la limite de paramètres de SQLite
+                for start in range(0, len(ids), 900):
+                    chunk = ids[start:start + 900]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(f"DELETE FROM animals WHERE id IN ({placeholders}) RETURNING id", chunk)
+                    result["deleted"].extend(row[0] for row in cursor.fetchall())
+
+                cursor.execute("RELEASE lot")
+                return result
+            except sqlite3.IntegrityError as e:
+                cursor.execute("ROLLBACK TO lot")
+                cursor.execute("RELEASE lot")
+                logging.warning("Lot annulé (%s, position %s) : %s", operation, position, e)
+                return {"created": [], "updated": [], "deleted": [],
+                        "failure": {"operation": operation, "position": position, "error": e}}
+            finally:
+                cursor.close()
+
+        result = Database.run_write(apply)
+        if result["failure"]:
+            return result
+
+        for animal_id in result["updated"] + result["deleted"]:
+            Animals._invalidate_cache(animal_id)
+        for row in list(creates) + list(updates):
+            if "email" in row:
+                Animals._email_cache.invalidate(row["email"])
+        if result["created"]:
+            Animals._id_cache.invalidate_where(lambda animal: animal is None)
+        for action, key in (("create", "created"), ("update", "updated"), ("delete", "deleted")):
+            for animal_id in result[key]:
+                Animals._notify_write(action, animal_id)
+        logging.info("Lot appliqué : %s créé(s), %s modifié(s), %s supprimé(s).",
+                     len(result["created"]), len(result["updated"]), len(result["deleted"]))
+        return result
+
+
     """
         Compte le nombre total d'animaux dans la base de données.
     """
@@ -158,57 +602,203 @@ class Animals:
         db = Database.get_connection()
         cursor = db.cursor()
         try:
-            cursor.execute("SELECT COUNT(*) AS count FROM animals")
+            if Database.STATS_ENABLED:
+                # Compteur maintenu par triggers : lecture O(1)
+                cursor.execute("SELECT total AS count FROM animals_stats WHERE dimension = 'total'")
+            else:
+                cursor.execute("SELECT COUNT(*) AS count FROM animals")
             result = cursor.fetchone()
             return result["count"]
         except Exception as e:
-            logging.error(f"Erreur lors du comptage des animaux : {e}")
+            logging.error("Erreur lors du comptage des animaux : %s", e)
             return 0
         finally:
             cursor.close()
     
     
     """
-        Récupère une liste d'animaux avec pagination.
+        Retourne le numéro de révision des données (incrémenté par triggers à
+        chaque écriture, tous processus confondus), ou None s'il est indisponible.
+    """
+    @staticmethod
+    def data_revision():
+        if not Database.STATS_ENABLED:
+            return None
+        db = Database.get_connection()
+        cursor = db.cursor()
+        try:
+            cursor.execute("SELECT total FROM animals_stats WHERE dimension = 'revision'")
+            row = cursor.fetchone()
+            return row["total"] if row else None
+        except Exception as e:
+            logging.error("Erreur lors de la lecture de la révision des données : %s", e)
+            return None
+        finally:
+            cursor.close()
+
+
+    """
+        Retourne les décomptes matérialisés d'une dimension ('espece' ou 'ville'),
+        du plus fréquent au moins fréquent, sous forme de liste de dictionnaires.
     """
     @staticmethod
-    def get_paginated_animals(page, per_page):
+    def get_statistics(dimension):
         db = Database.get_connection()
         cursor = db.cursor()
+        try:
+            if Database.STATS_ENABLED:
+                cursor.execute(
+                    "SELECT valeur, total FROM animals_stats WHERE dimension = ? ORDER BY total DESC, valeur",
+                    (dimension,)
+                )
+            elif dimension in ("espece", "ville"):
+                cursor.execute(
+                    f"SELECT {dimension} AS valeur, COUNT(*) AS total FROM animals GROUP BY {dimension} ORDER BY total DESC, valeur"
+                )
+            else:
+                return []
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logging.error("Erreur lors de la lecture des statistiques (%s) : %s", dimension, e)
+            return []
+        finally:
+            cursor.close()
+
+
+    """
+        Récupère une liste d'animaux avec pagination.
+    """
+    @staticmethod
+    def get_paginated_animals(page, per_page, view="list"):
+        db = Database.get_connection()
+        cursor = Animals._records_cursor(db, view)
         try:
             offset = (page - 1) * per_page  # Calcul du décalage
-            cursor.execute("SELECT * FROM animals LIMIT ? OFFSET ?", (per_page, offset))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            cursor.execute(
+                f"SELECT {Animals._select_list(view)} FROM animals ORDER BY id LIMIT ? OFFSET ?",
+                (per_page, offset)
+            )
+            return cursor.fetchall()
         except Exception as e:
-            logging.error(f"Erreur lors de la récupération des animaux paginés : {e}")
+            logging.error("Erreur lors de la récupération des animaux paginés : %s", e)
             return []
         finally:
             cursor.close()
             
     
+    """
+        Normalise des filtres bruts (ex. request.args) : seules les clés de
+        FILTERS sont gardées, les valeurs vides sont ignorées et les bornes
+        d'âge doivent être des entiers.
+    """
+    @staticmethod
+    def normalize_filters(raw):
+        filters = {}
+        for key in Animals.FILTERS:
+            value = raw.get(key) if raw else None
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ""):
+                continue
+            if key in ("age_min", "age_max"):
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    continue
+            filters[key] = value
+        return filters
+
+
+    """
+        Conditions SQL (liste) et paramètres des filtres structurés. Seules les
+        conditions fixes de FILTERS sont utilisées : les valeurs passent toujours
+        par des paramètres.
+    """
+    @staticmethod
+    def _filter_conditions(filters):
+        conditions, params = [], []
+        for key, condition in Animals.FILTERS.items():
+            if filters and key in filters:
+                conditions.append(condition)
+                params.append(filters[key])
+        return conditions, params
+
+
+    """
+        Source SQL, conditions et paramètres communs à la recherche (FTS ou LIKE)
+        et aux filtres structurés.
+    """
+    @staticmethod
+    def _search_source(query=None, filters=None):
+        conditions, params, source = [], [], "animals"
+        if query:
+            match = Animals._fts_match_expression(query)
+            if Database.FTS_ENABLED and match:
+                source = "animals JOIN animals_fts ON animals.id = animals_fts.rowid"
+                conditions.append("animals_fts MATCH ?")
+                params.append(match)
+            else:
+                clause, like_params = Animals._like_clause(query)
+                conditions.append(f"({clause})")
+                params.extend(like_params)
+        filter_conditions, filter_params = Animals._filter_conditions(filters)
+        return source, conditions + filter_conditions, params + filter_params
+
+
+    """
+        Construit l'expression MATCH FTS5 d'une saisie utilisateur : chaque mot
+        devient une requête par préfixe entre guillemets ("chi"* trouve « chien »).
+        Retourne None si la saisie ne contient aucun mot indexable.
+    """
+    @staticmethod
+    def _fts_match_expression(query):
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return None
+        return " ".join(f'"{term}"*' for term in terms)
+
+
+    """
+        Clause WHERE et paramètres du mode de repli LIKE (sans FTS5).
+    """
+    @staticmethod
+    def _like_clause(query):
+        search_query = f"%{query}%"
+        clause = " OR ".join(f"{column} LIKE ?" for column in Animals.SEARCH_COLUMNS)
+        return clause, (search_query,) * len(Animals.SEARCH_COLUMNS)
+
+
     """
         Recherche des animaux avec pagination en fonction d'un mot-clé.
+        Les résultats sont classés par pertinence (bm25) lorsque FTS5 est disponible.
     """
     @staticmethod
-    def search_paginated(query, page, per_page):
+    def search_paginated(query, page, per_page, view="list"):
         db = Database.get_connection()
-        cursor = db.cursor()
+        cursor = Animals._records_cursor(db, view)
         try:
-            search_query = f"%{query}%"
+            selected = Animals._select_list(view)
             offset = (page - 1) * per_page
-            cursor.execute("""
-                SELECT * FROM animals
-                WHERE nom LIKE ?
-                OR espece LIKE ?
-                OR email LIKE ?
-                OR description LIKE ?
-                LIMIT ? OFFSET ?
-            """, (search_query, search_query, search_query, search_query, per_page, offset))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            match = Animals._fts_match_expression(query)
+            if Database.FTS_ENABLED and match:
+                weights = ", ".join(str(weight) for weight in Animals.SEARCH_WEIGHTS)
+                cursor.execute(f"""
+                    SELECT {selected} FROM animals_fts
+                    JOIN animals ON animals.id = animals_fts.rowid
+                    WHERE animals_fts MATCH ?
+                    ORDER BY bm25(animals_fts, {weights})
+                    LIMIT ? OFFSET ?
+                """, (match, per_page, offset))
+            else:
+                clause, params = Animals._like_clause(query)
+                cursor.execute(f"""
+                    SELECT {selected} FROM animals
+                    WHERE {clause}
+                    LIMIT ? OFFSET ?
+                """, params + (per_page, offset))
+            return cursor.fetchall()
         except Exception as e:
-            logging.error(f"Erreur lors de la recherche paginée : {e}")
+            logging.error("Erreur lors de la recherche paginée : %s", e)
             return []
         finally:
             cursor.close()
@@ -222,19 +812,223 @@ class Animals:
         db = Database.get_connection()
         cursor = db.cursor()
         try:
-            search_query = f"%{query}%"
-            cursor.execute("""
-                SELECT COUNT(*) AS count FROM animals
-                WHERE nom LIKE ?
-                OR espece LIKE ?
-                OR email LIKE ?
-                OR description LIKE ?
-                OR race LIKE ?
-            """, (search_query, search_query, search_query, search_query, search_query))
+            match = Animals._fts_match_expression(query)
+            if Database.FTS_ENABLED and match:
+                cursor.execute(
+                    "SELECT COUNT(*) AS count FROM animals_fts WHERE animals_fts MATCH ?",
+                    (match,)
+                )
+            else:
+                clause, params = Animals._like_clause(query)
+                cursor.execute(f"SELECT COUNT(*) AS count FROM animals WHERE {clause}", params)
             result = cursor.fetchone()
             return result["count"]
         except Exception as e:
-            logging.error(f"Erreur lors du comptage des résultats : {e}")
+            logging.error("Erreur lors du comptage des résultats : %s", e)
+            return 0
+        finally:
+            cursor.close()
+
+
+    """
+        Compte les animaux correspondant à une recherche et à des filtres structurés.
+    """
+    @staticmethod
+    def count_filtered(query=None, filters=None):
+        db = Database.get_connection()
+        cursor = db.cursor()
+        try:
+            source, conditions, params = Animals._search_source(query, filters)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor.execute(f"SELECT COUNT(*) FROM {source} {where}", params)
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logging.error("Erreur lors du comptage filtré : %s", e)
             return 0
+        finally:
+            cursor.close()
+
+
+    """
+        Facettes (espèce, race, ville, tranche d'âge) des animaux correspondant à
+        la recherche et aux filtres courants, calculées en une seule agrégation
+        GROUP BY sur les quatre dimensions puis cumulées par dimension.
+        Le résultat est mis en cache par révision des données.
+        Retourne {"espece": [{"valeur", "total"}, ...], "race": ..., "ville": ...,
+                  "age": [{"valeur", "min", "max", "total"}, ...]}.
+    """
+    @staticmethod
+    def get_facets(query=None, filters=None):
+        revision = Animals.data_revision()
+        key = (revision, query or "", tuple(sorted((filters or {}).items())))
+        if revision is not None:
+            cached = Animals._facet_cache.get(key)
+            if cached is not MISSING:
+                return cached
+
+        buckets = " ".join(
+            f"WHEN animals.age <= {high} THEN {position}" if high is not None else f"ELSE {position}"
+            for position, (_, _, high) in enumerate(Animals.AGE_BUCKETS)
+        )
+        db = Database.get_connection()
+        cursor = db.cursor()
+        cursor.row_factory = None
+        try:
+            source, conditions, params = Animals._search_source(query, filters)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor.execute(f"""
+                SELECT animals.espece, animals.race, animals.ville, CASE {buckets} END AS tranche, COUNT(*)
+                FROM {source} {where}
+                GROUP BY 1, 2, 3, 4
+            """, params)
+            totals = {"espece": {}, "race": {}, "ville": {}, "age": {}}
+            for espece, race, ville, tranche, count in cursor.fetchall():
+                for dimension, value in (("espece", espece), ("race", race), ("ville", ville), ("age", tranche)):
+                    totals[dimension][value] = totals[dimension].get(value, 0) + count
+        except Exception as e:
+            logging.error("Erreur lors du calcul des facettes : %s", e)
+            return {"espece": [], "race": [], "ville": [], "age": []}
+        finally:
+            cursor.close()
+
+        facets = {
+            dimension: [{"valeur": value, "total": total}
+                        for value, total in sorted(totals[dimension].items(), key=lambda item: (-item[1], item[0]))]
+            for dimension in ("espece", "race", "ville")
+        }
+        facets["age"] = [
+            {"valeur": label, "min": low, "max": high, "total": totals["age"][position]}
+            for position, (label, low, high) in enumerate(Animals.AGE_BUCKETS)
+            if position in totals["age"]
+        ]
+        if revision is not None:
+            Animals._facet_cache.set(key, facets)
+        return facets
+
+
+    """
+        Pagination par curseur (keyset) sur la clé stable `id`.
+        `after_id` retourne la page suivant cet identifiant, `before_id` celle qui
+        le précède ; sans curseur, retourne la première page. Avec `query`, les
+        résultats de recherche sont filtrés de la même façon que search_paginated,
+        mais triés par `id` pour que les curseurs restent stables. `filters`
+        ajoute les filtres structurés (voir FILTERS).
+        Retourne {"animals": [...], "next_cursor": id|None, "prev_cursor": id|None}.
+    """
+    @staticmethod
+    def get_animals_by_cursor(per_page, after_id=None, before_id=None, query=None, view="list", filters=None):
+        db = Database.get_connection()
+        cursor = Animals._records_cursor(db, view)
+        try:
+            source, conditions, params = Animals._search_source(query, filters)
+
+            backwards = before_id is not None
+            if backwards:
+                conditions.append("animals.id < ?")
+                params.append(before_id)
+            elif after_id is not None:
+                conditions.append("animals.id > ?")
+                params.append(after_id)
+
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            order = "DESC" if backwards else "ASC"
+            # Une ligne de plus que demandé indique s'il reste des résultats
+            cursor.execute(
+                f"SELECT {Animals._select_list(view)} FROM {source} {where} ORDER BY animals.id {order} LIMIT ?",
+                (*params, per_page + 1)
+            )
+            rows = cursor.fetchall()
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+            if backwards:
+                rows.reverse()
+
+            next_cursor = prev_cursor = None
+            if rows:
+                if backwards:
+                    next_cursor = rows[-1]["id"]
+                    prev_cursor = rows[0]["id"] if has_more else None
+                else:
+                    next_cursor = rows[-1]["id"] if has_more else None
+                    if after_id is not None:
+                        # Sonde indexée : existe-t-il au moins une ligne avant cette page ?
+                        conditions[-1] = "animals.id < ?"
+                        params[-1] = rows[0]["id"]
+                        where = f"WHERE {' AND '.join(conditions)}"
+                        cursor.execute(f"SELECT 1 FROM {source} {where} LIMIT 1", params)
+                        if cursor.fetchone():
+                            prev_cursor = rows[0]["id"]
+            return {"animals": rows, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+        except Exception as e:
+            logging.error("Erreur lors de la pagination par curseur : %s", e)
+            return {"animals": [], "next_cursor": None, "prev_cursor": None}
+        finally:
+            cursor.close()
+
+
+    """
+        Récupère une page d'animaux (avec ou sans recherche et filtres structurés)
+        et le nombre total de résultats en une seule instruction, grâce à la
+        fonction fenêtre COUNT(*) OVER().
+        Retourne un tuple (animaux, total).
+    """
+    @staticmethod
+    def get_page_with_total(page, per_page, query=None, view="list", filters=None):
+        db = Database.get_connection()
+        cursor = db.cursor()
+        # Tuples bruts : le total (dernière colonne) est retiré avant de construire les enregistrements
+        cursor.row_factory = None
+        record_type = AnimalRecord.for_columns(Animals._projection(view))
+        try:
+            selected = Animals._select_list(view)
+            offset = (page - 1) * per_page
+            filter_conditions, filter_params = Animals._filter_conditions(filters)
+            match = Animals._fts_match_expression(query) if query else None
+            if query and Database.FTS_ENABLED and match:
+                weights = ", ".join(str(weight) for weight in Animals.SEARCH_WEIGHTS)
+                where = f"WHERE {' AND '.join(filter_conditions)}" if filter_conditions else ""
+                # bm25() n'est pas utilisable à côté d'une fonction fenêtre :
+                # le score est calculé dans une sous-requête
+                cursor.execute(f"""
+                    SELECT {selected}, COUNT(*) OVER () AS total_count FROM (
+                        SELECT rowid, bm25(animals_fts, {weights}) AS score
+                        FROM animals_fts WHERE animals_fts MATCH ?
+                    ) AS hits
+                    JOIN animals ON animals.id = hits.rowid
+                    {where}
+                    ORDER BY hits.score
+                    LIMIT ? OFFSET ?
+                """, (match, *filter_params, per_page, offset))
+            elif query:
+                clause, params = Animals._like_clause(query)
+                conditions = [f"({clause})"] + filter_conditions
+                cursor.execute(f"""
+                    SELECT {selected}, COUNT(*) OVER () AS total_count FROM animals
+                    WHERE {' AND '.join(conditions)}
+                    LIMIT ? OFFSET ?
+                """, (*params, *filter_params, per_page, offset))
+            elif Database.STATS_ENABLED and not filter_conditions:
+                # Sans filtre, le total vient du compteur matérialisé : pas de parcours complet
+                cursor.execute(f"SELECT {selected} FROM animals ORDER BY id LIMIT ? OFFSET ?", (per_page, offset))
+                return [record_type(row) for row in cursor.fetchall()], Animals.count_animals()
+            else:
+                where = f"WHERE {' AND '.join(filter_conditions)}" if filter_conditions else ""
+                cursor.execute(
+                    f"SELECT {selected}, COUNT(*) OVER () AS total_count FROM animals {where} ORDER BY id LIMIT ? OFFSET ?",
+                    (*filter_params, per_page, offset)
+                )
+            rows = cursor.fetchall()
+            if not rows:
+                # Page hors limites : aucune ligne ne porte le total, on le calcule à part
+                if filters:
+                    return [], Animals.count_filtered(query, filters)
+                total = Animals.count_search_results(query) if query else Animals.count_animals()
+                return [], total
+
+            total = rows[0][-1]
+            return [record_type(row[:-1]) for row in rows], total
+        except Exception as e:
+            logging.error("Erreur lors de la récupération de la page et du total : %s", e)
+            return [], 0
         finally:
             cursor.close()
\ No newline at end of file
@@ -0,0 +1,192 @@
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, g, request
+from app.database import Database
+
+"""
+
+    Exécution des appels à la base sur un pool de threads borné, avec échéance
+    par requête.
+
+    En mode ASGI, chaque requête reçoit l'échéance fixée par l'adaptateur
+    (REQUEST_TIMEOUT) ; en WSGI simple, il n'y en a pas. `Offload.gather`
+    lance plusieurs appels indépendants en parallèle (ex. page et facettes de
+    la liste), chacun dans son propre contexte d'application, sur la connexion
+    dédiée de son thread. Une requête SQL encore en cours à l'échéance est
+    interrompue par un gestionnaire de progression SQLite, dans le thread de la
+    requête comme dans ceux du pool, ce qui libère le thread et la connexion.
+
+    Référence : https://www.sqlite.org/c3ref/progress_handler.html
+
+"""
+
+# Nombre d'instructions de la machine virtuelle SQLite entre deux vérifications de l'échéance
+PROGRESS_STEPS = 10000
+
+
+class Offload:
+    """
+    Pool de threads des appels à la base (configuré par init_app).
+    """
+    _executor = None
+    _workers = 0
+    _busy = 0
+    _lock = threading.Lock()
+    _local = threading.local()
+    _connections = []
+    _stats = {"calls": 0, "parallel": 0, "inline": 0, "timeouts": 0}
+
+    @staticmethod
+    def init_app(app):
+        """
+        Crée le pool (DB_OFFLOAD_WORKERS, par défaut ASGI_MAX_CONCURRENCY ; 0 = appels
+        séquentiels) et relève l'échéance de chaque requête (fixée par l'adaptateur ASGI).
+        """
+        Offload.shutdown()
+        Offload._workers = app.config.get("DB_OFFLOAD_WORKERS", app.config.get("ASGI_MAX_CONCURRENCY", 32))
+        Offload._executor = ThreadPoolExecutor(max_workers=Offload._workers, thread_name_prefix="db-offload") \
+            if Offload._workers > 0 else None
+        app.before_request(Offload._start_deadline)
+
+    @staticmethod
+    def shutdown():
+        """Arrête le pool et ferme les connexions ouvertes par ses threads."""
+        executor, Offload._executor = Offload._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with Offload._lock:
+            connections, Offload._connections = Offload._connections, []
+            Offload._busy = 0
+        for pool, connection in connections:
+            pool.close_dedicated(connection)
+        Offload._local = threading.local()
+
+    @staticmethod
+    def _start_deadline():
+        # Hors ASGI, aucune échéance : une requête WSGI n'est jamais interrompue
+        g.deadline = request.environ.get("animals.deadline")
+
+    @staticmethod
+    def deadline():
+        """Échéance (time.monotonic) de la requête courante, ou None."""
+        return g.get("deadline")
+
+    @staticmethod
+    def expired():
+        deadline = Offload.deadline()
+        return deadline is not None and time.monotonic() >= deadline
+
+    @staticmethod
+    def _connection():
+        # Connexion propre à chaque thread du pool, hors du pool de la requête :
+        # une requête qui détient déjà une connexion ne peut pas bloquer ses propres appels
+        connection = getattr(Offload._local, "connection", None)
+        if connection is None:
+            connection = Offload._local.connection = Database.connect()
+            with Offload._lock:
+                # Fermée par le pool qui l'a ouverte, même si le pool a été remplacé depuis
+                Offload._connections.append((Database.get_pool(), connection))
+        return connection
+
+    @staticmethod
+    def _guarded(db, deadline, call):
+        # Interrompt la requête SQL en cours (OperationalError) une fois l'échéance passée
+        if deadline is None:
+            return call()
+        db.set_progress_handler(lambda: time.monotonic() >= deadline, PROGRESS_STEPS)
+        try:
+            return call()
+        finally:
+            db.set_progress_handler(None, 0)
+
+    @staticmethod
+    def _run(app, deadline, call):
+        with app.app_context():
+            g.deadline = deadline
+            g.db = db = Offload._connection()
+            try:
+                return Offload._guarded(db, deadline, call)
+            finally:
+                if db.in_transaction:
+                    db.rollback()
+                # La connexion reste au thread : elle n'est pas rendue au pool par teardown
+                g.pop("db", None)
+
+    @staticmethod
+    def _timed_out(calls):
+        with Offload._lock:
+            Offload._stats["timeouts"] += 1
+        logging.warning("Échéance dépassée pour %s appels (%s).", len(calls), request.path)
+        return TimeoutError("Échéance de la requête dépassée.")
+
+    @staticmethod
+    def _release(_):
+        with Offload._lock:
+            Offload._busy -= 1
+
+    @staticmethod
+    def gather(*calls):
+        """
+        Exécute les appels (sans argument) en parallèle et retourne leurs
+        résultats dans l'ordre : le premier dans le thread de la requête, les
+        suivants sur le pool. Lève TimeoutError si l'échéance de la requête
+        est dépassée, y compris quand elle interrompt une requête SQL. Sans pool, ou s'il n'a pas assez de threads libres (forte
+        charge), les appels sont faits l'un après l'autre : une requête n'attend
+        jamais qu'un thread se libère.
+        """
+        first, rest = calls[0], calls[1:]
+        with Offload._lock:
+            Offload._stats["calls"] += len(calls)
+            parallel = Offload._executor is not None and rest and Offload._busy + len(rest) <= Offload._workers
+            if parallel:
+                Offload._busy += len(rest)
+                Offload._stats["parallel"] += 1
+            elif Offload._executor is not None and rest:
+                Offload._stats["inline"] += 1
+        deadline = Offload.deadline()
+        db = Database.get_connection() if deadline is not None else None
+        if not parallel:
+            try:
+                return [Offload._guarded(db, deadline, call) for call in calls]
+            except sqlite3.OperationalError:
+                if not Offload.expired():
+                    raise
+                raise Offload._timed_out(calls) from None
+
+        app = current_app._get_current_object()
+        futures = []
+        for call in rest:
+            future = Offload._executor.submit(Offload._run, app, deadline, call)
+            # Appelé aussi pour un appel annulé avant d'avoir démarré
+            future.add_done_callback(Offload._release)
+            futures.append(future)
+        try:
+            results = [Offload._guarded(db, deadline, first)]
+            results += [future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+                        for future in futures]
+            return results
+        except (FutureTimeoutError, sqlite3.OperationalError) as error:
+            # Une requête SQL interrompue par le gestionnaire de progression est aussi une échéance dépassée
+            if isinstance(error, sqlite3.OperationalError) and not Offload.expired():
+                raise
+            for future in futures:
+                future.cancel()
+            raise Offload._timed_out(calls) from None
+
+    @staticmethod
+    def stats():
+        """
+        Appels exécutés, regroupements parallèles, regroupements exécutés en série
+        faute de threads libres, échéances dépassées ; None sans pool.
+        """
+        if Offload._executor is None:
+            return None
+        with Offload._lock:
+            return dict(Offload._stats, workers=Offload._workers, busy=Offload._busy)
+
+
+atexit.register(Offload.shutdown)
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from flask import current_app
+from app.cache import LRUCache, MISSING
+from app.http_cache import current_revision, is_uncacheable
+from app.models import Animals
+
+"""
+
+    Cache des pages de liste rendues, avec backends interchangeables :
+      - "memory" : LRU en mémoire, propre à chaque processus (par défaut) ;
+      - "file"   : fichiers dans un répertoire partagé par les workers d'une même machine ;
+      - "none"   : désactivé.
+
+    Chaque clé inclut la révision des données : une écriture validée (dans
+    n'importe quel worker) rend aussitôt toutes les pages en cache obsolètes.
+    Elle inclut aussi l'empreinte des templates et des fichiers statiques, pour
+    qu'un déploiement ne serve pas les anciennes pages. Les deux backends
+    appliquent PAGE_CACHE_TTL.
+    Le backend mémoire est en plus vidé explicitement après chaque écriture
+    du processus pour libérer la place.
+
+"""
+class MemoryBackend:
+    """Backend en mémoire fondé sur LRUCache."""
+    def __init__(self, max_size=256, ttl=300.0):
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get(self, key):
+        value = self._cache.get(key)
+        return None if value is MISSING else value
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class FileBackend:
+    """
+    Backend fichier : une page par fichier, écrite de façon atomique
+    (fichier temporaire puis os.replace). Au-delà de `max_size` fichiers,
+    les plus anciens sont supprimés.
+    """
+    def __init__(self, directory, max_size=256, ttl=300.0):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+        self._writes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".html")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            # Même durée de vie que le backend mémoire, mesurée sur la date d'écriture du fichier
+            if self.ttl and time.time() - os.stat(path).st_mtime > self.ttl:
+                self._stats["expirations"] += 1
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as page:
+                self._stats["hits"] += 1
+                return page.read()
+        except FileNotFoundError:
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key, value):
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as page:
+            page.write(value)
+        os.replace(temporary, self._path(key))
+        self._writes += 1
+        # L'élagage parcourt le répertoire : on ne le fait qu'une écriture sur 32
+        if self._writes % 32 == 0:
+            self._prune()
+
+    def _prune(self):
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".html")]
+        excess = len(entries) - self.max_size
+        if excess <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:excess]:
+            try:
+                os.remove(entry.path)
+                self._stats["evictions"] += 1
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".html"):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        return {"backend": "file", **self._stats, "max_size": self.max_size, "ttl": self.ttl, "directory": self.directory}
+
+
+class PageCache:
+    """
+    Point d'accès au cache des pages rendues (configuré par init_app).
+    """
+    backend = None
+
+    @staticmethod
+    def init_app(app):
+        kind = app.config.get("PAGE_CACHE_BACKEND", "memory")
+        size = app.config.get("PAGE_CACHE_SIZE", 256)
+        if kind == "memory":
+            PageCache.backend = MemoryBackend(max_size=size, ttl=app.config.get("PAGE_CACHE_TTL", 300.0))
+            # Les pages d'une révision dépassée ne seront plus lues : on libère la mémoire
+            Animals.add_write_listener(PageCache._on_write)
+        elif kind == "file":
+            directory = app.config.get("PAGE_CACHE_DIR") or os.path.join(app.instance_path, "page_cache")
+            PageCache.backend = FileBackend(directory, max_size=size, ttl=app.config.get("PAGE_CACHE_TTL", 300.0))
+        else:
+            PageCache.backend = None
+
+    @staticmethod
+    def _on_write(action, animal_id):
+        if PageCache.backend is not None:
+            PageCache.backend.clear()
+
+    @staticmethod
+    def _key(parts):
+        revision = current_revision()
+        if revision is None:
+            return None
+        # Templates et fichiers statiques du déploiement : une mise à jour change toutes les clés
+        deployment = (current_app.config.get("ETAG_SALT", ""), current_app.config.get("ASSETS_VERSION", ""))
+        return "|".join(str(part) for part in (*deployment, revision, *parts))
+
+    @staticmethod
+    def get(*parts):
+        """Retourne la page en cache pour ces paramètres, ou None."""
+        if PageCache.backend is None:
+            return None
+        key = PageCache._key(parts)
+        if key is None:
+            return None
+        try:
+            return PageCache.backend.get(key)
+        except OSError as e:
+            logging.warning("Lecture du cache de pages impossible : %s", e)
+            return None
+
+    @staticmethod
+    def set(value, *parts):
+        """Met en cache une page rendue pour ces paramètres (sauf page marquée non réutilisable)."""
+        if PageCache.backend is None or is_uncacheable():
+            return
+        key = PageCache._key(parts)
+        if key is None:
+            return
+        try:
+            PageCache.backend.set(key, value)
+        except OSError as e:
+            logging.warning("Écriture du cache de pages impossible : %s", e)
+
+    @staticmethod
+    def stats():
+        return PageCache.backend.stats() if PageCache.backend is not None else {"backend": "none"}
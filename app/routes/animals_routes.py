@@ -1,41 +1,32 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, Response, stream_template, stream_with_context, get_flashed_messages, session
 from app.services.animals_service import AnimalsService
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService
+from app.http_cache import conditional
+from app.page_cache import PageCache
+from app.validation import ANIMAL_SCHEMA
+from app.offload import Offload
+from app.autocomplete import Autocomplete, PrefixIndex
 import logging
-import traceback
+from functools import partial
 
 # Définir le blueprint pour les animaux
 animals_routes = Blueprint('animals_routes', __name__)
 
-def validate_form_data(data):
+def _buffered(fragments, size=8192):
     """
-    Valide les données du formulaire et retourne un dictionnaire d'erreurs.
+    Regroupe les petits fragments produits par Jinja en morceaux d'environ
+    `size` caractères avant de les envoyer au client.
     """
-    errors = {}
-
-    # Validation des champs obligatoires
-    if not data.get("nom"):
-        errors["nom"] = "Le nom est requis."
-    if not data.get("espece"):
-        errors["espece"] = "L'espèce est requise."
-    if not data.get("race"):
-        errors["race"] = "La race est requise."
-    if not data.get("age") or not isinstance(data["age"], int) or data["age"] < 0:
-        errors["age"] = "L'âge doit être un entier positif."
-    if not data.get("email"):
-        errors["email"] = "L'email est requis."
-    if not data.get("adresse"):
-        errors["adresse"] = "L'adresse est requise."
-    if not data.get("ville"):
-        errors["ville"] = "La ville est requise."
-    if not data.get("code_postal"):
-        errors["code_postal"] = "Le code postal est requis."
-
-    # Validation supplémentaire
-    if data.get("email") and "@" not in data["email"]:
-        errors["email"] = "Le format de l'email est invalide."
-
-    return errors
-
+    buffer, length = [], 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        length += len(fragment)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
 
 
 @animals_routes.route('/register', methods=['GET', 'POST'])
@@ -45,25 +36,16 @@ def register():
     """
     if request.method == 'POST':
         try:
-            form_data = {
-                "nom": request.form['nom'],
-                "espece": request.form['espece'],
-                "race": request.form['race'],
-                "age": int(request.form['age']) if request.form['age'].isdigit() else None,
-                "description": request.form['description'],
-                "email": request.form['email'],
-                "adresse": request.form['adresse'],
-                "ville": request.form['ville'],
-                "code_postal": request.form['code_postal'],
-            }
-
-            errors = validate_form_data(form_data)
-
-            # Appeler le service pour enregistrer l'animal
+            form_data = {field: request.form.get(field, '') for field in ANIMAL_SCHEMA.names}
+
+            # Le service valide (schéma partagé) puis enregistre l'animal
             result = AnimalsService.register_animal(**form_data)
 
+            errors = {}
             if result["status"] == "error":
-                if result["message"] == AnimalsService.ERROR_MESSAGES["email_exists"]:
+                if result.get("fields"):
+                    errors.update(result["fields"])
+                elif result["message"] == AnimalsService.ERROR_MESSAGES["email_exists"]:
                     errors["email"] = result["message"]
                 else:
                     errors["global"] = result["message"]
@@ -75,8 +57,7 @@ def register():
             return redirect(url_for('animals_routes.list'))
 
         except Exception as e:
-            logging.error("Une erreur s'est produite : %s", str(e))
-            logging.error(traceback.format_exc())
+            logging.exception("Une erreur s'est produite : %s", e)
 
             return render_template('register.html', form={}, errors={"global": "Une erreur inattendue s'est produite. Vérifiez les logs pour plus de détails."})
 
@@ -86,43 +67,138 @@ def register():
 
 
 @animals_routes.route('/list', methods=['GET'])
+@conditional
 def list():
     """
-    Route pour afficher une liste paginée des animaux avec recherche.
+    Route pour afficher une liste paginée des animaux avec recherche et
+    filtres structurés (`espece`, `race`, `ville`, `age_min`, `age_max`).
+    La pagination se fait par numéro de page (`page`) ou par curseur
+    (`after` / `before`), selon les paramètres reçus ou PAGINATION_MODE.
     """
     page = request.args.get('page', 1, type=int)
     per_page = 9
     query = request.args.get('query', '')
+    filters = AnimalsService.parse_filters(request.args)
+    after_id = request.args.get('after', type=int)
+    before_id = request.args.get('before', type=int)
+    cursor_mode = after_id is not None or before_id is not None or (
+        'page' not in request.args and current_app.config.get('PAGINATION_MODE') == 'cursor'
+    )
+
+    # Les pages affichant des messages flash ne sont ni lues ni écrites dans le cache
+    cacheable = not cursor_mode and not session.get('_flashes')
+    cache_key = ('list', query, page, per_page, *sorted(filters.items()))
+    if cacheable:
+        html = PageCache.get(*cache_key)
+        if html is not None:
+            return html
 
     try:
-        if query:
-            animals = AnimalsService.search_paginated(query, page, per_page)
-            total_animals = AnimalsService.count_search_results(query)
-        else:
-            animals = AnimalsService.get_paginated_animals(page, per_page)
-            total_animals = AnimalsService.count_animals()
+        # Facettes de la sélection courante (une seule agrégation) et page, calculées en parallèle
+        facets_call = partial(AnimalsService.get_facets, query=query or None, filters=filters)
+
+        if cursor_mode:
+            facets, result = Offload.gather(facets_call, partial(
+                AnimalsService.get_animals_by_cursor, per_page, after_id=after_id, before_id=before_id,
+                query=query or None, filters=filters))
+            if Offload.expired():
+                raise TimeoutError("Échéance de la requête dépassée.")
+            return render_template('list.html', animals=result["animals"], query=query, cursor_mode=True,
+                                   facets=facets, filters=filters,
+                                   next_cursor=result["next_cursor"], prev_cursor=result["prev_cursor"])
+
+        facets, result = Offload.gather(facets_call, partial(
+            AnimalsService.get_page, page, per_page, query=query or None, filters=filters))
+        # Résultats partiels (requête interrompue à l'échéance) : ni affichés ni mis en cache
+        if Offload.expired():
+            raise TimeoutError("Échéance de la requête dépassée.")
+        animals = result["animals"]
+        total_animals = result["total"]
 
         total_pages = (total_animals + per_page - 1) // per_page
-        return render_template('list.html', animals=animals, page=page, total_pages=total_pages, query=query)
+        html = render_template('list.html', animals=animals, page=page, total_pages=total_pages, query=query,
+                               facets=facets, filters=filters)
+        if cacheable:
+            PageCache.set(html, *cache_key)
+        return html
 
     except Exception:
         flash("Erreur lors de la récupération des données. Veuillez réessayer plus tard.", "error")
-        return render_template('list.html', animals=[], page=1, total_pages=0, query=query)
+        return render_template('list.html', animals=[], page=1, total_pages=0, query=query, facets=None, filters=filters)
+
+
+@animals_routes.route('/autocomplete', methods=['GET'])
+def autocomplete():
+    """
+    Suggestions pour la saisie de recherche (`q`), servies par l'index de
+    préfixes en mémoire, sans accès à la base. `field` limite à un champ
+    (nom, espece, race ou ville).
+    """
+    field = request.args.get('field') or None
+    if field is not None and field not in PrefixIndex.FIELDS:
+        return {"status": "error", "message": f"Champ inconnu : {field}."}, 400
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    suggestions = Autocomplete.suggest(request.args.get('q', ''), limit=limit, field=field)
+    return {"status": "success", "suggestions": suggestions}, 200
 
 
 @animals_routes.route('/admin', methods=['GET'])
+@conditional
 def admin_panel():
     """
     Affiche une page d'administration avec tous les animaux et leurs actions.
     """
     try:
+        # Les en-têtes (dont le cookie de session) partent avant le corps : les
+        # messages flash doivent donc être consommés avant le début du streaming.
+        get_flashed_messages(with_categories=True)
         animals = AnimalsService.display_all()
-        return render_template('admin.html', animals=animals)
+        return Response(_buffered(stream_template('admin.html', animals=animals)), mimetype='text/html')
     except Exception:
         flash("Erreur lors de la récupération des données. Veuillez réessayer plus tard.", "error")
         return render_template('admin.html', animals=[])
 
 
+@animals_routes.route('/import', methods=['POST'])
+def import_animals():
+    """
+    Importe en masse des animaux depuis un fichier CSV ou JSONL téléversé
+    (champ `fichier`). Retourne le rapport d'import en JSON.
+    """
+    upload = request.files.get('fichier')
+    if upload is None or not upload.filename:
+        return {"status": "error", "message": "Aucun fichier reçu."}, 400
+
+    file_format = request.form.get('format') or ImportService.detect_format(upload.filename)
+    batch_size = request.form.get('batch_size', current_app.config.get('IMPORT_BATCH_SIZE', 500), type=int)
+    report = ImportService.import_file(upload.stream, file_format, batch_size=batch_size)
+    if report["status"] == "error":
+        # Import interrompu : le rapport garde les lignes déjà insérées
+        return report, 500 if "inserted" in report else 400
+    return report, 200
+
+
+@animals_routes.route('/export', methods=['GET'])
+def export_animals():
+    """
+    Exporte les animaux en flux (CSV ou JSONL), avec projection de colonnes
+    (`columns=nom,espece`), filtre de recherche (`query`) et gzip optionnel (`gzip=1`).
+    """
+    file_format = request.args.get('format', 'csv')
+    columns = ExportService.parse_columns(request.args.get('columns'))
+    query = request.args.get('query') or None
+    compress = request.args.get('gzip', '0').lower() in ('1', 'true', 'oui')
+
+    try:
+        chunks = ExportService.stream(file_format, columns=columns, query=query, compress=compress)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    headers = {"Content-Disposition": f"attachment; filename={ExportService.filename(file_format, compress)}"}
+    mimetype = "application/gzip" if compress else ExportService.MIMETYPES[file_format]
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
 @animals_routes.route('/delete/<int:animal_id>', methods=['POST'])
 def delete_animal(animal_id):
     """
@@ -139,39 +215,28 @@ def delete_animal(animal_id):
 def update_animal(animal_id):
     """
     Met à jour les informations d'un animal.
+    En POST, l'animal n'est pas relu avant l'écriture : l'UPDATE indique
+    lui-même si l'animal existe et si l'email est déjà utilisé.
     """
-    result = AnimalsService.get_animal_by_id(animal_id)
-    if result["status"] == "error":
-        flash(result["message"], "error")
-        return redirect(url_for('animals_routes.admin_panel'))
-
-    animal = result["data"]
-
     if request.method == 'POST':
-        form_data = {
-            "nom": request.form['nom'],
-            "espece": request.form['espece'],
-            "race": request.form['race'],
-            "age": int(request.form['age']) if request.form['age'].isdigit() else None,
-            "description": request.form['description'],
-            "email": request.form['email'],
-            "adresse": request.form['adresse'],
-            "ville": request.form['ville'],
-            "code_postal": request.form['code_postal'],
-        }
-
-        # Valider les données
-        errors = validate_form_data(form_data)
-        if errors:
-            return render_template('update.html', animal=animal, errors=errors)
-
-        # Appeler le service pour mettre à jour l'animal
+        form_data = {field: request.form.get(field, '') for field in ANIMAL_SCHEMA.names}
+
+        # Le service valide (schéma partagé) puis met à jour l'animal
         result = AnimalsService.update_animal(animal_id, form_data)
         if result["status"] == "success":
             flash(result["message"], "success")
             return redirect(url_for('animals_routes.admin_panel'))
-        else:
+        if result["message"] == AnimalsService.ERROR_MESSAGES["not_found"]:
             flash(result["message"], "error")
-            return render_template('update.html', animal=animal)
+            return redirect(url_for('animals_routes.admin_panel'))
+        errors = result.get("fields") or {"global": result["message"]}
+
+        # Réafficher le formulaire avec les valeurs saisies
+        return render_template('update.html', animal=dict(request.form.items(), id=animal_id), errors=errors)
+
+    result = AnimalsService.get_animal_by_id(animal_id)
+    if result["status"] == "error":
+        flash(result["message"], "error")
+        return redirect(url_for('animals_routes.admin_panel'))
 
-    return render_template('update.html', animal=animal)
\ No newline at end of file
+    return render_template('update.html', animal=result["data"])
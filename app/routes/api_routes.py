@@ -0,0 +1,58 @@
+from flask import Blueprint, current_app, request
+from app.services.animals_service import AnimalsService
+from app.services.api_service import ApiService
+
+api_routes = Blueprint('api_routes', __name__)
+
+
+@api_routes.route('', methods=['GET'])
+def list_animals():
+    """
+    Liste JSON des animaux par curseur (`after` / `before`), avec taille de
+    page (`limit`), recherche (`query`), filtres structurés (`espece`, `race`,
+    `ville`, `age_min`, `age_max`) et sélection de champs (`fields=nom,espece`).
+    """
+    limit = max(1, min(request.args.get('limit', 50, type=int), current_app.config.get('API_MAX_LIMIT', 500)))
+    try:
+        fields = ApiService.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    result = ApiService.list_animals(
+        limit,
+        after_id=request.args.get('after', type=int),
+        before_id=request.args.get('before', type=int),
+        query=request.args.get('query') or None,
+        fields=fields,
+        filters=AnimalsService.parse_filters(request.args),
+    )
+    return result, 200 if result["status"] == "success" else 500
+
+
+@api_routes.route('/<int:animal_id>', methods=['GET'])
+def get_animal(animal_id):
+    """
+    Retourne un animal par son ID.
+    """
+    result = AnimalsService.get_animal_by_id(animal_id)
+    if result["status"] == "success":
+        return {"status": "success", "data": result["data"].to_dict()}, 200
+    status = 404 if result["message"] == AnimalsService.ERROR_MESSAGES["not_found"] else 500
+    return result, status
+
+
+@api_routes.route('/batch', methods=['POST'])
+def batch():
+    """
+    Crée, modifie et supprime plusieurs animaux en une seule requête et une
+    seule transaction : {"create": [{...}], "update": [{"id": 1, ...}], "delete": [2, 3]}.
+    """
+    payload = request.get_json(silent=True)
+    result = ApiService.apply_batch(payload, max_operations=current_app.config.get('API_BATCH_MAX', 1000))
+    if result["status"] == "success":
+        return result, 200
+    if result.pop("conflict", False):
+        return result, 409
+    if result["message"] == AnimalsService.ERROR_MESSAGES["internal_error"]:
+        return result, 500
+    return result, 400
@@ -1,14 +1,13 @@
-import re
 import logging
+import sqlite3
 from app.models import Animals
+from app.validation import ANIMAL_SCHEMA, EMAIL_PATTERN
 
 class AnimalsService:
     """
     Service pour gérer les opérations métier liées aux animaux.
     
     """
-    EMAIL_REGEX = r"[^@]+@[^@]+\.[^@]+"
-
     ERROR_MESSAGES = {
         "missing_fields": "Champs manquants : {fields}.",
         "invalid_email": "L'email fourni n'est pas valide.",
@@ -19,27 +18,36 @@ class AnimalsService:
 
     @staticmethod
     def is_valid_email(email):
-        return re.match(AnimalsService.EMAIL_REGEX, email) is not None
+        return EMAIL_PATTERN.match(email) is not None
 
     @staticmethod
-    def validate_required_fields(fields):
-        missing_fields = [field for field, value in fields.items() if not value]
-        errors = {}
-
-        if missing_fields:
-            errors["missing_fields"] = f"Champs manquants : {', '.join(missing_fields)}."
-
-        if "email" in fields and fields["email"] and not AnimalsService.is_valid_email(fields["email"]):
-            errors["invalid_email"] = "Le format de l'email est invalide."
-
+    def validate(data, partial=False):
+        """
+        Valide et normalise un animal avec le schéma partagé (ANIMAL_SCHEMA).
+        Retourne {"status": "success", "data": ...} ou
+        {"status": "error", "message": ..., "fields": {champ: message}}.
+        """
+        cleaned, errors = ANIMAL_SCHEMA.validate(data, partial=partial)
         if errors:
-            return {
-                "status": "error",
-                "message": "; ".join(errors.values()),
-                "fields": errors,
-            }
+            return {"status": "error", "message": " ".join(errors.values()), "fields": errors}
+        return {"status": "success", "data": cleaned}
 
-        return {"status": "success"}
+    @staticmethod
+    def constraint_error(error):
+        """
+        Traduit une violation de contrainte SQLite (sqlite3.IntegrityError)
+        en résultat d'erreur utilisant ERROR_MESSAGES.
+        """
+        message = str(error)
+        if message.startswith("UNIQUE constraint failed") and "animals.email" in message:
+            return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["email_exists"],
+                    "fields": {"email": AnimalsService.ERROR_MESSAGES["email_exists"]}}
+        if message.startswith("NOT NULL constraint failed"):
+            field = message.rsplit(".", 1)[-1]
+            text = AnimalsService.ERROR_MESSAGES["missing_fields"].format(fields=field)
+            return {"status": "error", "message": text, "fields": {"missing_fields": text}}
+        logging.error("Violation de contrainte non prévue : %s", message)
+        return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
 
     @staticmethod
     def register_animal(nom, espece, race, age, description, email, adresse, ville, code_postal):
@@ -55,19 +63,22 @@ class AnimalsService:
                 "ville": ville,
                 "code_postal": code_postal,
             }
-            validation_result = AnimalsService.validate_required_fields(data)
+            validation_result = AnimalsService.validate(data)
             if validation_result["status"] == "error":
                 return validation_result
+            data = validation_result["data"]
 
-            if Animals.find_by_email(email):
-                logging.warning(f"Tentative d'enregistrement avec un email existant : {email}")
+            # Insertion unique : la contrainte UNIQUE sur l'email remplace la lecture préalable
+            if Animals.create(**data) is None:
+                logging.warning("Tentative d'enregistrement avec un email existant : %s", email)
                 return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["email_exists"]}
 
-            Animals.create(**data)
-            logging.info(f"Animal enregistré avec succès : {data}")
+            logging.info("Animal enregistré avec succès : %s", data)
             return {"status": "success", "message": "Animal enregistré avec succès."}
+        except sqlite3.IntegrityError as e:
+            return AnimalsService.constraint_error(e)
         except Exception as e:
-            logging.exception(f"Erreur lors de l'enregistrement de l'animal : {str(e)}")
+            logging.exception("Erreur lors de l'enregistrement de l'animal : %s", e)
             return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
 
 
@@ -82,7 +93,7 @@ class AnimalsService:
                 return {"status": "success", "data": animal}
             return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["not_found"]}
         except Exception:
-            logging.error(f"Erreur lors de la récupération de l'animal ID {animal_id}")
+            logging.exception("Erreur lors de la récupération de l'animal ID %s", animal_id)
             return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
 
 
@@ -91,22 +102,22 @@ class AnimalsService:
     def update_animal(animal_id, form_data):
         """Met à jour les informations d'un animal."""
         try:
-            # Valider les champs requis
-            validation_result = AnimalsService.validate_required_fields(form_data)
+            # Valider et normaliser les champs
+            validation_result = AnimalsService.validate(form_data)
             if validation_result["status"] == "error":
                 return validation_result
+            form_data = validation_result["data"]
 
-            # Vérifier si l'email existe déjà dans la base de données
-            existing_animal = Animals.find_by_email(form_data["email"])
-            if existing_animal and existing_animal["id"] != animal_id:
-                logging.warning(f"Email déjà utilisé par un autre animal : {form_data['email']}")
-                return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["email_exists"]}
-
-            # Mettre à jour les informations
-            Animals.update(animal_id=animal_id, **form_data)
+            # Mise à jour unique : existence (RETURNING) et unicité de l'email (UNIQUE)
+            # sont vérifiées par la même instruction
+            if not Animals.update(animal_id=animal_id, **form_data):
+                return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["not_found"]}
             return {"status": "success", "message": "Animal mis à jour avec succès."}
+        except sqlite3.IntegrityError as e:
+            logging.warning("Mise à jour refusée pour l'animal ID %s : %s", animal_id, e)
+            return AnimalsService.constraint_error(e)
         except Exception as e:
-            logging.error(f"Erreur lors de la mise à jour de l'animal ID {animal_id}: {str(e)}")
+            logging.error("Erreur lors de la mise à jour de l'animal ID %s: %s", animal_id, e)
             return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
 
 
@@ -121,7 +132,7 @@ class AnimalsService:
             Animals.delete_by_id(animal_id)
             return {"status": "success", "message": "Animal supprimé avec succès."}
         except Exception:
-            logging.error(f"Erreur lors de la suppression de l'animal ID {animal_id}")
+            logging.exception("Erreur lors de la suppression de l'animal ID %s", animal_id)
             return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
 
 
@@ -133,11 +144,34 @@ class AnimalsService:
             animals = Animals.get_paginated_animals(page, per_page)
             return animals
         except Exception:
-            logging.error("Erreur lors de la récupération des animaux paginés.")
+            logging.exception("Erreur lors de la récupération des animaux paginés.")
             return []
 
 
 
+    @staticmethod
+    def get_animals_by_cursor(per_page, after_id=None, before_id=None, query=None, filters=None):
+        """Récupère une page d'animaux par curseur (après/avant un identifiant)."""
+        try:
+            return Animals.get_animals_by_cursor(per_page, after_id=after_id, before_id=before_id, query=query, filters=filters)
+        except Exception:
+            logging.exception("Erreur lors de la pagination par curseur.")
+            return {"animals": [], "next_cursor": None, "prev_cursor": None}
+
+
+
+    @staticmethod
+    def get_page(page, per_page, query=None, filters=None):
+        """Récupère une page d'animaux (recherche et filtres optionnels) et le total en une seule requête."""
+        try:
+            animals, total = Animals.get_page_with_total(page, per_page, query=query, filters=filters)
+            return {"animals": animals, "total": total}
+        except Exception:
+            logging.exception("Erreur lors de la récupération de la page d'animaux.")
+            return {"animals": [], "total": 0}
+
+
+
     @staticmethod
     def search_paginated(query, page, per_page):
         """Recherche paginée des animaux par mot-clé."""
@@ -145,7 +179,7 @@ class AnimalsService:
             animals = Animals.search_paginated(query, page, per_page)
             return animals
         except Exception:
-            logging.error("Erreur lors de la recherche paginée.")
+            logging.exception("Erreur lors de la recherche paginée.")
             return []
 
 
@@ -156,27 +190,65 @@ class AnimalsService:
         try:
             return Animals.count_animals()
         except Exception:
-            logging.error("Erreur lors du comptage des animaux.")
+            logging.exception("Erreur lors du comptage des animaux.")
             return 0
 
 
 
+    @staticmethod
+    def parse_filters(args):
+        """Extrait les filtres structurés (espece, race, ville, age_min, age_max) des paramètres reçus."""
+        return Animals.normalize_filters(args)
+
+
+
+    @staticmethod
+    def get_facets(query=None, filters=None):
+        """Retourne les facettes (espèce, race, ville, tranche d'âge) de la sélection courante."""
+        try:
+            return Animals.get_facets(query=query, filters=filters)
+        except Exception:
+            logging.exception("Erreur lors du calcul des facettes.")
+            return {"espece": [], "race": [], "ville": [], "age": []}
+
+
+
+    @staticmethod
+    def count_by_espece():
+        """Retourne le nombre d'animaux par espèce (compteurs matérialisés)."""
+        try:
+            return Animals.get_statistics("espece")
+        except Exception:
+            logging.exception("Erreur lors du comptage par espèce.")
+            return []
+
+
+
+    @staticmethod
+    def count_by_ville():
+        """Retourne le nombre d'animaux par ville (compteurs matérialisés)."""
+        try:
+            return Animals.get_statistics("ville")
+        except Exception:
+            logging.exception("Erreur lors du comptage par ville.")
+            return []
+
+
+
     @staticmethod
     def count_search_results(query):
         """Compte le nombre total de résultats pour une recherche donnée."""
         try:
             return Animals.count_search_results(query)
         except Exception:
-            logging.error("Erreur lors du comptage des résultats de recherche.")
+            logging.exception("Erreur lors du comptage des résultats de recherche.")
             return 0
     
     
     @staticmethod
     def display_all():
-        """Affiche tous les animaux."""
+        """Parcourt tous les animaux par lots (générateur)."""
         try:
-            animals = Animals.display_all()
-            return animals
+            yield from Animals.display_all()
         except Exception:
-            logging.error("Erreur lors de l'affichage de tous les animaux.")
-            return []
\ No newline at end of file
+            logging.exception("Erreur lors de l'affichage de tous les animaux.")
\ No newline at end of file
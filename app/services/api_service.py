@@ -0,0 +1,132 @@
+import logging
+from app.models import Animals
+from app.services.animals_service import AnimalsService
+from app.validation import ANIMAL_SCHEMA
+
+class ApiService:
+    """
+    Service de l'API JSON : listes par curseur avec sélection de champs,
+    lecture unitaire et écritures par lots (création, modification,
+    suppression) appliquées en une seule transaction.
+    """
+    ERROR_MESSAGES = {
+        "unknown_fields": "Champs inconnus : {fields}.",
+        "invalid_payload": "Le corps de la requête doit être un objet JSON avec les clés create, update et/ou delete.",
+        "invalid_id": "Identifiant invalide : {value}.",
+        "empty_update": "Aucun champ à modifier.",
+        "batch_too_large": "Le lot contient {count} opérations (maximum : {limit}).",
+    }
+
+    @staticmethod
+    def parse_fields(value):
+        """
+        Convertit 'nom,espece' en tuple de colonnes ; `id` est toujours inclus
+        (il sert de curseur). Lève ValueError si une colonne est inconnue.
+        Les colonnes sont dédoublonnées et remises dans l'ordre de Animals.COLUMNS :
+        chaque projection crée un type d'enregistrement mémorisé (AnimalRecord),
+        leur nombre reste ainsi borné quel que soit l'ordre demandé par le client.
+        """
+        if not value:
+            return Animals.COLUMNS
+        fields = {field.strip() for field in value.split(",") if field.strip()}
+        unknown = sorted(fields - set(Animals.COLUMNS))
+        if unknown:
+            raise ValueError(ApiService.ERROR_MESSAGES["unknown_fields"].format(fields=", ".join(unknown)))
+        return tuple(column for column in Animals.COLUMNS if column == "id" or column in fields)
+
+    @staticmethod
+    def list_animals(limit, after_id=None, before_id=None, query=None, fields=Animals.COLUMNS, filters=None):
+        """Page d'animaux par curseur, sous forme de dictionnaires sérialisables."""
+        try:
+            result = Animals.get_animals_by_cursor(limit, after_id=after_id, before_id=before_id, query=query,
+                                                   view=fields, filters=filters)
+            return {
+                "status": "success",
+                "data": [animal.to_dict() for animal in result["animals"]],
+                "next_cursor": result["next_cursor"],
+                "prev_cursor": result["prev_cursor"],
+            }
+        except Exception:
+            logging.exception("Erreur lors de la liste des animaux (API).")
+            return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
+
+    @staticmethod
+    def _is_id(value):
+        return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+    @staticmethod
+    def _check_update(item):
+        """Contrôles d'une modification partielle hors schéma : ID, champs inconnus, au moins un champ."""
+        if not isinstance(item, dict) or not ApiService._is_id(item.get("id")):
+            value = item.get("id") if isinstance(item, dict) else item
+            return ApiService.ERROR_MESSAGES["invalid_id"].format(value=value)
+        unknown = [key for key in ANIMAL_SCHEMA.unknown_fields(item) if key != "id"]
+        if unknown:
+            return ApiService.ERROR_MESSAGES["unknown_fields"].format(fields=", ".join(unknown))
+        if len(item) == 1:
+            return ApiService.ERROR_MESSAGES["empty_update"]
+        return None
+
+    @staticmethod
+    def apply_batch(payload, max_operations=1000):
+        """
+        Valide puis applique un lot {"create": [...], "update": [...], "delete": [...]}
+        en une seule transaction. Rien n'est écrit si une opération est invalide
+        ou viole une contrainte (ex. email déjà utilisé).
+        """
+        if not isinstance(payload, dict) or not set(payload) <= {"create", "update", "delete"} or \
+                not all(isinstance(payload.get(key, []), list) for key in ("create", "update", "delete")):
+            return {"status": "error", "message": ApiService.ERROR_MESSAGES["invalid_payload"]}
+
+        creates_in, updates_in, deletes_in = (payload.get(key, []) for key in ("create", "update", "delete"))
+        count = len(creates_in) + len(updates_in) + len(deletes_in)
+        if count > max_operations:
+            return {"status": "error", "message": ApiService.ERROR_MESSAGES["batch_too_large"].format(count=count, limit=max_operations)}
+
+        # Tout le lot est validé en une passe par le schéma compilé
+        errors, creates, updates = [], [], []
+        for position, (data, field_errors) in enumerate(ANIMAL_SCHEMA.validate_many(creates_in)):
+            if field_errors:
+                errors.append({"operation": "create", "position": position, "message": " ".join(field_errors.values())})
+            else:
+                creates.append(data)
+        checks = [ApiService._check_update(item) for item in updates_in]
+        candidates = [item if message is None else {} for item, message in zip(updates_in, checks)]
+        for position, (message, (data, field_errors)) in enumerate(
+                zip(checks, ANIMAL_SCHEMA.validate_many(candidates, partial=True))):
+            message = message or " ".join(field_errors.values())
+            if message:
+                errors.append({"operation": "update", "position": position, "message": message})
+            else:
+                data["id"] = updates_in[position]["id"]
+                updates.append(data)
+        for position, value in enumerate(deletes_in):
+            if not ApiService._is_id(value):
+                errors.append({"operation": "delete", "position": position,
+                               "message": ApiService.ERROR_MESSAGES["invalid_id"].format(value=value)})
+        if errors:
+            return {"status": "error", "message": "; ".join(error["message"] for error in errors), "errors": errors}
+
+        try:
+            result = Animals.apply_batch(creates, updates, deletes_in)
+        except Exception:
+            logging.exception("Erreur lors de l'application d'un lot.")
+            return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
+
+        failure = result["failure"]
+        if failure:
+            error = AnimalsService.constraint_error(failure["error"])
+            return {"status": "error", "message": error["message"], "conflict": True,
+                    "errors": [{"operation": failure["operation"], "position": failure["position"], "message": error["message"]}]}
+
+        updated, deleted = set(result["updated"]), set(result["deleted"])
+        return {
+            "status": "success",
+            "created": result["created"],
+            "updated": result["updated"],
+            "deleted": result["deleted"],
+            "not_found": {
+                "update": [item["id"] for item in updates if item["id"] not in updated],
+                "delete": [animal_id for animal_id in deletes_in if animal_id not in deleted],
+            },
+        }
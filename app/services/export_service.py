@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import zlib
+import logging
+from app.models import Animals
+
+class ExportService:
+    """
+    Service d'export en flux de la table animals (CSV ou JSONL).
+
+    Les lignes sont lues par lots depuis le curseur SQLite et écrites au fur
+    et à mesure, éventuellement compressées en gzip à la volée : la mémoire
+    utilisée reste constante quelle que soit la taille de la table.
+    """
+    FORMATS = ("csv", "jsonl")
+
+    MIMETYPES = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+    }
+
+    # Taille approximative (en caractères) des morceaux envoyés au client
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def parse_columns(value):
+        """Convertit 'nom,espece' en tuple de colonnes (None = toutes)."""
+        if not value:
+            return None
+        return tuple(column.strip() for column in value.split(",") if column.strip())
+
+    @staticmethod
+    def filename(file_format, compress=False):
+        return f"animals.{file_format}" + (".gz" if compress else "")
+
+    @staticmethod
+    def _csv_chunks(columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= ExportService.CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _jsonl_chunks(columns, rows):
+        lines, size = [], 0
+        for row in rows:
+            line = json.dumps(dict(zip(columns, row)), ensure_ascii=False)
+            lines.append(line)
+            size += len(line) + 1
+            if size >= ExportService.CHUNK_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines, size = [], 0
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _gzip(chunks):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 : en-tête gzip
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def stream(file_format="csv", columns=None, query=None, compress=False):
+        """
+        Générateur d'octets de l'export demandé.
+        Lève ValueError si le format ou une colonne est inconnu(e).
+        """
+        if file_format not in ExportService.FORMATS:
+            raise ValueError(f"Format inconnu : {file_format}. Formats acceptés : csv, jsonl.")
+        columns = tuple(columns or Animals.COLUMNS)
+        rows = Animals.iter_rows(columns, query=query)
+        # Démarre le générateur pour valider les colonnes avant d'envoyer la réponse
+        first = next(rows, None)
+        if first is not None:
+            rows = ExportService._prepend(first, rows)
+
+        if file_format == "csv":
+            chunks = ExportService._csv_chunks(columns, rows)
+        else:
+            chunks = ExportService._jsonl_chunks(columns, rows)
+        encoded = (chunk.encode("utf-8") for chunk in chunks if chunk)
+        return ExportService._gzip(encoded) if compress else encoded
+
+    @staticmethod
+    def _prepend(first, rows):
+        yield first
+        yield from rows
+
+    @staticmethod
+    def export_to(output, file_format="csv", columns=None, query=None, compress=False):
+        """Écrit l'export dans un fichier binaire ouvert ; retourne le nombre d'octets écrits."""
+        written = 0
+        for data in ExportService.stream(file_format, columns=columns, query=query, compress=compress):
+            output.write(data)
+            written += len(data)
+        logging.info("Export %s terminé : %s octets écrits.", file_format, written)
+        return written
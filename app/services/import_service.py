@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import time
+import logging
+from app.models import Animals
+from app.services.animals_service import AnimalsService
+
+class _Lines:
+    """
+    Itère sur les lignes d'un fichier en comptant les lignes physiques. Un flux
+    binaire est décodé ligne par ligne : une ligne qui n'est pas en UTF-8 est
+    ignorée et notée dans `errors` (numéro, message) au lieu d'interrompre l'import.
+    """
+    def __init__(self, stream, message):
+        self.stream = stream
+        self.message = message
+        self.binary = not isinstance(stream, io.TextIOBase)
+        self.line_number = 0
+        self.errors = []
+
+    def __iter__(self):
+        for line in self.stream:
+            self.line_number += 1
+            if self.binary:
+                try:
+                    line = line.decode("utf-8-sig" if self.line_number == 1 else "utf-8")
+                except UnicodeDecodeError:
+                    self.errors.append((self.line_number, self.message))
+                    continue
+            yield line
+
+    def drain(self):
+        """Erreurs notées depuis le dernier appel."""
+        errors, self.errors = self.errors, []
+        return errors
+
+
+class ImportService:
+    """
+    Service d'import en masse d'animaux à partir de fichiers CSV ou JSONL.
+
+    Les fichiers sont lus en flux (ligne par ligne), chaque enregistrement est
+    validé avec le schéma partagé (app.validation.ANIMAL_SCHEMA),
+    puis les lignes valides sont insérées par lots (executemany), une
+    transaction par lot.
+    """
+    FORMATS = ("csv", "jsonl")
+
+    ERROR_MESSAGES = {
+        "invalid_json": "Ligne JSON invalide : {error}.",
+        "invalid_csv": "Ligne CSV invalide : {error}.",
+        "invalid_encoding": "Ligne illisible : le fichier doit être encodé en UTF-8.",
+        "duplicate_in_file": "Email en double dans le fichier.",
+        "unknown_format": "Format inconnu : {format}. Formats acceptés : csv, jsonl.",
+    }
+
+    @staticmethod
+    def detect_format(filename, default="csv"):
+        """Déduit le format à partir de l'extension du fichier."""
+        name = (filename or "").lower()
+        if name.endswith((".jsonl", ".ndjson")):
+            return "jsonl"
+        if name.endswith(".csv"):
+            return "csv"
+        return default
+
+    @staticmethod
+    def parse_csv(stream):
+        """
+        Génère (numéro de ligne, enregistrement) pour chaque ligne d'un CSV avec en-tête.
+        Une ligne illisible (encodage, format) produit un message d'erreur à sa place.
+        """
+        lines = _Lines(stream, ImportService.ERROR_MESSAGES["invalid_encoding"])
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                record = ImportService.ERROR_MESSAGES["invalid_csv"].format(error=e)
+            yield from lines.drain()
+            yield lines.line_number, record
+        yield from lines.drain()
+
+    @staticmethod
+    def parse_jsonl(stream):
+        """Génère (numéro de ligne, enregistrement) pour chaque ligne d'un fichier JSONL."""
+        lines = _Lines(stream, ImportService.ERROR_MESSAGES["invalid_encoding"])
+        for line in lines:
+            yield from lines.drain()
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield lines.line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield lines.line_number, ImportService.ERROR_MESSAGES["invalid_json"].format(error=e.msg)
+        yield from lines.drain()
+
+    @staticmethod
+    def parse(stream, file_format):
+        """
+        Retourne le générateur d'enregistrements adapté au format demandé.
+        Un flux binaire (ex. fichier téléversé) est décodé en UTF-8 ligne par ligne.
+        """
+        if file_format == "csv":
+            return ImportService.parse_csv(stream)
+        if file_format == "jsonl":
+            return ImportService.parse_jsonl(stream)
+        raise ValueError(ImportService.ERROR_MESSAGES["unknown_format"].format(format=file_format))
+
+    @staticmethod
+    def prepare_record(record):
+        """
+        Normalise et valide un enregistrement brut.
+        Retourne (données, None) si valide, sinon (None, erreur).
+        """
+        if not isinstance(record, dict):
+            return None, {"status": "error", "message": str(record)}
+
+        validation_result = AnimalsService.validate(record)
+        if validation_result["status"] == "error":
+            return None, validation_result
+        return validation_result["data"], None
+
+    @staticmethod
+    def import_records(records, batch_size=500):
+        """
+        Importe un flux d'enregistrements (numéro de ligne, enregistrement).
+        Retourne un rapport : lignes lues, insérées, rejetées, erreurs par ligne
+        et débit (lignes par seconde). Si l'import s'interrompt, le rapport
+        (statut "error") garde les lots déjà validés.
+        """
+        started = time.perf_counter()
+        report = {"total": 0, "inserted": 0, "rejected": 0, "batches": 0, "errors": []}
+        batch = {}  # email -> (ligne, données) : doublons détectés dans le lot, les autres par la base
+
+        def reject(line, message, fields=None):
+            report["rejected"] += 1
+            error = {"line": line, "message": message}
+            if fields:
+                error["fields"] = fields
+            report["errors"].append(error)
+
+        def flush():
+            existing = Animals.find_existing_emails(batch)
+            pending = []
+            for line, data in batch.values():
+                if data["email"] in existing:
+                    reject(line, AnimalsService.ERROR_MESSAGES["email_exists"])
+                else:
+                    pending.append((line, data))
+            if pending:
+                failures = dict(Animals.create_many([data for _, data in pending]))
+                for position, (line, _) in enumerate(pending):
+                    if position in failures:
+                        reject(line, AnimalsService.ERROR_MESSAGES["email_exists"])
+                    else:
+                        report["inserted"] += 1
+            report["batches"] += 1
+            batch.clear()
+
+        status = None
+        try:
+            for line, record in records:
+                report["total"] += 1
+                data, error = ImportService.prepare_record(record)
+                if error:
+                    reject(line, error["message"], error.get("fields"))
+                    continue
+                if data["email"] in batch:
+                    reject(line, ImportService.ERROR_MESSAGES["duplicate_in_file"])
+                    continue
+                batch[data["email"]] = (line, data)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        except Exception as e:
+            logging.exception("Import interrompu après %s lignes insérées : %s", report["inserted"], e)
+            status = "error"
+            report["message"] = AnimalsService.ERROR_MESSAGES["internal_error"]
+        report["errors"].sort(key=lambda error: error["line"])
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["total"] / elapsed, 1) if elapsed > 0 else None
+        report["status"] = status or ("success" if not report["rejected"] else "partial")
+        logging.info(
+            "Import terminé : %s insérés, %s rejetés en %s s (%s lignes/s).",
+            report["inserted"], report["rejected"], report["elapsed_seconds"], report["rows_per_second"]
+        )
+        return report
+
+    @staticmethod
+    def import_file(stream, file_format, batch_size=500):
+        """Analyse puis importe un fichier ouvert (texte ou binaire)."""
+        try:
+            records = ImportService.parse(stream, file_format)
+            return ImportService.import_records(records, batch_size=batch_size)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        except Exception as e:
+            logging.exception("Erreur lors de l'import : %s", e)
+            return {"status": "error", "message": AnimalsService.ERROR_MESSAGES["internal_error"]}
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from jinja2 import FileSystemBytecodeCache
+
+"""
+
+    Démarrage rapide : rapport de durée des étapes de create_app et cache de
+    bytecode Jinja persistant.
+
+    Les templates compilés sont écrits sur disque (JINJA_CACHE_DIR) et relus
+    par tous les workers ; `flask animals templates` les compile à l'avance,
+    au déploiement, pour qu'aucun worker ne compile un template à sa première
+    requête.
+
+    Référence : https://jinja.palletsprojects.com/en/stable/api/#bytecode-cache
+
+"""
+
+
+class StartupReport:
+    """
+    Durées des étapes du démarrage, exposées dans app.extensions["startup"],
+    sur /metrics et par `flask animals startup`.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.steps = []
+        self.total_seconds = None
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started))
+
+    def finish(self, app):
+        self.total_seconds = time.perf_counter() - self.started
+        app.extensions["startup"] = self
+        slowest = sorted(self.steps, key=lambda item: item[1], reverse=True)[:3]
+        logging.info("Application prête en %.3f s (pid %s) ; étapes les plus longues : %s", self.total_seconds,
+                     os.getpid(), ", ".join(f"{name} {seconds:.3f} s" for name, seconds in slowest))
+
+    def to_dict(self):
+        return {
+            "pid": os.getpid(),
+            "total_seconds": round(self.total_seconds or 0.0, 6),
+            "steps": [{"name": name, "seconds": round(seconds, 6)} for name, seconds in self.steps],
+        }
+
+
+def init_jinja_cache(app):
+    """
+    Active le cache de bytecode des templates sur disque (JINJA_BYTECODE_CACHE,
+    JINJA_CACHE_DIR, par défaut instance/jinja_cache).
+    """
+    if not app.config.get("JINJA_BYTECODE_CACHE", True):
+        return None
+    directory = app.config.get("JINJA_CACHE_DIR") or os.path.join(app.instance_path, "jinja_cache")
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    return directory
+
+
+def precompile_templates(app):
+    """Compile tous les templates (et remplit le cache de bytecode) ; retourne leurs noms."""
+    names = sorted(app.jinja_env.list_templates())
+    for name in names:
+        app.jinja_env.get_template(name)
+    return names
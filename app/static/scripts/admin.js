@@ -1,5 +1,13 @@
 document.addEventListener("DOMContentLoaded", () => {
-    let selectedAnimalId = null;
+    // IDs à supprimer après confirmation (un seul animal ou la sélection)
+    let pendingDeletion = [];
+
+    const popup = document.getElementById("confirmation-popup");
+    if (!popup) return;
+
+    const selectAll = document.getElementById("select-all");
+    const deleteSelected = document.getElementById("delete-selected");
+    const updateSelected = document.getElementById("update-selected");
 
     // Fonction pour afficher ou cacher le menu d'actions
     window.toggleActions = (buttonElement) => {
@@ -10,44 +18,105 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     };
 
-    // Fonction pour afficher le pop-up de confirmation de suppression
-    window.confirmDeletion = (buttonElement) => {
-        selectedAnimalId = buttonElement.getAttribute("data-id");
-        const popup = document.getElementById("confirmation-popup");
+    // IDs des lignes cochées
+    const selectedIds = () =>
+        Array.from(document.querySelectorAll(".select-animal:checked")).map((box) => Number(box.value));
+
+    // Met à jour le compteur et l'état des boutons d'actions groupées
+    const refreshSelection = () => {
+        const count = selectedIds().length;
+        document.getElementById("selection-count").textContent = `${count} sélectionné(s)`;
+        deleteSelected.disabled = count === 0;
+        updateSelected.disabled = count === 0;
+    };
+
+    // Envoie un lot d'opérations à l'API (une requête, une transaction)
+    const sendBatch = (payload) =>
+        fetch("/api/animals/batch", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+            },
+            body: JSON.stringify(payload),
+        }).then((response) => response.json());
+
+    const showConfirmation = (ids, message) => {
+        pendingDeletion = ids;
+        document.getElementById("confirmation-message").textContent = message;
         popup.style.display = "block";
     };
 
-    // Fonction pour fermer le pop-up sans supprimer
-    document.getElementById("cancel-delete").addEventListener("click", () => {
-        const popup = document.getElementById("confirmation-popup");
+    const closeConfirmation = () => {
         popup.style.display = "none";
-        selectedAnimalId = null;
+        pendingDeletion = [];
+    };
+
+    // Fonction pour afficher le pop-up de confirmation de suppression
+    window.confirmDeletion = (buttonElement) => {
+        showConfirmation([Number(buttonElement.getAttribute("data-id"))], "Êtes-vous sûr de vouloir supprimer cet animal ?");
+    };
+
+    selectAll.addEventListener("change", () => {
+        document.querySelectorAll(".select-animal").forEach((box) => {
+            box.checked = selectAll.checked;
+        });
+        refreshSelection();
+    });
+
+    document.querySelector("table").addEventListener("change", (event) => {
+        if (event.target.classList.contains("select-animal")) refreshSelection();
     });
 
+    deleteSelected.addEventListener("click", () => {
+        const ids = selectedIds();
+        if (ids.length) showConfirmation(ids, `Êtes-vous sûr de vouloir supprimer ${ids.length} animal(aux) ?`);
+    });
+
+    // Fonction pour fermer le pop-up sans supprimer
+    document.getElementById("cancel-delete").addEventListener("click", closeConfirmation);
+
     // Fonction pour confirmer la suppression
     document.getElementById("confirm-delete").addEventListener("click", () => {
-        if (selectedAnimalId) {
-            fetch(`/animals/delete/${selectedAnimalId}`, {
-                method: "POST",
-                headers: {
-                    "Content-Type": "application/json",
-                },
+        if (!pendingDeletion.length) return;
+        sendBatch({ delete: pendingDeletion })
+            .then((data) => {
+                if (data.status === "success") {
+                    const removed = data.deleted.concat(data.not_found.delete);
+                    removed.forEach((id) => {
+                        const row = document.querySelector(`button[data-id="${id}"]`);
+                        if (row) row.closest("tr").remove();
+                    });
+                    closeConfirmation();
+                    refreshSelection();
+                } else {
+                    alert("Erreur : " + data.message);
+                }
             })
-                .then((response) => response.json())
-                .then((data) => {
-                    if (data.status === "success") {
-                        const row = document.querySelector(`button[data-id="${selectedAnimalId}"]`).closest("tr");
-                        if (row) row.remove();
-                        document.getElementById("confirmation-popup").style.display = "none";
-                        selectedAnimalId = null;
-                    } else {
-                        alert("Erreur : " + data.message);
-                    }
-                })
-                .catch((error) => {
-                    alert("Erreur réseau : impossible de supprimer l'animal.");
-                    console.error("Erreur :", error);
-                });
-        }
+            .catch((error) => {
+                alert("Erreur réseau : impossible de supprimer la sélection.");
+                console.error("Erreur :", error);
+            });
+    });
+
+    // Modification groupée : même valeur d'un champ pour toute la sélection
+    updateSelected.addEventListener("click", () => {
+        const ids = selectedIds();
+        const field = document.getElementById("batch-field").value;
+        let value = document.getElementById("batch-value").value.trim();
+        if (!ids.length || !value) return;
+        if (field === "age") value = Number(value);
+
+        sendBatch({ update: ids.map((id) => ({ id, [field]: value })) })
+            .then((data) => {
+                if (data.status === "success") {
+                    window.location.reload();
+                } else {
+                    alert("Erreur : " + data.message);
+                }
+            })
+            .catch((error) => {
+                alert("Erreur réseau : impossible de modifier la sélection.");
+                console.error("Erreur :", error);
+            });
     });
-});
\ No newline at end of file
+});
@@ -0,0 +1,35 @@
+document.addEventListener("DOMContentLoaded", () => {
+    const input = document.getElementById("query");
+    const datalist = document.getElementById("suggestions");
+    if (!input || !datalist) return;
+
+    let timer = null;
+    let lastPrefix = "";
+
+    // Remplit la liste de suggestions (valeur + nombre d'animaux)
+    const render = (suggestions) => {
+        datalist.innerHTML = "";
+        suggestions.forEach((suggestion) => {
+            const option = document.createElement("option");
+            option.value = suggestion.valeur;
+            option.label = `${suggestion.valeur} (${suggestion.total})`;
+            datalist.appendChild(option);
+        });
+    };
+
+    // Interroge /animals/autocomplete après une courte pause de saisie
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        if (prefix.length < 2 || prefix === lastPrefix) return;
+        timer = setTimeout(() => {
+            lastPrefix = prefix;
+            fetch(`/animals/autocomplete?q=${encodeURIComponent(prefix)}&limit=8`)
+                .then((response) => response.json())
+                .then((data) => {
+                    if (data.status === "success") render(data.suggestions);
+                })
+                .catch((error) => console.error("Erreur :", error));
+        }, 150);
+    });
+});
@@ -0,0 +1,149 @@
+import re
+
+"""
+
+    Validation déclarative des animaux.
+
+    Le schéma (ANIMAL_SCHEMA) décrit chaque champ une seule fois : obligatoire,
+    type, longueur maximale (identique aux VARCHAR de la table), format. Il est
+    compilé à l'import en une liste de fonctions de contrôle par champ, puis
+    utilisé tel quel par les routes, les services, l'import et l'API.
+
+"""
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+INTEGER_PATTERN = re.compile(r"-?[0-9]+")
+
+
+class Field:
+    """
+    Description d'un champ : `label` sert aux messages (« Le nom est requis. »).
+    """
+    def __init__(self, name, label, kind=str, required=True, max_length=None, minimum=None, pattern=None,
+                 messages=None):
+        self.name = name
+        self.label = label
+        self.kind = kind
+        self.required = required
+        self.max_length = max_length
+        self.minimum = minimum
+        self.pattern = pattern
+        self.messages = messages or {}
+
+    def message(self, key, default):
+        return self.messages.get(key, default)
+
+
+class Schema:
+    """
+    Schéma compilé : `validate` contrôle un enregistrement, `validate_many` un
+    lot entier en une passe. Les valeurs sont normalisées (espaces retirés,
+    entiers convertis) et les erreurs retournées par champ.
+    """
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.names = tuple(field.name for field in self.fields)
+        self._compiled = tuple((field, self._compile(field)) for field in self.fields)
+
+    @staticmethod
+    def _compile(field):
+        """Retourne la fonction (valeur normalisée) -> (valeur, message d'erreur ou None) du champ."""
+        required = field.message("required", f"{field.label} est requis.")
+        checks = []
+
+        if field.kind is int:
+            invalid = field.message("invalid", f"{field.label} doit être un entier.")
+
+            def convert(value):
+                if isinstance(value, bool):
+                    return None, invalid
+                if isinstance(value, int):
+                    return value, None
+                # Chiffres ASCII uniquement : « --5 » ou « ² » sont refusés, jamais transmis à int()
+                if isinstance(value, str) and INTEGER_PATTERN.fullmatch(value):
+                    return int(value), None
+                return None, invalid
+            checks.append(convert)
+
+            if field.minimum is not None:
+                too_small = field.message("minimum", f"{field.label} doit être supérieur ou égal à {field.minimum}.")
+                minimum = field.minimum
+                checks.append(lambda value: (value, too_small if value < minimum else None))
+        else:
+            invalid = field.message("invalid", f"{field.label} doit être une chaîne de caractères.")
+            checks.append(lambda value: (value, None if isinstance(value, str) else invalid))
+
+            if field.max_length is not None:
+                too_long = field.message("max_length", f"{field.label} ne doit pas dépasser {field.max_length} caractères.")
+                max_length = field.max_length
+                checks.append(lambda value: (value, too_long if len(value) > max_length else None))
+
+            if field.pattern is not None:
+                malformed = field.message("pattern", f"Le format de {field.label.lower()} est invalide.")
+                match = field.pattern.match
+                checks.append(lambda value: (value, None if match(value) else malformed))
+
+        def check(value):
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == "":
+                return None, (required if field.required else None)
+            for step in checks:
+                value, error = step(value)
+                if error:
+                    return None, error
+            return value, None
+
+        return check
+
+    def validate(self, data, partial=False):
+        """
+        Valide un enregistrement (dictionnaire). Avec `partial`, seuls les champs
+        présents sont contrôlés (modification partielle).
+        Retourne (données normalisées, erreurs {champ: message}).
+        """
+        return self.validate_many((data,), partial=partial)[0]
+
+    def validate_many(self, records, partial=False):
+        """
+        Valide un lot d'enregistrements en une passe.
+        Retourne [(données normalisées, erreurs), ...] dans l'ordre du lot.
+        """
+        compiled = self._compiled
+        results = []
+        for data in records:
+            cleaned, errors = {}, {}
+            if not isinstance(data, dict):
+                results.append((None, {"global": "Enregistrement invalide."}))
+                continue
+            for field, check in compiled:
+                if partial and field.name not in data:
+                    continue
+                value, error = check(data.get(field.name))
+                if error:
+                    errors[field.name] = error
+                else:
+                    cleaned[field.name] = value
+            results.append((cleaned, errors))
+        return results
+
+    def unknown_fields(self, data):
+        """Clés de `data` absentes du schéma."""
+        return [key for key in data if key not in self.names]
+
+
+# Limites identiques aux VARCHAR de la table animals (voir app/migrations.py)
+ANIMAL_SCHEMA = Schema((
+    Field("nom", "Le nom", max_length=25),
+    Field("espece", "L'espèce", max_length=25, messages={"required": "L'espèce est requise."}),
+    Field("race", "La race", max_length=25, messages={"required": "La race est requise."}),
+    Field("age", "L'âge", kind=int, minimum=0, messages={
+        "required": "L'âge doit être un entier positif.",
+        "invalid": "L'âge doit être un entier positif.",
+        "minimum": "L'âge doit être un entier positif.",
+    }),
+    Field("description", "La description", max_length=500, messages={"required": "La description est requise."}),
+    Field("email", "L'email", max_length=80, pattern=EMAIL_PATTERN, messages={"pattern": "Le format de l'email est invalide."}),
+    Field("adresse", "L'adresse", max_length=75, messages={"required": "L'adresse est requise."}),
+    Field("ville", "La ville", max_length=75, messages={"required": "La ville est requise."}),
+    Field("code_postal", "Le code postal", max_length=7),
+))
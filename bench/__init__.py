@@ -0,0 +1,8 @@
+"""
+
+    Banc d'essai de performance : génération de données synthétiques et
+    mesure du débit / des latences des routes principales.
+
+    Utilisation : python -m bench --help
+
+"""
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import threading
+import time
+
+"""
+
+    Point d'entrée du banc d'essai :
+
+        python -m bench seed --database bench.db --count 1000000
+        python -m bench run --database bench.db --mode both --requests 200 --concurrency 8 --output resultats.json
+
+    La base de banc est distincte de database.db ; l'application y est pointée
+    par la variable d'environnement DATABASE avant son import.
+
+"""
+
+
+def create_bench_app(database, cache):
+    """Construit l'application Flask sur la base de banc (caches optionnels)."""
+    os.environ["DATABASE"] = os.path.abspath(database)
+    if not cache:
+        os.environ["PAGE_CACHE_BACKEND"] = "none"
+        os.environ["ANIMAL_CACHE_ENABLED"] = "False"
+    from app import create_app
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+def start_server(app):
+    """Démarre un serveur WSGI multi-thread sur un port libre et retourne son URL."""
+    from werkzeug.serving import make_server
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def command_seed(args):
+    from bench.data import seed_database
+    # Construire l'application crée le schéma (migrations), l'index de recherche et les statistiques
+    create_bench_app(args.database, cache=False)
+    inserted, elapsed = seed_database(args.database, args.count, batch_size=args.batch_size, seed=args.seed)
+    print(json.dumps({"inserted": inserted, "seconds": round(elapsed, 3),
+                      "rows_per_second": round(inserted / elapsed, 1) if elapsed else None}))
+
+
+def command_run(args):
+    from bench.runner import BenchContext, SCENARIOS, run_client, run_http
+
+    scenarios = args.scenarios.split(",") if args.scenarios else [*SCENARIOS]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Scénarios inconnus : {', '.join(unknown)} (disponibles : {', '.join(SCENARIOS)})")
+
+    app = create_bench_app(args.database, cache=not args.no_cache) if not args.url else None
+    ctx = BenchContext(args.database, seed=args.seed)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "database": os.path.abspath(args.database),
+            "rows": ctx.total,
+            "mode": args.mode,
+            "requests": args.requests,
+            "heavy_requests": args.heavy_requests,
+            "concurrency": args.concurrency,
+            "cache": not args.no_cache,
+        },
+        "results": {},
+    }
+
+    if args.mode in ("client", "both"):
+        if app is None:
+            sys.exit("Le mode client nécessite l'application locale (sans --url).")
+        report["results"]["client"] = run_client(app, ctx, scenarios, args.requests, args.heavy_requests)
+
+    if args.mode in ("http", "both"):
+        server, base_url = (None, args.url) if args.url else start_server(app)
+        try:
+            report["results"]["http"] = run_http(base_url, ctx, scenarios, args.requests,
+                                                 args.heavy_requests, args.concurrency)
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Banc d'essai de performance de l'application.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed = subparsers.add_parser("seed", help="Ajoute des animaux synthétiques à la base de banc.")
+    seed.add_argument("--database", default="bench.db")
+    seed.add_argument("--count", type=int, default=10000)
+    seed.add_argument("--batch-size", type=int, default=10000)
+    seed.add_argument("--seed", type=int, default=42)
+    seed.set_defaults(handler=command_seed)
+
+    run = subparsers.add_parser("run", help="Mesure le débit et les latences des routes.")
+    run.add_argument("--database", default="bench.db")
+    run.add_argument("--mode", choices=("client", "http", "both"), default="both")
+    run.add_argument("--requests", type=int, default=100, help="Requêtes par scénario.")
+    run.add_argument("--heavy-requests", type=int, default=5, help="Requêtes pour les scénarios coûteux (admin).")
+    run.add_argument("--concurrency", type=int, default=8, help="Threads du mode HTTP.")
+    run.add_argument("--scenarios", help="Liste séparée par des virgules (tous par défaut).")
+    run.add_argument("--url", help="Serveur déjà démarré (mode http uniquement).")
+    run.add_argument("--no-cache", action="store_true", help="Désactive les caches de pages et d'animaux.")
+    run.add_argument("--output", help="Fichier JSON de sortie (stdout par défaut).")
+    run.add_argument("--seed", type=int, default=42)
+    run.set_defaults(handler=command_run)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
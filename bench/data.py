@@ -0,0 +1,81 @@
+import random
+import sqlite3
+import time
+
+"""
+
+    Générateur d'animaux synthétiques (données en français), reproductible
+    grâce à une graine fixe.
+
+"""
+NOMS = (
+    "Max", "Luna", "Bella", "Rocky", "Chloé", "Félix", "Nala", "Oscar", "Simba", "Léo",
+    "Milo", "Lola", "Caramel", "Noisette", "Pistache", "Réglisse", "Biscuit", "Flocon", "Gribouille", "Praline",
+)
+ESPECES = {
+    "Chien": ("Labrador", "Berger allemand", "Caniche", "Beagle", "Bouledogue", "Schnauzer", "Golden Retriever"),
+    "Chat": ("Siamois", "Persan", "Maine Coon", "Sphynx", "Européen", "Bengal"),
+    "Lapin": ("Bélier", "Angora", "Rex", "Nain"),
+    "Oiseau": ("Perruche", "Canari", "Cacatoès", "Inséparable"),
+    "Poisson": ("Poisson rouge", "Guppy", "Combattant", "Néon"),
+    "Furet": ("Albinos", "Putoisé"),
+}
+VILLES = (
+    ("Montréal", "H2X 1Y4"), ("Québec", "G1R 4P5"), ("Laval", "H7N 2K3"), ("Gatineau", "J8X 3X7"),
+    ("Longueuil", "J4K 2T4"), ("Sherbrooke", "J1H 4A7"), ("Trois-Rivières", "G9A 5H3"), ("Lévis", "G6V 6N6"),
+)
+RUES = ("rue Sainte-Catherine", "boulevard Saint-Laurent", "avenue du Parc", "rue Principale", "chemin des Érables", "rue de l'Église")
+QUALITES = ("affectueux", "joueur", "calme", "curieux", "câlin", "énergique", "sociable", "timide", "gourmand", "indépendant")
+PHRASES = (
+    "adore les promenades en forêt", "s'entend bien avec les enfants", "cherche une famille patiente",
+    "est propre et bien éduqué", "aime dormir au soleil", "a besoin d'un jardin", "est vacciné et stérilisé",
+)
+
+# Colonnes insérées, dans l'ordre des valeurs produites par generate_animals
+FIELDS = ("nom", "espece", "race", "age", "description", "email", "adresse", "ville", "code_postal")
+
+
+def generate_animals(count, seed=42, start=0):
+    """Génère `count` tuples d'animaux, dans l'ordre de FIELDS."""
+    rng = random.Random(seed + start)
+    especes = tuple(ESPECES)
+    for index in range(start, start + count):
+        espece = rng.choice(especes)
+        ville, code_postal = rng.choice(VILLES)
+        nom = rng.choice(NOMS)
+        description = f"{nom} est un animal {rng.choice(QUALITES)} et {rng.choice(QUALITES)} qui {rng.choice(PHRASES)}."
+        yield (
+            nom,
+            espece,
+            rng.choice(ESPECES[espece]),
+            rng.randint(1, 20),
+            description,
+            f"bench.{index}@example.com",
+            f"{rng.randint(1, 9999)} {rng.choice(RUES)}",
+            ville,
+            code_postal,
+        )
+
+
+def seed_database(path, count, batch_size=10000, seed=42):
+    """
+    Ajoute `count` animaux synthétiques à la base `path` (la table doit exister).
+    Les numéros d'email reprennent après les animaux de banc déjà présents.
+    Retourne (lignes insérées, durée en secondes).
+    """
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("PRAGMA synchronous = OFF")
+        start = connection.execute("SELECT COUNT(*) FROM animals WHERE email LIKE 'bench.%'").fetchone()[0]
+        query = f"INSERT INTO animals ({', '.join(FIELDS)}) VALUES ({', '.join('?' for _ in FIELDS)})"
+        started = time.perf_counter()
+        generator = generate_animals(count, seed=seed, start=start)
+        inserted = 0
+        while inserted < count:
+            batch = [row for _, row in zip(range(min(batch_size, count - inserted)), generator)]
+            connection.executemany(query, batch)
+            connection.commit()
+            inserted += len(batch)
+        return inserted, time.perf_counter() - started
+    finally:
+        connection.close()
@@ -0,0 +1,246 @@
+import http.client
+import itertools
+import math
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from bench.data import generate_animals, ESPECES, VILLES, FIELDS
+
+"""
+
+    Scénarios de charge et mesure des latences, via le client de test Flask
+    (mono-thread, sans réseau) ou en HTTP réel avec plusieurs threads.
+
+"""
+LIST_PER_PAGE = 9
+SEARCH_TERMS = ("chien", "chat", "calme", "joueur", "montréal", "labrador", "famille", "jardin")
+
+
+class BenchContext:
+    """
+    État partagé par les scénarios : taille de la base, générateur aléatoire
+    et animaux créés pendant la mesure (supprimés ensuite par `delete`).
+    """
+
+    def __init__(self, database, seed=42):
+        self.database = database
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.token = int(time.time())
+        self.counter = itertools.count()
+        self.refresh()
+
+    def refresh(self):
+        """Relit les bornes de la table et les animaux créés par le banc."""
+        connection = sqlite3.connect(self.database)
+        try:
+            self.total, self.min_id, self.max_id = connection.execute(
+                "SELECT COUNT(*), MIN(id), MAX(id) FROM animals"
+            ).fetchone()
+            self.created = [row[0] for row in connection.execute(
+                "SELECT id FROM animals WHERE email LIKE 'bench.run.%' ORDER BY id"
+            )]
+        finally:
+            connection.close()
+
+    def choice(self, values):
+        with self.lock:
+            return self.rng.choice(values)
+
+    def randint(self, low, high):
+        with self.lock:
+            return self.rng.randint(low, high)
+
+    def deep_page(self, total):
+        """Page tirée dans les 10 % les plus profonds de `total` résultats."""
+        pages = max(1, (total + LIST_PER_PAGE - 1) // LIST_PER_PAGE)
+        return self.randint(max(1, pages - pages // 10), pages)
+
+    def random_id(self):
+        return self.randint(self.min_id or 1, self.max_id or 1)
+
+    def pop_created(self):
+        with self.lock:
+            return self.created.pop() if self.created else None
+
+    def animal_form(self):
+        """Formulaire valide avec un email unique pour ce lancement."""
+        with self.lock:
+            index = next(self.counter)
+            row = next(generate_animals(1, seed=self.rng.randrange(1 << 30)))
+        form = dict(zip(FIELDS, row))
+        form["age"] = str(form["age"])
+        form["email"] = f"bench.run.{self.token}.{index}@example.com"
+        return form
+
+
+def _get(path):
+    return lambda ctx: ("GET", path, None)
+
+
+def _list_deep(ctx):
+    return "GET", "/animals/list?" + urlencode({"page": ctx.deep_page(ctx.total)}), None
+
+
+def _list_cursor(ctx):
+    return "GET", "/animals/list?" + urlencode({"after": ctx.random_id()}), None
+
+
+def _list_filtered(ctx):
+    espece = ctx.choice(tuple(ESPECES))
+    age_min = ctx.randint(1, 10)
+    params = {"espece": espece, "ville": ctx.choice(VILLES)[0], "age_min": age_min, "age_max": age_min + 5, "page": 1}
+    return "GET", "/animals/list?" + urlencode(params), None
+
+
+def _search(ctx):
+    return "GET", "/animals/list?" + urlencode({"query": ctx.choice(SEARCH_TERMS), "page": 1}), None
+
+
+def _search_deep(ctx):
+    # Le nombre de résultats n'est pas connu d'avance : on vise une page profonde
+    # d'une recherche large (une page vide reste une mesure valable).
+    return "GET", "/animals/list?" + urlencode({"query": ctx.choice(SEARCH_TERMS), "page": ctx.deep_page(ctx.total // 4)}), None
+
+
+def _register(ctx):
+    return "POST", "/animals/register", ctx.animal_form()
+
+
+def _update(ctx):
+    form = ctx.animal_form()
+    animal_id = ctx.random_id()
+    form["email"] = f"bench.update.{animal_id}@example.com"
+    return "POST", f"/animals/update/{animal_id}", form
+
+
+def _delete(ctx):
+    animal_id = ctx.pop_created()
+    if animal_id is None:
+        return None
+    return "POST", f"/animals/delete/{animal_id}", None
+
+
+# Ordre d'exécution : `delete` supprime les animaux créés par `register`
+SCENARIOS = {
+    "home": _get("/"),
+    "list": _get("/animals/list?page=1"),
+    "list_deep": _list_deep,
+    "list_cursor": _list_cursor,
+    "list_filtered": _list_filtered,
+    "search": _search,
+    "search_deep": _search_deep,
+    "admin": _get("/animals/admin"),
+    "register": _register,
+    "update": _update,
+    "delete": _delete,
+}
+
+# Scénarios coûteux (table complète) : nombre de requêtes plafonné par défaut
+HEAVY_SCENARIOS = {"admin"}
+
+
+def percentile(values, fraction):
+    """Percentile par rang le plus proche sur une liste triée."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[rank - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    """Agrège les latences (en secondes) d'un scénario en statistiques JSON."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "requests": count,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / count) if count else None,
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1]) if count else None,
+        },
+    }
+
+
+def run_client(app, ctx, scenarios, requests, heavy_requests, warmup=2):
+    """Exécute chaque scénario séquentiellement avec le client de test Flask."""
+    client = app.test_client()
+
+    def send(request):
+        method, path, data = request
+        response = client.open(path, method=method, data=data)
+        # Consommer le corps, y compris les réponses diffusées en streaming
+        response.get_data()
+        response.close()
+        return response.status_code
+
+    results = {}
+    for name in scenarios:
+        count = heavy_requests if name in HEAVY_SCENARIOS else requests
+        if name == "delete":
+            ctx.refresh()
+        if name not in ("register", "update", "delete"):
+            for _ in range(warmup):
+                send(SCENARIOS[name](ctx))
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(count):
+            request = SCENARIOS[name](ctx)
+            if request is None:
+                break
+            begin = time.perf_counter()
+            status = send(request)
+            latencies.append(time.perf_counter() - begin)
+            errors += status >= 400
+        results[name] = summarize(latencies, errors, time.perf_counter() - started)
+    return results
+
+
+def run_http(base_url, ctx, scenarios, requests, heavy_requests, concurrency):
+    """Exécute chaque scénario avec `concurrency` threads sur un serveur HTTP réel."""
+    target = urlsplit(base_url)
+    host, port = target.hostname, target.port or 80
+
+    def send(request):
+        method, path, data = request
+        body, headers = None, {}
+        if data is not None:
+            body = urlencode(data)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        try:
+            begin = time.perf_counter()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return time.perf_counter() - begin, response.status
+        finally:
+            connection.close()
+
+    results = {}
+    for name in scenarios:
+        count = heavy_requests if name in HEAVY_SCENARIOS else requests
+        if name == "delete":
+            ctx.refresh()
+        requests_list = [request for request in (SCENARIOS[name](ctx) for _ in range(count)) if request is not None]
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency, status in pool.map(send, requests_list):
+                latencies.append(latency)
+                errors += status >= 400
+        results[name] = summarize(latencies, errors, time.perf_counter() - started)
+    return results
@@ -7,4 +7,82 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
     DATABASE = os.getenv("DATABASE", "database.db")
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
\ No newline at end of file
+    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+    # Pool de connexions SQLite et PRAGMA appliqués à chaque connexion
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(64 * 1024 * 1024)))
+    DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-16000"))  # négatif = en Kio
+    DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # en ms
+
+    # Application des migrations du schéma en attente au démarrage (sinon : flask animals migrate)
+    DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "True").lower() == "true"
+
+    # Écriture groupée : un thread regroupe les écritures concurrentes en une transaction
+    DB_GROUP_COMMIT = os.getenv("DB_GROUP_COMMIT", "False").lower() == "true"
+    DB_GROUP_COMMIT_WINDOW = float(os.getenv("DB_GROUP_COMMIT_WINDOW", "2"))  # en ms
+    DB_GROUP_COMMIT_MAX_BATCH = int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", "64"))
+
+
+    # Mode de pagination par défaut de /animals/list et / : "page" (numéros) ou "cursor" (keyset)
+    PAGINATION_MODE = os.getenv("PAGINATION_MODE", "page")
+
+    # Taille des lots (une transaction par lot) pour l'import en masse
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+    # Cache en lecture (LRU + TTL) des recherches d'un animal par ID ou par email
+    ANIMAL_CACHE_ENABLED = os.getenv("ANIMAL_CACHE_ENABLED", "True").lower() == "true"
+    ANIMAL_CACHE_SIZE = int(os.getenv("ANIMAL_CACHE_SIZE", "1024"))
+    ANIMAL_CACHE_TTL = float(os.getenv("ANIMAL_CACHE_TTL", "30"))  # en secondes
+
+    # Cache des pages de liste rendues : "memory" (par processus), "file" (partagé) ou "none"
+    PAGE_CACHE_BACKEND = os.getenv("PAGE_CACHE_BACKEND", "memory")
+    PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "256"))
+    PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300"))
+    PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR")  # instance/page_cache par défaut
+
+    # Journalisation asynchrone (QueueHandler / QueueListener)
+    LOG_FILE = os.getenv("LOG_FILE", "app.log")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_JSON = os.getenv("LOG_JSON", "False").lower() == "true"
+    LOG_CALLER_INFO = os.getenv("LOG_CALLER_INFO", "False").lower() == "true"
+
+    # Instrumentation (durées des requêtes, du SQL et des templates) et route /metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+    # API JSON : taille de page maximale et nombre maximal d'opérations par lot
+    API_MAX_LIMIT = int(os.getenv("API_MAX_LIMIT", "500"))
+    API_BATCH_MAX = int(os.getenv("API_BATCH_MAX", "1000"))
+
+    # Autocomplétion servie par un index de préfixes en mémoire (construit au démarrage)
+    AUTOCOMPLETE_ENABLED = os.getenv("AUTOCOMPLETE_ENABLED", "True").lower() == "true"
+
+    # Mode ASGI : échéance de chaque requête en secondes (0 = aucune ; jamais d'échéance en WSGI simple)
+    # et pool des appels parallèles à la base
+    REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "10"))
+    # Par défaut autant de threads que de requêtes simultanées en mode ASGI
+    DB_OFFLOAD_WORKERS = int(os.getenv("DB_OFFLOAD_WORKERS", os.getenv("ASGI_MAX_CONCURRENCY", "32")))
+
+    # Mode ASGI (app:asgi_app) : requêtes exécutées en parallèle et file d'attente maximale avant rejet (503)
+    ASGI_MAX_CONCURRENCY = int(os.getenv("ASGI_MAX_CONCURRENCY", "32"))
+    ASGI_BACKLOG = int(os.getenv("ASGI_BACKLOG", "128"))
+    # Taille (octets) au-delà de laquelle le corps d'une requête est écrit dans un fichier temporaire
+    ASGI_BODY_SPOOL_SIZE = int(os.getenv("ASGI_BODY_SPOOL_SIZE", str(1024 * 1024)))
+
+    # Fichiers statiques à empreinte (manifeste généré par `flask animals assets`)
+    ASSETS_FINGERPRINT = os.getenv("ASSETS_FINGERPRINT", "True").lower() == "true"
+
+    # Compression gzip des réponses HTML / JSON selon Accept-Encoding
+    GZIP_ENABLED = os.getenv("GZIP_ENABLED", "True").lower() == "true"
+    GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))  # en octets
+    GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+    # Démarrage : vérification du schéma une fois par déploiement ("deployment") ou à chaque worker ("always")
+    DB_SCHEMA_CHECK = os.getenv("DB_SCHEMA_CHECK", "deployment")
+
+    # Cache de bytecode des templates Jinja sur disque, partagé par les workers
+    JINJA_BYTECODE_CACHE = os.getenv("JINJA_BYTECODE_CACHE", "True").lower() == "true"
+    JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR")  # instance/jinja_cache par défaut
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# La configuration est lue à l'import de config.py : base et journal temporaires
+_TMP = tempfile.mkdtemp(prefix="animals-tests-")
+os.environ.update({
+    "DATABASE": os.path.join(_TMP, "test.db"),
+    "LOG_FILE": os.path.join(_TMP, "test.log"),
+    "DB_SCHEMA_CHECK": "always",
+    "PAGE_CACHE_BACKEND": "none",
+    "JINJA_BYTECODE_CACHE": "False",
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.database import Database  # noqa: E402
+from app.models import Animals  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def empty_table(app):
+    """Chaque test part d'une table vide et de caches vides."""
+    with app.app_context():
+        db = Database.get_connection()
+        db.execute("DELETE FROM animals")
+        db.commit()
+    Animals.init_app(app)
+    yield
+
+
+def animal(email, **fields):
+    """Enregistrement valide, modifiable champ par champ."""
+    data = {
+        "nom": "Rex", "espece": "Chien", "race": "Labrador", "age": 3,
+        "description": "Un chien joueur et très affectueux.", "email": email,
+        "adresse": "123 rue Principale", "ville": "Montréal", "code_postal": "H2X 1Y4",
+    }
+    data.update(fields)
+    return data
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+from app.asgi import AsgiAdapter
+
+
+def scope(method="GET", path="/"):
+    return {"type": "http", "method": method, "path": path, "query_string": b"", "headers": [],
+            "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("127.0.0.1", 1)}
+
+
+def call(adapter, receive, request=None):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def main():
+        await adapter(request or scope(), receive, send)
+        # Comme un serveur, la boucle reste active jusqu'à la fin du thread WSGI
+        while adapter.stats()["in_flight"]:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    return sent
+
+
+def test_large_body_is_spooled_to_disk():
+    seen = {}
+
+    def wsgi_app(environ, start_response):
+        body = environ["wsgi.input"]
+        seen["rolled"] = body._rolled
+        seen["length"] = environ["CONTENT_LENGTH"]
+        seen["data"] = body.read()
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    chunks = [b"x" * 1000] * 5
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    adapter = AsgiAdapter(wsgi_app, max_concurrency=2, timeout=5, spool_size=2048)
+    sent = call(adapter, receive, scope("POST", "/animals/import"))
+
+    assert sent[0]["status"] == 200
+    assert seen == {"rolled": True, "length": "5000", "data": b"x" * 5000}
+
+
+def test_small_body_stays_in_memory():
+    seen = {}
+
+    def wsgi_app(environ, start_response):
+        seen["rolled"] = environ["wsgi.input"]._rolled
+        seen["data"] = environ["wsgi.input"].read()
+        start_response("204 No Content", [])
+        return []
+
+    messages = [{"type": "http.request", "body": b"abc", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    call(AsgiAdapter(wsgi_app, timeout=5), receive)
+    assert seen == {"rolled": False, "data": b"abc"}
+
+
+def test_disconnect_stops_streaming_response():
+    produced, closed = [], threading.Event()
+
+    def stream():
+        try:
+            for index in range(1000):
+                produced.append(index)
+                time.sleep(0.005)
+                yield b"ligne\n"
+        finally:
+            closed.set()
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/csv")])
+        return stream()
+
+    state = {"body_read": False}
+
+    async def receive():
+        if not state["body_read"]:
+            state["body_read"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(0.1)
+        return {"type": "http.disconnect"}
+
+    adapter = AsgiAdapter(wsgi_app, timeout=5)
+    sent = call(adapter, receive)
+
+    assert sent[0]["status"] == 200
+    assert closed.wait(5)
+    assert len(produced) < 1000
+    assert adapter.stats()["disconnects"] == 1
+    assert adapter.stats()["in_flight"] == 0
+
+
+def test_disconnect_during_body_skips_request():
+    called = []
+
+    def wsgi_app(environ, start_response):
+        called.append(True)
+        start_response("200 OK", [])
+        return []
+
+    messages = [{"type": "http.request", "body": b"abc", "more_body": True}, {"type": "http.disconnect"}]
+
+    async def receive():
+        return messages.pop(0)
+
+    adapter = AsgiAdapter(wsgi_app, timeout=5)
+    assert call(adapter, receive) == []
+    assert called == [] and adapter.stats()["disconnects"] == 1
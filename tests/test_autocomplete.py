@@ -0,0 +1,39 @@
+import random
+
+from app.autocomplete import PrefixIndex
+
+
+def rows(count, seed=7):
+    generator = random.Random(seed)
+    races = ["Golden Retriever", "Berger Allemand", "Siamois", "Bélier nain", "Labrador", None]
+    villes = ["Montréal", "Québec", "Saint-Jean-sur-Richelieu", "Laval"]
+    return [(animal_id, f"Nom{generator.randrange(count // 3 + 1)}", generator.choice(["Chien", "Chat", "Lapin"]),
+             generator.choice(races), generator.choice(villes))
+            for animal_id in range(1, count + 1)]
+
+
+def test_load_matches_incremental_adds():
+    data = rows(2000)
+    loaded, added = PrefixIndex(), PrefixIndex()
+    loaded.load(data)
+    for row in data:
+        added.add(row[0], row[1:])
+
+    assert loaded._keys == added._keys
+    assert loaded._counts == added._counts
+    assert loaded.stats()["animals"] == added.stats()["animals"] == 2000
+    for prefix in ("ret", "sai", "be", "nom1", "chat"):
+        assert loaded.suggest(prefix) == added.suggest(prefix)
+
+
+def test_writes_after_load_keep_index_sorted():
+    index = PrefixIndex()
+    index.load(rows(200))
+    index.add(201, ("Zéphyr", "Furet", "Angora", "Gatineau"))
+    index.add(5, ("Zorro", "Chien", "Beagle", "Laval"))
+    index.remove(7)
+
+    assert index._keys == sorted(index._keys)
+    assert index.suggest("zep") == [{"valeur": "Zéphyr", "champ": "nom", "total": 1}]
+    assert index.suggest("gatineau", field="ville")[0]["total"] == 1
+    assert index.stats()["animals"] == 200
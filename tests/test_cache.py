@@ -0,0 +1,117 @@
+import pytest
+
+from app import cache
+from app.cache import LRUCache, MISSING
+from app.models import Animals
+from conftest import animal
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hits_misses_and_negative_results(clock):
+    lru = LRUCache(max_size=4, ttl=30)
+    assert lru.get("a") is MISSING
+    lru.set("a", 1)
+    lru.set("absent", None)
+
+    assert lru.get("a") == 1
+    assert lru.get("absent") is None
+    stats = lru.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 2)
+
+
+def test_eviction_of_least_recently_used(clock):
+    lru = LRUCache(max_size=2, ttl=30)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert lru.get("b") is MISSING
+    assert (lru.get("a"), lru.get("c")) == (1, 3)
+    assert lru.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(clock):
+    lru = LRUCache(max_size=2, ttl=30)
+    lru.set("a", 1)
+    clock[0] += 29.9
+    assert lru.get("a") == 1
+    clock[0] += 0.1
+    assert lru.get("a") is MISSING
+    assert lru.stats()["expirations"] == 1 and lru.stats()["size"] == 0
+
+
+def test_invalidation():
+    lru = LRUCache()
+    lru.set(1, {"id": 1})
+    lru.set(2, None)
+    lru.invalidate(1)
+    lru.invalidate_where(lambda value: value is None)
+    assert lru.get(1) is MISSING and lru.get(2) is MISSING
+    assert lru.stats()["invalidations"] == 2
+
+
+def test_disabled_cache_stores_nothing():
+    lru = LRUCache(enabled=False)
+    lru.set("a", 1)
+    assert lru.get("a") is MISSING
+    assert LRUCache(max_size=0).enabled is False
+
+
+def test_find_by_id_is_cached(app):
+    with app.app_context():
+        animal_id = Animals.create(**animal("rex@example.com"))
+        first = Animals.find_by_id(animal_id)
+        before = Animals.cache_stats()
+        assert Animals.find_by_id(animal_id) is first
+        assert Animals.find_by_email("rex@example.com") == first
+        assert Animals.find_by_email("rex@example.com") is Animals.find_by_email("rex@example.com")
+        after = Animals.cache_stats()
+        assert after["by_id"]["hits"] - before["by_id"]["hits"] == 1
+        assert after["by_email"]["hits"] - before["by_email"]["hits"] == 2
+        assert after["by_email"]["misses"] - before["by_email"]["misses"] == 1
+
+
+def test_create_replaces_cached_negative_result(app):
+    with app.app_context():
+        assert Animals.find_by_email("new@example.com") is None
+        animal_id = Animals.create(**animal("new@example.com"))
+        assert Animals.find_by_email("new@example.com")["id"] == animal_id
+
+        Animals.delete_by_id(animal_id)
+        assert Animals.find_by_id(animal_id + 1) is None
+        assert Animals.create_many([animal("bulk@example.com")]) == []
+        assert Animals.find_by_id(animal_id + 1)["email"] == "bulk@example.com"
+
+
+def test_update_and_delete_invalidate(app):
+    with app.app_context():
+        animal_id = Animals.create(**animal("old@example.com"))
+        assert Animals.find_by_id(animal_id)["nom"] == "Rex"
+        assert Animals.find_by_email("old@example.com") is not None
+
+        assert Animals.update(animal_id, **animal("new@example.com", nom="Max"))
+        assert Animals.find_by_id(animal_id)["nom"] == "Max"
+        assert Animals.find_by_email("old@example.com") is None
+        assert Animals.find_by_email("new@example.com")["nom"] == "Max"
+
+        Animals.delete_by_id(animal_id)
+        assert Animals.find_by_id(animal_id) is None
+        assert Animals.find_by_email("new@example.com") is None
+
+
+def test_animal_cache_disabled(app, monkeypatch):
+    monkeypatch.setitem(app.config, "ANIMAL_CACHE_ENABLED", False)
+    Animals.init_app(app)
+    with app.app_context():
+        animal_id = Animals.create(**animal("rex@example.com"))
+        assert Animals.find_by_id(animal_id) is not Animals.find_by_id(animal_id)
+        stats = Animals.cache_stats()["by_id"]
+        assert stats["enabled"] is False and stats["size"] == 0 and stats["hits"] == 0
@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import database
+from app.database import GroupCommitWriter
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "writer.db"
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE items (name TEXT UNIQUE NOT NULL)")
+    db.close()
+    return path
+
+
+@pytest.fixture
+def writer(path):
+    writer = GroupCommitWriter(lambda: sqlite3.connect(path, check_same_thread=False), window=0.05)
+    yield writer
+    writer.stop()
+
+
+def names(path):
+    db = sqlite3.connect(path)
+    try:
+        return sorted(row[0] for row in db.execute("SELECT name FROM items"))
+    finally:
+        db.close()
+
+
+def insert(name):
+    def work(db):
+        return db.execute("INSERT INTO items (name) VALUES (?)", (name,)).lastrowid
+    return work
+
+
+def blocking(started, release, name="lent"):
+    def work(db):
+        started.set()
+        release.wait(5)
+        return insert(name)(db)
+    return work
+
+
+def test_failed_write_is_rolled_back_alone(writer, path):
+    writer.submit(insert("a"))
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(writer.submit, insert(name)) for name in ("b", "a", "c")]
+    results = [future.exception() for future in futures]
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert names(path) == ["a", "b", "c"]
+    assert writer.stats()["failures"] == 1
+
+
+def test_timed_out_write_is_never_committed(writer, path):
+    started, release = threading.Event(), threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        slow = pool.submit(writer.submit, blocking(started, release))
+        assert started.wait(5)
+        # Le thread d'écriture est occupé : cette écriture reste en file et expire
+        with pytest.raises(sqlite3.OperationalError):
+            writer.submit(insert("abandonnée"), timeout=0.05)
+        release.set()
+        slow.result(5)
+
+    writer.submit(insert("suivante"))
+    assert names(path) == ["lent", "suivante"]
+    assert writer.stats()["abandoned"] == 1
+
+
+def test_running_write_is_awaited_past_timeout(writer, path):
+    started, release = threading.Event(), threading.Event()
+    threading.Timer(0.2, release.set).start()
+    # Déjà prise par le thread d'écriture à l'échéance : on attend son résultat
+    assert writer.submit(blocking(started, release), timeout=0.1 + writer.window) == 1
+    assert names(path) == ["lent"]
+    assert writer.stats()["abandoned"] == 0
+
+
+def test_concurrent_first_submits_start_one_thread(writer, path, monkeypatch):
+    class SlowThread(threading.Thread):
+        # Création lente : élargit la fenêtre entre la vérification et l'affectation du thread
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(database.threading, "Thread", SlowThread)
+    barrier = threading.Barrier(8)
+
+    def submit(name):
+        barrier.wait()
+        return writer.submit(insert(name))
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(submit, [f"n{i}" for i in range(8)]))
+
+    assert [thread.name for thread in threading.enumerate()].count("group-commit-writer") == 1
+    assert len(names(path)) == 8
+
+
+def test_dedicated_connections_are_counted(app):
+    pool = database.Database.get_pool()
+    before = pool.stats()
+    connection = database.Database.connect()
+    stats = pool.stats()
+    assert stats["dedicated"] == before["dedicated"] + 1
+    assert stats["connections"] == stats["size"] + stats["dedicated"]
+
+    database.Database.disconnect(connection)
+    assert pool.stats()["dedicated"] == before["dedicated"]
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.models import Animals
+from app.services.import_service import ImportService
+from conftest import animal
+
+HEADER = "nom,espece,race,age,description,email,adresse,ville,code_postal\n"
+
+
+def csv_line(email, **fields):
+    data = animal(email, **fields)
+    output = io.StringIO()
+    csv.writer(output, lineterminator="\n").writerow(data[field] for field in Animals.FIELDS)
+    return output.getvalue()
+
+
+def run(app, content, file_format="csv", batch_size=500):
+    with app.app_context():
+        return ImportService.import_file(io.BytesIO(content), file_format, batch_size=batch_size)
+
+
+def lines_of(report):
+    return [(error["line"], error["message"]) for error in report["errors"]]
+
+
+def test_undecodable_line_is_rejected_alone(app):
+    content = (HEADER + csv_line("a@example.com")).encode() + b"Rex,Chien,Lab,3,Caf\xe9 latin-1,b@example.com,1 rue,Laval,H1H 1H1\n" \
+        + csv_line("c@example.com", nom="Éloïse").encode()
+    report = run(app, content)
+
+    assert report["status"] == "partial"
+    assert (report["total"], report["inserted"], report["rejected"]) == (3, 2, 1)
+    assert lines_of(report) == [(3, ImportService.ERROR_MESSAGES["invalid_encoding"])]
+    with app.app_context():
+        assert Animals.find_by_email("c@example.com")["nom"] == "Éloïse"
+
+
+def test_malformed_csv_line_is_rejected_alone(app):
+    content = HEADER + csv_line("a@example.com") + csv_line("b@example.com", description="x" * 2000) + csv_line("c@example.com")
+    limit = csv.field_size_limit(1000)
+    try:
+        report = run(app, content.encode("utf-8-sig"))
+    finally:
+        csv.field_size_limit(limit)
+
+    assert report["inserted"] == 2
+    assert [line for line, _ in lines_of(report)] == [3]
+    assert lines_of(report)[0][1].startswith("Ligne CSV invalide")
+
+
+def test_jsonl_errors_keep_line_numbers(app):
+    content = b"\n".join([
+        json.dumps(animal("a@example.com")).encode(),
+        b"{pas du json",
+        b"\xff\xfe",
+        b"",
+        json.dumps(animal("b@example.com", age="x")).encode(),
+        json.dumps(animal("c@example.com")).encode(),
+    ])
+    report = run(app, content, "jsonl")
+
+    assert report["inserted"] == 2
+    assert [line for line, _ in lines_of(report)] == [2, 3, 5]
+    assert lines_of(report)[1][1] == ImportService.ERROR_MESSAGES["invalid_encoding"]
+
+
+def test_duplicates_within_and_across_batches(app):
+    content = HEADER + csv_line("a@example.com") + csv_line("a@example.com") + csv_line("b@example.com") \
+        + csv_line("a@example.com")
+    report = run(app, content.encode(), batch_size=2)
+
+    assert report["inserted"] == 2
+    assert lines_of(report) == [
+        (3, ImportService.ERROR_MESSAGES["duplicate_in_file"]),
+        (5, "Un animal avec cet email existe déjà."),
+    ]
+
+
+def test_interrupted_import_reports_committed_batches(app, monkeypatch):
+    create_many = Animals.create_many
+    calls = []
+
+    def failing(rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("disque plein")
+        return create_many(rows)
+
+    monkeypatch.setattr(Animals, "create_many", staticmethod(failing))
+    content = HEADER + "".join(csv_line(f"a{i}@example.com") for i in range(5))
+    report = run(app, content.encode(), batch_size=2)
+
+    assert report["status"] == "error"
+    assert (report["inserted"], report["batches"]) == (2, 1)
+    assert "message" in report
+
+
+def test_upload_and_cli(app, client, tmp_path):
+    content = (HEADER + csv_line("a@example.com")).encode() + b"\xff\n"
+    response = client.post("/animals/import", data={"fichier": (io.BytesIO(content), "animaux.csv")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert response.get_json()["inserted"] == 1
+
+    path = tmp_path / "animaux.csv"
+    path.write_bytes((HEADER + csv_line("b@example.com")).encode("utf-8-sig") + b"\xff\n")
+    result = app.test_cli_runner().invoke(args=["animals", "import", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "1 insérées, 1 rejetées" in result.output
@@ -0,0 +1,130 @@
+import sqlite3
+
+import pytest
+
+from app.commands import is_migrate_command
+from app.migrations import Migrations
+
+
+# DDL de l'ancien initialize_tables (commit de référence), copié tel quel
+LEGACY_SCHEMA = """
+                CREATE TABLE animals (
+                    id INTEGER PRIMARY KEY,
+                    nom VARCHAR(25) NOT NULL,
+                    espece VARCHAR(25) NOT NULL,
+                    race VARCHAR(25) NOT NULL,
+                    age INTEGER NOT NULL,
+                    description VARCHAR(500),
+                    email VARCHAR(80) NOT NULL UNIQUE,
+                    adresse VARCHAR(75) NOT NULL,
+                    ville VARCHAR(75) NOT NULL,
+                    cp VARCHAR(7) NOT NULL
+                )
+                """
+
+INSERT_LEGACY = """
+    INSERT INTO animals (id, nom, espece, race, age, description, email, adresse, ville, cp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, '1 rue', ?, 'H2X 1Y4')
+"""
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """Base créée par l'ancien initialize_tables : colonne `cp`, description facultative, user_version 0."""
+    db = sqlite3.connect(tmp_path / "legacy.db")
+    db.execute(LEGACY_SCHEMA)
+    db.executemany(INSERT_LEGACY, [
+        (1, "Rex", "Chien", "Labrador", 3, "Un chien joueur.", "rex@example.com", "Montréal"),
+        (2, "Mimi", "Chat", "Siamois", 2, None, "mimi@example.com", "Québec"),
+        (5, "Coco", "Chien", "Beagle", 4, "Un beagle curieux.", "coco@example.com", "Montréal"),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+def columns(db):
+    return {row[1]: row for row in db.execute("PRAGMA table_info(animals)")}
+
+
+def names(db, kind):
+    return {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def test_dry_run_leaves_legacy_database_untouched(legacy_db):
+    schema = sorted(legacy_db.execute("SELECT type, name, sql FROM sqlite_master"))
+    report = Migrations.run(legacy_db, dry_run=True)
+
+    assert report["dry_run"]
+    assert report["from_version"] == 0
+    assert report["to_version"] == Migrations.latest_version()
+    assert [item["version"] for item in report["applied"]] == [version for version, _, _ in Migrations.MIGRATIONS]
+    assert all(check["ok"] for check in report["plans"])
+
+    assert Migrations.current_version(legacy_db) == 0
+    assert sorted(legacy_db.execute("SELECT type, name, sql FROM sqlite_master")) == schema
+    assert "cp" in columns(legacy_db)
+
+
+def test_run_migrates_legacy_database(legacy_db):
+    report = Migrations.run(legacy_db)
+
+    assert not report["dry_run"]
+    assert (report["from_version"], report["to_version"]) == (0, Migrations.latest_version())
+    assert Migrations.current_version(legacy_db) == Migrations.latest_version()
+
+    # Table reconstruite selon le DDL actuel, IDs et données conservés
+    table = columns(legacy_db)
+    assert "code_postal" in table and "cp" not in table
+    assert table["description"][3] == 1
+    assert "AUTOINCREMENT" in legacy_db.execute("SELECT sql FROM sqlite_master WHERE name = 'animals'").fetchone()[0]
+    assert legacy_db.execute("SELECT id, description, code_postal FROM animals ORDER BY id").fetchall() == [
+        (1, "Un chien joueur.", "H2X 1Y4"), (2, "", "H2X 1Y4"), (5, "Un beagle curieux.", "H2X 1Y4"),
+    ]
+    assert {"idx_animals_espece", "idx_animals_race", "idx_animals_ville", "idx_animals_age"} <= names(legacy_db, "index")
+
+    # Index plein texte et compteurs créés et remplis par les migrations
+    assert legacy_db.execute("SELECT rowid FROM animals_fts WHERE animals_fts MATCH 'beagle'").fetchall() == [(5,)]
+    stats = dict(((dimension, valeur), total) for dimension, valeur, total in legacy_db.execute("SELECT * FROM animals_stats"))
+    assert stats[("total", "")] == 3 and stats[("espece", "Chien")] == 2 and stats[("ville", "Québec")] == 1
+    assert {"animals_fts_ai", "animals_stats_ai", "animals_revision_ai"} <= names(legacy_db, "trigger")
+
+    # AUTOINCREMENT : l'ID d'un animal supprimé n'est pas réutilisé
+    legacy_db.execute("DELETE FROM animals WHERE id = 5")
+    cursor = legacy_db.execute(
+        "INSERT INTO animals (nom, espece, race, age, description, email, adresse, ville, code_postal) "
+        "VALUES ('Max', 'Chien', 'Boxer', 1, '', 'max@example.com', '2 rue', 'Laval', 'H7A 1A1')")
+    assert cursor.lastrowid == 6
+    legacy_db.commit()
+
+    # Relancer ne fait rien
+    again = Migrations.run(legacy_db)
+    assert again["applied"] == [] and again["plans"] == []
+
+
+def test_current_table_is_not_rebuilt(tmp_path):
+    db = sqlite3.connect(tmp_path / "current.db")
+    Migrations.run(db)
+    db.execute("INSERT INTO animals (nom, espece, race, age, description, email, adresse, ville, code_postal) "
+                "VALUES ('Rex', 'Chien', 'Lab', 3, 'Joueur.', 'rex@example.com', '1 rue', 'Laval', 'H7A 1A1')")
+    db.commit()
+    db.execute("PRAGMA user_version = 3")
+    rootpage = db.execute("SELECT rootpage FROM sqlite_master WHERE name = 'animals'").fetchone()[0]
+
+    report = Migrations.run(db)
+    assert [item["version"] for item in report["applied"]] == [4, 5, 6]
+    assert db.execute("SELECT rootpage FROM sqlite_master WHERE name = 'animals'").fetchone()[0] == rootpage
+    assert db.execute("SELECT total FROM animals_stats WHERE dimension = 'total'").fetchone()[0] == 1
+    assert db.execute("SELECT rowid FROM animals_fts WHERE animals_fts MATCH 'rex'").fetchall() == [(1,)]
+    db.close()
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["animals", "migrate"], True),
+    (["--app", "app", "animals", "migrate", "--dry-run"], True),
+    (["animals", "import", "migrate.csv"], False),
+    (["run"], False),
+    ([], False),
+])
+def test_is_migrate_command(argv, expected):
+    assert is_migrate_command(argv) is expected
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from app.asgi import AsgiAdapter
+from app.database import Database
+from app.offload import Offload
+from app.services.animals_service import AnimalsService
+from test_asgi import call, scope
+
+# Requête sans fin : seule l'interruption à l'échéance la termine
+ENDLESS = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+
+
+def endless():
+    return Database.get_connection().execute(ENDLESS).fetchone()
+
+
+def test_no_deadline_outside_asgi(app):
+    with app.test_request_context("/animals/list"):
+        Offload._start_deadline()
+        assert Offload.deadline() is None and not Offload.expired()
+        assert Offload.gather(lambda: 1, lambda: 2) == [1, 2]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_first_call_is_interrupted_at_deadline(app, monkeypatch, parallel):
+    if not parallel:
+        monkeypatch.setattr(Offload, "_executor", None)
+    with app.test_request_context("/animals/list", environ_base={"animals.deadline": time.monotonic() + 0.2}):
+        Offload._start_deadline()
+        with pytest.raises(TimeoutError):
+            Offload.gather(endless, lambda: 1)
+        assert Offload.expired()
+        # Gestionnaire retiré : la connexion de la requête sert encore après l'échéance
+        assert Database.get_connection().execute("SELECT count(*) FROM animals").fetchone()[0] == 0
+
+
+def test_list_deadline_becomes_504(app, monkeypatch):
+    monkeypatch.setattr(AnimalsService, "get_facets", staticmethod(lambda **_: endless()))
+    before = Offload.stats()["timeouts"]
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    adapter = AsgiAdapter(app, timeout=0.3)
+    request = dict(scope(path="/animals/list"), query_string=b"page=1")
+    sent = call(adapter, receive, request)
+
+    assert sent[0]["status"] == 504
+    # Le thread de la requête a été libéré par l'interruption de la requête SQL
+    assert adapter.stats()["in_flight"] == 0
+    assert Offload.stats()["timeouts"] == before + 1
@@ -0,0 +1,59 @@
+import pytest
+
+from app.database import Database
+from app.models import Animals
+from conftest import animal
+
+
+@pytest.fixture
+def animals(app):
+    with app.app_context():
+        failures = Animals.create_many([
+            animal("rex@example.com"),
+            animal("mimi@example.com", nom="Mimi", espece="Chat", race="Siamois",
+                   description="Une chatte calme qui aime les siestes."),
+            animal("coco@example.com", nom="Coco", espece="Oiseau", race="Perroquet",
+                   description="Un perroquet bavard, compagnon du chat Mimi."),
+        ])
+        assert failures == []
+        yield
+
+
+def names(rows):
+    return sorted(row["nom"] for row in rows)
+
+
+def test_fts_search(app, animals):
+    assert Database.FTS_ENABLED
+    with app.app_context():
+        assert names(Animals.search_paginated("siamois", 1, 10)) == ["Mimi"]
+        # Préfixe de mot et plusieurs colonnes (nom, description)
+        assert names(Animals.search_paginated("mim", 1, 10)) == ["Coco", "Mimi"]
+        assert Animals.count_search_results("mim") == 2
+        # Le nom pèse plus que la description dans le classement
+        assert Animals.search_paginated("mimi", 1, 10)[0]["nom"] == "Mimi"
+        assert Animals.search_paginated("girafe", 1, 10) == []
+
+
+def test_fts_index_follows_writes(app, animals):
+    with app.app_context():
+        animal_id = Animals.search_paginated("siamois", 1, 10)[0]["id"]
+        assert Animals.update(animal_id, **animal("mimi@example.com", nom="Mimi", race="Persan"))
+        assert Animals.search_paginated("siamois", 1, 10) == []
+        assert names(Animals.search_paginated("persan", 1, 10)) == ["Mimi"]
+
+
+def test_like_fallback(app, animals, monkeypatch):
+    monkeypatch.setattr(Database, "FTS_ENABLED", False)
+    with app.app_context():
+        assert names(Animals.search_paginated("siamois", 1, 10)) == ["Mimi"]
+        # LIKE trouve aussi une sous-chaîne au milieu d'un mot
+        assert names(Animals.search_paginated("amoi", 1, 10)) == ["Mimi"]
+        assert Animals.count_search_results("mim") == 2
+        assert Animals.search_paginated("girafe", 1, 10) == []
+
+
+def test_query_without_terms_uses_like(app, animals):
+    with app.app_context():
+        # Aucun mot pour FTS5 : repli sur LIKE, qui correspond à tout
+        assert Animals.count_search_results(" ") == 3
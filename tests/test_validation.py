@@ -0,0 +1,96 @@
+import pytest
+
+from app.database import Database, GroupCommitWriter
+from app.models import Animals
+from app.validation import ANIMAL_SCHEMA
+from conftest import animal
+
+
+def test_validate_many_reports_errors_per_record():
+    results = ANIMAL_SCHEMA.validate_many([
+        animal("ok@example.com", age="4"),
+        animal("mauvais", age="--5", nom=""),
+        "pas un dictionnaire",
+    ])
+
+    cleaned, errors = results[0]
+    assert errors == {} and cleaned["age"] == 4
+    assert set(results[1][1]) == {"nom", "email", "age"}
+    assert results[2] == (None, {"global": "Enregistrement invalide."})
+
+
+@pytest.mark.parametrize("age", ["--5", "²", "3.5", "", " ", "trois"])
+def test_invalid_ages_are_rejected(age):
+    _, errors = ANIMAL_SCHEMA.validate(animal("a@example.com", age=age))
+    assert "age" in errors
+
+
+def test_partial_validation_only_checks_given_fields():
+    cleaned, errors = ANIMAL_SCHEMA.validate({"age": "7"}, partial=True)
+    assert (cleaned, errors) == ({"age": 7}, {})
+
+
+def test_batch_with_invalid_operations_writes_nothing(client, app):
+    response = client.post("/api/animals/batch", json={
+        "create": [animal("a@example.com"), animal("b@example.com", age="²")],
+        "update": [{"id": "x", "nom": "Max"}, {"id": 1, "email": "invalide"}],
+        "delete": ["1"],
+    })
+
+    assert response.status_code == 400
+    errors = response.get_json()["errors"]
+    assert [(error["operation"], error["position"]) for error in errors] == [
+        ("create", 1), ("update", 0), ("update", 1), ("delete", 0),
+    ]
+    with app.app_context():
+        assert Animals.count_animals() == 0
+
+
+def test_batch_constraint_conflict_rolls_back(client, app):
+    response = client.post("/api/animals/batch", json={
+        "create": [animal("a@example.com"), animal("a@example.com", nom="Max")],
+    })
+
+    assert response.status_code == 409
+    assert response.get_json()["errors"][0]["position"] == 1
+    with app.app_context():
+        assert Animals.count_animals() == 0
+
+
+def test_valid_batch_is_applied(client, app):
+    response = client.post("/api/animals/batch", json={
+        "create": [animal("a@example.com"), animal("b@example.com", age="5")],
+    })
+
+    assert response.status_code == 200
+    assert len(response.get_json()["created"]) == 2
+    with app.app_context():
+        assert Animals.count_animals() == 2
+
+
+@pytest.fixture
+def group_commit(monkeypatch):
+    writer = GroupCommitWriter(Database.connect, close=Database.disconnect)
+    monkeypatch.setattr(Database, "_writer", writer)
+    yield writer
+    writer.stop()
+
+
+def test_batch_goes_through_group_commit(client, app, group_commit):
+    response = client.post("/api/animals/batch", json={"create": [animal("a@example.com")]})
+    assert response.status_code == 200
+
+    response = client.post("/api/animals/batch", json={
+        "create": [animal("b@example.com")],
+        "update": [{"id": response.get_json()["created"][0], "nom": "Max"}],
+        "delete": [],
+    })
+    assert response.status_code == 200
+
+    conflict = client.post("/api/animals/batch", json={"create": [animal("c@example.com"), animal("a@example.com")]})
+    assert conflict.status_code == 409
+
+    assert group_commit.stats()["operations"] == 3
+    with app.app_context():
+        assert Animals.count_animals() == 2
+        assert Animals.find_by_email("c@example.com") is None